@@ -0,0 +1,148 @@
+# benchmarks/boundary_lod.py
+"""
+Choropleth payload and render time at each level of detail of the boundary
+cache (utils/boundaries.py), on a synthetic district layer.
+
+The layer is a coverage of ``n_areas`` Voronoi cells over a country-sized
+outline in Zambia's extent, their borders densified every ~300 m and
+jittered like digitized boundaries. Shared borders are densified from the
+same endpoint on both sides, so the cells still tile exactly and
+``coverage_simplify`` applies as it does to real admin boundaries.
+
+For every level of detail the report gives the vertices, the encoded
+(WKB) and GeoJSON sizes, whether the areas still form a valid coverage, the
+serialized figure size and the time to build and serialize the figure, as
+Streamlit does on each rerun.
+
+Run from the repository root::
+
+    python -m benchmarks.boundary_lod [n_areas]
+"""
+import json
+import sys
+import time
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import shapely
+
+from utils.boundaries import BOUNDARY_LODS, boundary_geojson, build_boundary_levels, lod_for_zoom
+from utils.facilities import ZAMBIA_BBOX
+from utils.figures import figure_payload_bytes
+
+SPACING_DEG = 0.003
+JITTER_DEG = 0.0004
+
+
+def _jitter(points, amplitude):
+    # Deterministic in the coordinates, so a point shared by two areas moves once
+    h = np.sin(np.round(points, 6) @ np.array([[12.9898e3, 39.3468e3], [78.233e3, 11.135e3]])) * 43758.5453
+    return points + amplitude * 2 * ((h - np.floor(h)) - 0.5)
+
+
+def _densify_ring(coords, spacing, amplitude):
+    out = [coords[:1]]
+    for a, b in zip(coords[:-1], coords[1:]):
+        # Walk every segment from its lower endpoint so both sides get the same points
+        flip = tuple(a) > tuple(b)
+        lo, hi = (b, a) if flip else (a, b)
+        n = max(int(np.ceil(np.hypot(*(hi - lo)) / spacing)), 1)
+        points = _jitter(lo + np.arange(1, n)[:, None] / n * (hi - lo), amplitude)
+        out += [points[::-1] if flip else points, b[None]]
+    return np.concatenate(out)
+
+
+def _roughen(geom, spacing, amplitude):
+    parts = [
+        shapely.Polygon(
+            _densify_ring(shapely.get_coordinates(part.exterior), spacing, amplitude),
+            [_densify_ring(shapely.get_coordinates(ring), spacing, amplitude) for ring in part.interiors],
+        )
+        for part in shapely.get_parts(geom)
+    ]
+    return parts[0] if len(parts) == 1 else shapely.MultiPolygon(parts)
+
+
+def synthetic_layer(n_areas=116, seed=0):
+    """Districts tiling a country outline, as a GeoDataFrame with an ``ADM2_EN`` name."""
+    rng = np.random.default_rng(seed)
+    south, west, north, east = ZAMBIA_BBOX
+    t = np.linspace(0, 2 * np.pi, 400, endpoint=False)
+    r = 1 + 0.15 * np.sin(5 * t) + 0.05 * np.sin(17 * t)
+    center_lon, center_lat = (west + east) / 2, (south + north) / 2
+    outline = shapely.set_precision(
+        shapely.Polygon(np.c_[center_lon + 5.5 * r * np.cos(t), center_lat + 4.5 * r * np.sin(t)]), 1e-6
+    )
+
+    seeds = shapely.points(np.c_[rng.uniform(west, east, 4 * n_areas), rng.uniform(south, north, 4 * n_areas)])
+    seeds = seeds[shapely.contains(outline, seeds)][:n_areas]
+    cells = shapely.get_parts(shapely.voronoi_polygons(shapely.multipoints(seeds), extend_to=outline.envelope))
+    cells = shapely.set_precision(shapely.intersection(cells, outline), 1e-6)
+    geoms = [_roughen(cell, SPACING_DEG, JITTER_DEG) for cell in cells]
+    return gpd.GeoDataFrame({"ADM2_EN": [f"District {i}" for i in range(len(geoms))]}, geometry=geoms, crs=4326)
+
+
+def render(geojson, values):
+    """Build the drill-down choropleth and serialize it."""
+    fig = px.choropleth_map(
+        values, geojson=geojson, locations="Key", featureidkey="id", color="Value",
+        center={"lat": -13.15, "lon": 27.85}, zoom=5, map_style="carto-positron",
+    )
+    return figure_payload_bytes(fig)
+
+
+def _best(run, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = run()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def lod_report(n_areas=116, repeats=5):
+    """
+    Returns:
+        pd.DataFrame: One row per level of detail with its size, validity,
+        figure payload and render time, and the zooms it is served at.
+    """
+    gdf = synthetic_layer(n_areas)
+    assert shapely.coverage_is_valid(gdf.geometry.array), "synthetic layer is not a coverage"
+
+    start = time.perf_counter()
+    levels = build_boundary_levels(gdf, "ADM2_EN")
+    build_s = time.perf_counter() - start
+
+    values = pd.DataFrame({"Key": levels["key"].unique()})
+    values["Value"] = np.random.default_rng(1).uniform(0, 100, len(values)).round(1)
+    served = {lod: [zoom for zoom in range(13) if lod_for_zoom(zoom) == lod] for lod in BOUNDARY_LODS}
+
+    rows = []
+    for lod in BOUNDARY_LODS:
+        encoded = levels[levels["lod"] == lod]
+        geoms = shapely.from_wkb(encoded["wkb"].to_numpy())
+        geojson = boundary_geojson(levels, lod)
+        seconds, payload = _best(lambda: render(geojson, values), repeats)
+        rows.append({
+            "lod": lod,
+            "tolerance": BOUNDARY_LODS[lod]["tolerance"],
+            "zooms": f"{min(served[lod])}-{max(served[lod])}" if served[lod] else "-",
+            "vertices": int(encoded["vertices"].sum()),
+            "wkb_bytes": int(encoded["wkb"].map(len).sum()),
+            "geojson_bytes": len(json.dumps(geojson, separators=(",", ":"))),
+            "coverage_valid": bool(shapely.coverage_is_valid(geoms)),
+            "payload_bytes": payload,
+            "render_s": seconds,
+        })
+    out = pd.DataFrame(rows)
+    out.attrs["build_s"] = build_s
+    return out
+
+
+if __name__ == "__main__":
+    n_areas = int(sys.argv[1]) if len(sys.argv) > 1 else 116
+    report = lod_report(n_areas)
+    print(f"levels built in {report.attrs['build_s']:.2f} s")
+    print(report.to_string(index=False, float_format=lambda v: f"{v:,.4f}"))
@@ -0,0 +1,56 @@
+# benchmarks/figure_payload.py
+"""
+Bytes of Plotly JSON each page sends to the browser on its first run.
+
+Every page is executed headlessly with Streamlit's ``AppTest`` and the
+serialized spec of each ``st.plotly_chart`` element is measured, i.e. the
+exact payload that goes over the wire.
+
+Run from the repository root::
+
+    python -m benchmarks.figure_payload [page.py ...]
+"""
+import glob
+import os
+import sys
+import warnings
+
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+
+def page_payloads(pages=None):
+    """
+    Returns:
+        pd.DataFrame: One row per page with the number of charts and their
+        total and largest serialized size in KiB.
+    """
+    pages = pages or ["zhai.py"] + sorted(glob.glob("pages/*.py"))
+    rows = []
+    for page in pages:
+        at = AppTest.from_file(os.path.abspath(page), default_timeout=300).run()
+        sizes = [len(chart.proto.spec.encode("utf-8")) for chart in at.get("plotly_chart")]
+        rows.append({
+            "page": page,
+            "charts": len(sizes),
+            "total_kib": sum(sizes) / 1024,
+            "largest_kib": max(sizes, default=0) / 1024,
+        })
+
+    report = pd.DataFrame(rows)
+    report.loc[len(report)] = {
+        "page": "TOTAL",
+        "charts": report["charts"].sum(),
+        "total_kib": report["total_kib"].sum(),
+        "largest_kib": report["largest_kib"].max(),
+    }
+    report["charts"] = report["charts"].astype(int)
+    return report
+
+
+if __name__ == "__main__":
+    warnings.filterwarnings("ignore")
+    print(page_payloads(sys.argv[1:]).to_string(
+        index=False,
+        formatters={"total_kib": "{:,.1f}".format, "largest_kib": "{:,.1f}".format},
+    ))
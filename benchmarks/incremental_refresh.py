@@ -0,0 +1,174 @@
+# benchmarks/incremental_refresh.py
+"""
+Cost of refreshing a DHS dataset and its derived artifacts (trend
+projections, KPI snapshot, cube) after a new export, rebuilt in full versus
+refreshed incrementally from the delta (utils/refresh.py), for deltas of
+increasing size.
+
+The export repeats the rows of the dhs-mobile CSV up to ``n_rows`` as
+separate surveys (unique ``SurveyId`` + ``DataId``, their own indicator
+ids), so the number of series grows with it. The new export revises
+``Value`` on a block of consecutive rows, as a re-released indicator set
+would.
+
+The incremental refresh is split into
+
+- ``diff``: read the stored rows, stream the new export and diff them on the
+  row key; linear in the export size, whatever the delta
+- ``apply``: rewrite the store files holding changed rows and write the delta
+- ``derived``: refit the touched series and refill the touched cube blocks
+
+Both paths re-ingest the dataset into the warehouse, which is included.
+
+Run from the repository root::
+
+    python -m benchmarks.incremental_refresh [n_rows]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import pandas as pd
+import pyarrow.dataset as ds
+
+from utils.catalog import CATALOG, ROW_KEYS
+from utils.cube import CUBE_COLUMNS, build_cube, update_cube
+from utils.dhs_store import DHS_SCHEMA, STORE_PARTITIONING, STORE_SCHEMA, apply_delta, with_regions
+from utils.refresh import delta_rows, diff_rows, update_projections, update_snapshot
+from utils.streaming import required_columns, stream_ingest
+from utils.trends import project_series, snapshot_table
+from utils.warehouse import ingest
+
+SOURCE = "dhs-mobile"
+DELTA_ROWS = (100, 1_000, 10_000, 50_000)
+
+
+def synthetic_export(path, n_rows):
+    """Write a DHS-layout CSV of ``n_rows`` rows, one survey per copy of the source rows."""
+    rows = pd.read_csv(CATALOG[SOURCE]["path"], dtype=str)
+    rows = rows[~rows["ISO3"].fillna("").str.startswith("#")]
+    copies = []
+    for copy in range(-(-n_rows // len(rows))):
+        block = rows.copy()
+        block["SurveyId"] = block["SurveyId"] + f"-{copy}"
+        block["DataId"] = [str(copy * len(rows) + i) for i in range(len(rows))]
+        block["IndicatorId"] = block["IndicatorId"] + f"_{copy}"
+        block["Indicator"] = block["Indicator"] + f" ({copy})"
+        copies.append(block)
+    export = pd.concat(copies, ignore_index=True).iloc[:n_rows]
+    export.to_csv(path, index=False)
+    return export
+
+
+def _ingest(path, write, work_dir):
+    return stream_ingest(
+        "benchmark",
+        path,
+        DHS_SCHEMA,
+        lambda batches: write(with_regions(batches)),
+        required=required_columns(CATALOG[SOURCE]),
+        sort_by=["SurveyYear", "Indicator"],
+        quarantine_dir=work_dir,
+    )
+
+
+def _store(store_dir):
+    return ds.dataset(store_dir, schema=STORE_SCHEMA, format="parquet", partitioning=STORE_PARTITIONING)
+
+
+def full_refresh(path, store_dir, work_dir):
+    """Rebuild the stored dataset and every derived artifact."""
+    shutil.rmtree(store_dir, ignore_errors=True)
+
+    def write(batches):
+        ds.write_dataset(
+            batches, store_dir, schema=STORE_SCHEMA, format="parquet", partitioning=STORE_PARTITIONING,
+            basename_template=f"{SOURCE}-{{i}}.parquet",
+        )
+
+    _ingest(path, write, work_dir)
+    df = _store(store_dir).to_table().to_pandas()
+    long = ingest(df, SOURCE, "dhs")
+    return {
+        "projections": project_series(long),
+        "snapshot": snapshot_table(long),
+        "cube": build_cube(df[CUBE_COLUMNS]),
+    }
+
+
+def incremental_refresh(path, store_dir, work_dir, derived):
+    """Diff, apply the delta to the store and update ``derived``; returns the seconds of each step."""
+    start = time.perf_counter()
+    old = _store(store_dir).to_table().to_pandas()
+    batches = []
+    _ingest(path, batches.extend, work_dir)
+    new = pd.concat([batch.to_pandas() for batch in batches], ignore_index=True)
+    delta = diff_rows(old, new, ROW_KEYS["dhs"])
+    diffed = time.perf_counter()
+
+    apply_delta(SOURCE, delta, "revised", store_dir=os.path.dirname(store_dir))
+    applied = time.perf_counter()
+
+    df = _store(store_dir).to_table().to_pandas()
+    long = ingest(df, SOURCE, "dhs")
+    deltas, schemas = {SOURCE: delta}, {SOURCE: "dhs"}
+    update_projections(derived["projections"], long, deltas, schemas)
+    update_snapshot(derived["snapshot"], long, deltas, schemas)
+    cube = update_cube(derived["cube"], df[CUBE_COLUMNS], delta_rows(delta)[CUBE_COLUMNS])
+    done = time.perf_counter()
+    return {
+        "changed": len(delta["changed_new"]),
+        "diff_s": diffed - start,
+        "apply_s": applied - diffed,
+        "derived_s": done - applied,
+        "cube_updated": cube is not None,
+    }
+
+
+def refresh_report(n_rows=200_000):
+    """
+    Returns:
+        pd.DataFrame: One row per delta size with the full rebuild time and
+        the time of each incremental step.
+    """
+    work_dir = tempfile.mkdtemp(prefix="refresh-")
+    try:
+        base_path = os.path.join(work_dir, "export.csv")
+        export = synthetic_export(base_path, n_rows)
+        store_dir = os.path.join(work_dir, "store", f"dataset={SOURCE}")
+        rows = []
+        for n_changed in DELTA_ROWS:
+            n_changed = min(n_changed, n_rows)
+            # Stored version: the base export, with its derived artifacts
+            derived = full_refresh(base_path, store_dir, work_dir)
+
+            revised = export.copy()
+            start = (n_rows - n_changed) // 2
+            values = pd.to_numeric(revised["Value"].iloc[start:start + n_changed], errors="coerce")
+            revised.iloc[start:start + n_changed, revised.columns.get_loc("Value")] = (values + 1).astype(str)
+            path = os.path.join(work_dir, f"revised-{n_changed}.csv")
+            revised.to_csv(path, index=False)
+
+            steps = incremental_refresh(path, store_dir, work_dir, derived)
+
+            full_dir = os.path.join(work_dir, "full", f"dataset={SOURCE}")
+            begin = time.perf_counter()
+            full_refresh(path, full_dir, work_dir)
+            full_s = time.perf_counter() - begin
+
+            rows.append({
+                "delta_rows": steps["changed"],
+                "full_s": full_s,
+                **{k: v for k, v in steps.items() if k != "changed"},
+                "incremental_s": steps["diff_s"] + steps["apply_s"] + steps["derived_s"],
+            })
+        return pd.DataFrame(rows)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    print(refresh_report(n_rows).to_string(index=False, float_format=lambda v: f"{v:,.3f}"))
@@ -0,0 +1,107 @@
+# benchmarks/ingest_throughput.py
+"""
+Throughput and peak memory of the streaming ingest (utils/streaming.py) on
+a large synthetic DHS export, at several chunk sizes.
+
+The export repeats the rows of the dhs-mobile CSV up to ``n_rows`` and
+breaks one row in a thousand (text in ``Value``, a missing year), so the
+quarantine path is exercised too. Every run is made in a fresh process so
+its peak resident memory is its own.
+
+Run from the repository root::
+
+    python -m benchmarks.ingest_throughput [n_rows]
+"""
+import os
+import resource
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+
+from utils.catalog import CATALOG
+from utils.dhs_store import DHS_SCHEMA, STORE_PARTITIONING, STORE_SCHEMA, with_regions
+from utils.streaming import required_columns, stream_ingest
+
+SOURCE = "dhs-mobile"
+CHUNK_SIZES = (10_000, 50_000, 200_000)
+
+
+def synthetic_export(path, n_rows, bad_every=1000, seed=0):
+    """Write a DHS-layout CSV of ``n_rows`` rows, one in ``bad_every`` invalid."""
+    rows = pd.read_csv(CATALOG[SOURCE]["path"], dtype=str)
+    rows = rows[~rows["ISO3"].fillna("").str.startswith("#")]
+    header = True
+    rng = np.random.default_rng(seed)
+    written = 0
+    while written < n_rows:
+        block = rows.iloc[: n_rows - written].copy()
+        bad = rng.random(len(block)) < 1 / bad_every
+        block.loc[bad, "Value"] = "not reported"
+        block.loc[np.roll(bad, 1), "SurveyYear"] = ""
+        block.to_csv(path, mode="a", header=header, index=False)
+        header = False
+        written += len(block)
+    return os.path.getsize(path)
+
+
+def _run(path, chunk_rows, work_dir):
+    store = os.path.join(work_dir, f"store-{chunk_rows}")
+
+    def write(batches):
+        ds.write_dataset(
+            with_regions(batches), store, schema=STORE_SCHEMA, format="parquet", partitioning=STORE_PARTITIONING,
+        )
+
+    report = stream_ingest(
+        "benchmark",
+        path,
+        DHS_SCHEMA,
+        write,
+        required=required_columns(CATALOG[SOURCE]),
+        sort_by=["SurveyYear", "Indicator"],
+        chunk_rows=chunk_rows,
+        quarantine_dir=work_dir,
+    )
+    shutil.rmtree(store, ignore_errors=True)
+    # ru_maxrss is in KiB on Linux
+    report["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return report
+
+
+def throughput_report(n_rows=500_000):
+    """
+    Returns:
+        pd.DataFrame: One row per chunk size with the rows read, written and
+        quarantined, rows/s, MB/s and peak resident memory.
+    """
+    work_dir = tempfile.mkdtemp(prefix="ingest-")
+    try:
+        path = os.path.join(work_dir, "export.csv")
+        size_mb = synthetic_export(path, n_rows) / 1e6
+        rows = []
+        for chunk_rows in CHUNK_SIZES:
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                report = pool.submit(_run, path, chunk_rows, work_dir).result()
+            rows.append({
+                "chunk_rows": chunk_rows,
+                "rows": report["rows"],
+                "written": report["written"],
+                "quarantined": report["quarantined"],
+                "seconds": report["seconds"],
+                "rows_per_s": report["rows_per_s"],
+                "mb_per_s": size_mb / report["seconds"],
+                "peak_rss_mb": report["peak_rss_mb"],
+            })
+        return pd.DataFrame(rows)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    print(throughput_report(n_rows).to_string(index=False, float_format=lambda v: f"{v:,.1f}"))
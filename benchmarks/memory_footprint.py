@@ -0,0 +1,49 @@
+# benchmarks/memory_footprint.py
+"""
+Memory footprint of every catalog dataset: plain ``pd.read_csv`` versus the
+compact frames served by ``get_dataset``.
+
+Run from the repository root::
+
+    python -m benchmarks.memory_footprint
+"""
+import pandas as pd
+
+from utils.catalog import CATALOG
+from utils.data_loader import get_dataset
+from utils.streaming import source_encoding
+
+
+def memory_report():
+    """
+    Returns:
+        pd.DataFrame: One row per dataset with raw and compact sizes in KiB.
+    """
+    rows = []
+    for name, spec in CATALOG.items():
+        raw = pd.read_csv(spec["path"], encoding=source_encoding(spec))
+        compact = get_dataset(name)
+        rows.append({
+            "dataset": name,
+            "rows": len(compact),
+            "raw_kib": raw.memory_usage(deep=True).sum() / 1024,
+            "compact_kib": compact.memory_usage(deep=True).sum() / 1024,
+        })
+
+    report = pd.DataFrame(rows)
+    total = report[["rows", "raw_kib", "compact_kib"]].sum()
+    report.loc[len(report)] = {"dataset": "TOTAL", **total.to_dict()}
+    report["rows"] = report["rows"].astype(int)
+    report["reduction"] = 1 - report["compact_kib"] / report["raw_kib"]
+    return report
+
+
+if __name__ == "__main__":
+    print(memory_report().to_string(
+        index=False,
+        formatters={
+            "raw_kib": "{:,.1f}".format,
+            "compact_kib": "{:,.1f}".format,
+            "reduction": "{:.0%}".format,
+        },
+    ))
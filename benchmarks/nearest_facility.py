@@ -0,0 +1,60 @@
+# benchmarks/nearest_facility.py
+"""
+Throughput of the batch nearest-facility engine (utils/access.py) for one
+million random query points over Zambia, on one CPU core and on a process
+pool.
+
+Run from the repository root::
+
+    python -m benchmarks.nearest_facility [n_points] [processes]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.access import nearest_facility_distances
+from utils.facilities import ZAMBIA_BBOX, build_facility_store, read_facility_points
+
+
+def random_points(n, bbox=ZAMBIA_BBOX, seed=0):
+    rng = np.random.default_rng(seed)
+    south, west, north, east = bbox
+    return rng.uniform(south, north, n), rng.uniform(west, east, n)
+
+
+def throughput_report(n_points=1_000_000, processes=None):
+    """
+    Returns:
+        pd.DataFrame: One row per (facility filter, process count) with the
+        wall time and query points per second.
+    """
+    processes = processes or os.cpu_count() or 1
+    store = build_facility_store(read_facility_points())
+    lat, lon = random_points(n_points)
+
+    rows = []
+    for label, filters in (("all", {}), ("hospitals", {"amenity": "hospital"})):
+        for workers in sorted({1, processes}):
+            start = time.perf_counter()
+            nearest_facility_distances(store, lat, lon, processes=workers, **filters)
+            seconds = time.perf_counter() - start
+            rows.append({
+                "facilities": label,
+                "processes": workers,
+                "seconds": seconds,
+                "points_per_s": n_points / seconds,
+            })
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    n_points = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    print(f"{n_points:,} query points, {os.cpu_count()} CPU core(s) available")
+    print(throughput_report(n_points, processes).to_string(
+        index=False,
+        formatters={"seconds": "{:.3f}".format, "points_per_s": "{:,.0f}".format},
+    ))
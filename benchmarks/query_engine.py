@@ -0,0 +1,120 @@
+# benchmarks/query_engine.py
+"""
+Filter patterns of the DHS and COVID-prevention pages, run through the
+pandas path (load the dataset frame, then mask and group it) and through
+the DuckDB query engine (utils/query_engine.py), which pushes the column
+selection and the filters down to the Parquet store.
+
+"pandas (load + mask)" reads the frame from the store on every run, as a
+cold session does; "pandas (mask only)" starts from the frame already in
+memory, as every later rerun does.
+
+Run from the repository root::
+
+    python -m benchmarks.query_engine [repeats]
+"""
+import sys
+import time
+
+import pandas as pd
+
+from utils.dhs_store import read_dhs
+from utils.query_engine import build_query_engine, run_query
+
+DHS_COLUMNS = ["Indicator", "SurveyYear", "Value", "CharacteristicLabel"]
+COVID_COLUMNS = ["CountryName", "Indicator", "SurveyYear", "Value"]
+
+
+def _first_indicator(df):
+    return df["Indicator"].dropna().astype(str).sort_values().iloc[0]
+
+
+def dhs_pandas(df, indicator, years):
+    """pages/dhs.py: indicator and survey-year filter, then per-year summary statistics."""
+    filtered = df[(df["Indicator"] == indicator) & (df["SurveyYear"].isin(years))]
+    return filtered.groupby("SurveyYear")["Value"].describe()
+
+
+def dhs_engine(engine, indicator, years):
+    return run_query(
+        engine,
+        "dhs-mobile",
+        where={"Indicator": indicator, "SurveyYear": list(years)},
+        group_by=["SurveyYear"],
+        aggregates={
+            "count": ("count", "Value"),
+            "mean": ("mean", "Value"),
+            "std": ("std", "Value"),
+            "min": ("min", "Value"),
+            "max": ("max", "Value"),
+        },
+    )
+
+
+def covid_pandas(df, country, indicator):
+    """pages/covid_prevention.py: country and indicator trend, then all countries in the latest year."""
+    trend = df[(df["CountryName"] == country) & (df["Indicator"] == indicator)]
+    latest = df[(df["SurveyYear"] == trend["SurveyYear"].max()) & (df["Indicator"] == indicator)]
+    return trend[["SurveyYear", "Value"]], latest[["CountryName", "Value"]]
+
+
+def covid_engine(engine, country, indicator):
+    trend = run_query(
+        engine,
+        "covid-19-prevention",
+        columns=["SurveyYear", "Value"],
+        where={"CountryName": country, "Indicator": indicator},
+        order_by=["SurveyYear"],
+    )
+    latest = run_query(
+        engine,
+        "covid-19-prevention",
+        columns=["CountryName", "Value"],
+        where={"SurveyYear": int(trend["SurveyYear"].max()), "Indicator": indicator},
+    )
+    return trend, latest
+
+
+def _best(run, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def timing_report(repeats=20):
+    """
+    Returns:
+        pd.DataFrame: Best wall time of each method per page pattern.
+    """
+    engine = build_query_engine()
+    dhs = read_dhs("dhs-mobile", columns=DHS_COLUMNS)
+    covid = read_dhs("covid-19-prevention", columns=COVID_COLUMNS)
+    dhs_args = (_first_indicator(dhs), sorted(dhs["SurveyYear"].unique()))
+    covid_args = (covid["CountryName"].iloc[0], _first_indicator(covid))
+
+    cases = {
+        "dhs.py": {
+            "pandas (load + mask)": lambda: dhs_pandas(read_dhs("dhs-mobile", columns=DHS_COLUMNS), *dhs_args),
+            "pandas (mask only)": lambda: dhs_pandas(dhs, *dhs_args),
+            "duckdb": lambda: dhs_engine(engine, *dhs_args),
+        },
+        "covid_prevention.py": {
+            "pandas (load + mask)": lambda: covid_pandas(read_dhs("covid-19-prevention", columns=COVID_COLUMNS), *covid_args),
+            "pandas (mask only)": lambda: covid_pandas(covid, *covid_args),
+            "duckdb": lambda: covid_engine(engine, *covid_args),
+        },
+    }
+    rows = [
+        {"pattern": pattern, "method": method, "seconds": _best(run, repeats)}
+        for pattern, methods in cases.items()
+        for method, run in methods.items()
+    ]
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print(timing_report(repeats).to_string(index=False, float_format=lambda v: f"{v:,.5f}"))
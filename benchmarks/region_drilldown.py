@@ -0,0 +1,162 @@
+# benchmarks/region_drilldown.py
+"""
+Region drill-down (national -> province -> district) on a synthetic
+subnational DHS export, read from the store partitioned by level and
+province versus a scan of the whole dataset followed by a mask.
+
+Every national row of the dhs-mobile CSV is followed by the same
+indicator for the ten provinces (``LevelRank`` 1) and ``districts``
+districts in each (``LevelRank`` 2), as STATcompiler subnational exports
+list them. The export is streamed with small chunks so provinces and their
+districts straddle chunk boundaries.
+
+Run from the repository root::
+
+    python -m benchmarks.region_drilldown [districts]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+
+from utils.catalog import CATALOG
+from utils.dhs_store import DHS_SCHEMA, STORE_PARTITIONING, STORE_SCHEMA, scan_dataset, with_regions
+from utils.regions import REGION_COLUMNS, area_names, region_rollup
+from utils.streaming import required_columns, stream_ingest
+
+SOURCE = "dhs-mobile"
+PROVINCES = [
+    "Central", "Copperbelt", "Eastern", "Luapula", "Lusaka",
+    "Muchinga", "Northern", "North-Western", "Southern", "Western",
+]
+COLUMNS = [*REGION_COLUMNS, "CharacteristicLabel", "Indicator", "SurveyYear", "Value"]
+
+
+def synthetic_export(path, districts=12, seed=0):
+    """Write a subnational DHS-layout CSV; returns the expected province of every row."""
+    rows = pd.read_csv(CATALOG[SOURCE]["path"], dtype=str)
+    rows = rows[~rows["ISO3"].fillna("").str.startswith("#")].reset_index(drop=True)
+    rng = np.random.default_rng(seed)
+
+    areas = [("", "", "")]
+    for province in PROVINCES:
+        areas.append(("1", province, province))
+        areas += [("2", f"..{province} district {d}", province) for d in range(1, districts + 1)]
+
+    blocks = []
+    expected = []
+    for rank, label, province in areas:
+        block = rows.copy()
+        if rank:
+            block["CharacteristicCategory"] = "Region"
+            block["CharacteristicLabel"] = label
+            block["LevelRank"] = rank
+            block["RegionId"] = block["SurveyId"] + "-" + area_names(pd.Series([label]))[0]
+            block["IsTotal"] = "0"
+            block["Value"] = (pd.to_numeric(block["Value"]) * rng.uniform(0.6, 1.4, len(block))).round(1).astype(str)
+        blocks.append(block)
+        expected.append(province)
+    # Interleave: each national row, then its provinces and their districts
+    export = pd.concat(blocks, keys=range(len(blocks)), names=["area", "row"]).swaplevel().sort_index()
+    export["DataId"] = [str(i) for i in range(len(export))]
+    truth = pd.Series([expected[area] for _, area in export.index], name="Province")
+    export.to_csv(path, index=False)
+    return truth
+
+
+def build_store(path, store_dir, work_dir, chunk_rows=5_000):
+    def write(batches):
+        ds.write_dataset(
+            with_regions(batches), store_dir, schema=STORE_SCHEMA, format="parquet",
+            partitioning=STORE_PARTITIONING,
+        )
+
+    return stream_ingest(
+        "benchmark", path, DHS_SCHEMA, write,
+        required=required_columns(CATALOG[SOURCE]),
+        sort_by=["SurveyYear", "Indicator"],
+        chunk_rows=chunk_rows,
+        quarantine_dir=work_dir,
+    )
+
+
+def drill_scan(store_dir, indicator, province):
+    """Whole dataset, then masks and the rollup computed on the fly."""
+    df = scan_dataset(store_dir, columns=COLUMNS)
+    df = df[df["Indicator"] == indicator]
+    level = 0 if province is None else 1
+    rows = df[df["Level"].isin([level, level + 1]) & ((df["Province"] == province) if province else True)]
+    children = rows[rows["Level"] == level + 1]
+    return children, children.groupby("SurveyYear")["Value"].describe()
+
+
+def drill_pruned(store_dir, rollups, indicator, province):
+    """Only the partitions of the two levels (and the province), rollup looked up."""
+    level = 0 if province is None else 1
+    filters = {"Level": [level, level + 1], "Indicator": indicator}
+    if province:
+        filters["Province"] = province
+    rows = scan_dataset(store_dir, columns=COLUMNS, filters=filters)
+    children = rows[rows["Level"] == level + 1]
+    rollup = rollups[(rollups["Level"] == level) & (rollups["Province"] == (province or "")) & (rollups["Indicator"] == indicator)]
+    return children, rollup
+
+
+def _best(run, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def drilldown_report(districts=12, repeats=10):
+    """
+    Returns:
+        pd.DataFrame: Best wall time of each method per drill-down step,
+        with the rows in the partitions each one reads.
+    """
+    work_dir = tempfile.mkdtemp(prefix="drilldown-")
+    try:
+        path = os.path.join(work_dir, "export.csv")
+        store_dir = os.path.join(work_dir, "store")
+        truth = synthetic_export(path, districts)
+        report = build_store(path, store_dir, work_dir)
+
+        stored = scan_dataset(store_dir, columns=[*REGION_COLUMNS, "DataId"])
+        assigned = stored.set_index(stored["DataId"].astype(int)).sort_index()["Province"]
+        assert (assigned.to_numpy() == truth.to_numpy()).all(), "province assignment differs from the export"
+
+        rollups = region_rollup(scan_dataset(store_dir, columns=COLUMNS, filters={"Level": [1, 2]}))
+        indicator = str(scan_dataset(store_dir, columns=["Indicator"])["Indicator"].iloc[0])
+
+        store = ds.dataset(store_dir, schema=STORE_SCHEMA, format="parquet", partitioning=STORE_PARTITIONING)
+        rows = []
+        for step, province in (("national -> provinces", None), ("province -> districts", "Lusaka")):
+            level = 0 if province is None else 1
+            partitions = ds.field("Level").isin([level, level + 1])
+            if province:
+                partitions &= ds.field("Province") == province
+            for method, run, read in (
+                ("full scan + mask", lambda: drill_scan(store_dir, indicator, province), store.count_rows()),
+                ("partition-pruned", lambda: drill_pruned(store_dir, rollups, indicator, province), store.count_rows(filter=partitions)),
+            ):
+                rows.append({"step": step, "method": method, "partition_rows": read, "seconds": _best(run, repeats)})
+        out = pd.DataFrame(rows)
+        out.attrs["rows"] = report["written"]
+        return out
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    districts = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    report = drilldown_report(districts)
+    print(f"{report.attrs['rows']:,} stored rows")
+    print(report.to_string(index=False, float_format=lambda v: f"{v:,.5f}"))
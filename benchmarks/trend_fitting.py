@@ -0,0 +1,98 @@
+# benchmarks/trend_fitting.py
+"""
+Time to fit and project every indicator series in the catalog with the
+batch trend engine (utils/trends.py), against one least-squares fit per
+series.
+
+The per-series baseline uses scikit-learn's ``LinearRegression`` when it is
+installed and ``scipy.linalg.lstsq`` (the solver behind it) otherwise.
+
+Run from the repository root::
+
+    python -m benchmarks.trend_fitting [repeats]
+"""
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+from scipy import linalg
+
+from utils.catalog import CATALOG, WAREHOUSE_LAYOUTS
+from utils.dhs_store import read_dhs
+from utils.streaming import source_encoding
+from utils.trends import TREND_HORIZON, project_series
+from utils.warehouse import SERIES_KEY, build_warehouse, ingest
+
+
+def catalog_series():
+    """The indicator warehouse of every catalog dataset with a layout, built without Streamlit."""
+    frames = []
+    for name, spec in CATALOG.items():
+        if spec["schema"] not in WAREHOUSE_LAYOUTS:
+            continue
+        if spec["format"] == "dhs-store":
+            df = read_dhs(name)
+        else:
+            df = pd.read_csv(spec["path"], encoding=source_encoding(spec), dtype=spec["dtypes"])
+        frames.append(ingest(df, name, spec["schema"]))
+    return build_warehouse(frames)
+
+
+def _per_series_fit():
+    try:
+        from sklearn.linear_model import LinearRegression
+    except ImportError:
+        def fit(x, y, future):
+            coef, _, _, _ = linalg.lstsq(np.column_stack((np.ones_like(x), x)), y)
+            return coef[0] + coef[1] * future
+        return fit, "scipy.linalg.lstsq"
+
+    def fit(x, y, future):
+        return LinearRegression().fit(x[:, None], y).predict(future[:, None])
+    return fit, "sklearn LinearRegression"
+
+
+def per_series_projection(long, horizon=TREND_HORIZON):
+    """One fit per series, the way charts used to project one indicator at a time."""
+    fit, _ = _per_series_fit()
+    out = []
+    for _, group in long.groupby(SERIES_KEY, sort=False, observed=True):
+        x = group["year"].to_numpy(dtype=np.float64)
+        if len(np.unique(x)) < 2:
+            continue
+        future = x.max() + np.arange(1, horizon + 1)
+        out.append(fit(x, group["value"].to_numpy(dtype=np.float64), future))
+    return out
+
+
+def timing_report(repeats=5):
+    """
+    Returns:
+        pd.DataFrame: Best wall time of each method over ``repeats`` runs.
+    """
+    long = catalog_series()
+    n_series = long.groupby(SERIES_KEY, observed=True).ngroups
+    _, baseline = _per_series_fit()
+
+    rows = []
+    for label, run in (
+        ("batch (utils/trends.py)", lambda: project_series(long)),
+        (f"per series ({baseline})", lambda: per_series_projection(long)),
+    ):
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+        rows.append({"method": label, "series": n_series, "seconds": min(times)})
+    report = pd.DataFrame(rows)
+    report["speedup"] = report["seconds"].max() / report["seconds"]
+    return report
+
+
+if __name__ == "__main__":
+    warnings.filterwarnings("ignore")
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(timing_report(repeats).to_string(index=False, float_format=lambda v: f"{v:,.4f}"))
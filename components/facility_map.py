@@ -0,0 +1,105 @@
+import folium
+import numpy as np
+import plotly.graph_objects as go
+
+# Extra space queried around the viewport, as a fraction of its size, so
+# small pans do not uncover empty map before the next update arrives
+VIEWPORT_MARGIN = 0.25
+
+
+def facility_map_figure(markers, zoom, height=400, title=None):
+    """
+    Map of aggregated facility markers (see utils.facilities.facility_markers).
+
+    Clusters are drawn with a size that grows with the log of their count so
+    single facilities stay visible next to large clusters.
+    """
+    counts = markers["count"].to_numpy()
+    total = max(int(counts.sum()), 1)
+    center = {
+        "lat": float((markers["lat"].to_numpy() * counts).sum() / total),
+        "lon": float((markers["lon"].to_numpy() * counts).sum() / total),
+    }
+
+    fig = go.Figure(go.Scattermapbox(
+        lat=markers["lat"],
+        lon=markers["lon"],
+        mode="markers",
+        marker=dict(
+            size=np.round(6 + 4 * np.log2(counts), 1),
+            color=(counts > 1).astype(np.int8),
+            colorscale=[[0, "#1f77b4"], [1, "#d62728"]],
+            cmin=0,
+            cmax=1,
+            opacity=0.8,
+        ),
+        text=markers["label"],
+        hovertemplate="%{text}<extra></extra>",
+    ))
+    fig.update_layout(
+        title=title,
+        height=height,
+        mapbox=dict(style="open-street-map", zoom=zoom, center=center),
+        margin={"r": 0, "t": 40, "l": 0, "b": 0},
+        hoverlabel=dict(bgcolor="white", font_size=12),
+    )
+    return fig
+
+
+def viewport_bbox(bounds, margin=VIEWPORT_MARGIN):
+    """
+    Query box for the bounds reported by ``st_folium``.
+
+    Args:
+        bounds (dict): Leaflet bounds (``_southWest`` / ``_northEast`` corners).
+        margin (float): Padding added on every side, as a fraction of the
+            viewport height/width.
+
+    Returns:
+        tuple or None: (south, west, north, east), or None when the map has
+        not reported its bounds yet.
+    """
+    try:
+        south = float(bounds["_southWest"]["lat"])
+        west = float(bounds["_southWest"]["lng"])
+        north = float(bounds["_northEast"]["lat"])
+        east = float(bounds["_northEast"]["lng"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    pad_lat = (north - south) * margin
+    pad_lon = (east - west) * margin
+    return (
+        max(south - pad_lat, -90.0),
+        max(west - pad_lon, -180.0),
+        min(north + pad_lat, 90.0),
+        min(east + pad_lon, 180.0),
+    )
+
+
+def facility_feature_group(markers, name="Facilities"):
+    """
+    Folium layer of aggregated facility markers, for ``st_folium(feature_group_to_add=...)``.
+
+    Passing the markers as a feature group (rather than drawing them on the
+    map itself) lets the browser swap just this layer when the viewport
+    changes, without re-mounting the map.
+    """
+    group = folium.FeatureGroup(name=name)
+    counts = markers["count"].to_numpy()
+    radius = np.round(3 + 2 * np.log2(counts), 1)
+    for lat, lon, count, size, label in zip(
+        markers["lat"].to_numpy(), markers["lon"].to_numpy(), counts, radius, markers["label"].to_numpy()
+    ):
+        color = "#d62728" if count > 1 else "#1f77b4"
+        folium.CircleMarker(
+            location=(float(lat), float(lon)),
+            radius=float(size),
+            color=color,
+            weight=1,
+            fill=True,
+            fill_color=color,
+            fill_opacity=0.7,
+            tooltip=str(label),
+        ).add_to(group)
+    return group
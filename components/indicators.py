@@ -1,53 +1,75 @@
+import math
+
 import streamlit as st
 import plotly.graph_objects as go
-import pandas as pd
+from plotly.subplots import make_subplots
+from utils.data_loader import load_indicator_tracker
+from utils.figures import plotly_chart
+from utils.targets import TARGET_YEAR
+
+TRACKER_COLUMNS = 4
 
-def load_indicator_data(file_path):
-    df = pd.read_csv(file_path)
-    # Filter Zambia data and relevant columns
-    
-    return df
+def load_indicator_data():
+    """Baseline, latest and target values of the key indicators, cached across reruns (see utils/targets.py)."""
+    return load_indicator_tracker()
 
-def show_indicators(df):
+def show_indicators(tracker):
     st.header("Progress on Key Health Indicators")
 
-    # Filter key indicators (customize based on data)
-    key_indicators = [
-        "Contraceptive Prevalence Rate (%)",
-        "Under-5 Mortality Rate (per 1000 live births)",
-        "Infant Mortality Rate (per 1000 live births)",
-        "Malaria Incidence (cases per 1000 population)",
-        "HIV Incidence (new cases)",
-        "TB Incidence (per 100,000 population)"
-    ]
-
-    # For this example, build mock data based on previous hardcoded or from df
-    indicators = {
-        "Contraceptive Prevalence Rate (%)": {"2014": 45, "2018": 50, "Target 2026": 60},
-        "Under-5 Mortality Rate (per 1000 live births)": {"2013": 75, "2018": 61, "Target 2026": 25},
-        "Infant Mortality Rate (per 1000 live births)": {"2013": 45, "2018": 42, "Target 2026": 15},
-        "Malaria Incidence (cases per 1000 population)": {"2021": 340, "Target 2026": 201},
-        "HIV Incidence (new cases)": {"Current": 28000, "Target 2026": 15000},
-        "TB Incidence (per 100,000 population)": {"2016": 376, "2021": 319, "Target 2026": 169}
-    }
-
-    # Plot indicators with plotly
-    fig = go.Figure()
-    years = sorted({year for vals in indicators.values() for year in vals.keys()})
-
-    for ind, vals in indicators.items():
-        x = []
-        y = []
-        for yr in years:
-            x.append(str(yr))
-            y.append(vals.get(yr, None))
-        fig.add_trace(go.Scatter(x=x, y=y, mode='lines+markers', name=ind))
+    summary, history = tracker
+    rows = math.ceil(len(summary) / TRACKER_COLUMNS)
+    fig = make_subplots(
+        rows=rows,
+        cols=TRACKER_COLUMNS,
+        subplot_titles=[f"{label} ({unit})" for label, unit in zip(summary["label"], summary["unit"])],
+        horizontal_spacing=0.05,
+        vertical_spacing=0.15,
+    )
+
+    # One panel per indicator: observed series, NHSP baseline and target
+    for i, ind in enumerate(summary.itertuples()):
+        row, col = i // TRACKER_COLUMNS + 1, i % TRACKER_COLUMNS + 1
+        series = history[history["label"] == ind.label]
+        first = i == 0
+        fig.add_trace(go.Scatter(
+            x=series["year"], y=series["value"], mode="lines+markers", name="Observed",
+            legendgroup="observed", showlegend=first, line=dict(color="rgb(31, 119, 180)"), marker=dict(size=4),
+        ), row=row, col=col)
+        fig.add_trace(go.Scatter(
+            x=[ind.baseline_year], y=[ind.baseline], mode="markers", name="NHSP baseline",
+            legendgroup="baseline", showlegend=first, marker=dict(symbol="diamond", size=9, color="gray"),
+        ), row=row, col=col)
+        fig.add_trace(go.Scatter(
+            x=[ind.latest_year, TARGET_YEAR], y=[ind.latest, ind.series_target], mode="lines+markers", name=f"Target {TARGET_YEAR}",
+            legendgroup="target", showlegend=first, line=dict(dash="dot", color="red"),
+            marker=dict(symbol=["circle-open", "star"], size=[6, 12], color="red"),
+        ), row=row, col=col)
 
+    fig.update_annotations(font_size=11)
     fig.update_layout(
         title="Trends and Targets for Key Health Indicators",
-        xaxis_title="Year",
-        yaxis_title="Value",
-        hovermode="x unified",
-        height=450
+        height=300 * rows,
+        legend=dict(orientation="h", y=-0.08),
+    )
+    plotly_chart(fig, use_container_width=True)
+
+    st.dataframe(
+        summary[[
+            "label", "baseline_year", "baseline", "observed_baseline", "latest_year", "latest",
+            "series_target", "rescaled", "progress_pct",
+        ]],
+        column_config={
+            "label": st.column_config.TextColumn("Indicator"),
+            "baseline_year": st.column_config.NumberColumn("Baseline year", format="%d"),
+            "baseline": st.column_config.NumberColumn("NHSP baseline", format="%.1f"),
+            "observed_baseline": st.column_config.NumberColumn("Observed baseline", format="%.1f"),
+            "latest_year": st.column_config.NumberColumn("Latest year", format="%d"),
+            "latest": st.column_config.NumberColumn("Latest value", format="%.1f"),
+            "series_target": st.column_config.NumberColumn(f"Target {TARGET_YEAR}", format="%.0f"),
+            "rescaled": st.column_config.CheckboxColumn("Rescaled"),
+            "progress_pct": st.column_config.ProgressColumn(
+                "Progress to target", format="%.0f%%", min_value=0, max_value=100,
+            ),
+        },
+        hide_index=True,
     )
-    st.plotly_chart(fig, use_container_width=True)
@@ -2,7 +2,48 @@ import streamlit as st
 import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
-from utils.data_loader import load_data, load_malaria
+from utils.annual_reduction import FAN_RATES, rate_row, reduction_fan
+from utils.data_loader import get_dataset
+from utils.figures import plotly_chart
+
+# Projections run to the 2026 national targets
+TARGET_YEAR = 2026
+
+MALARIA_INCIDENCE_CODE = "MALARIA_EST_INCIDENCE"
+TB_INCIDENCE_CODE = "MDG_0000000020"
+HIV_PREVALENCE_ID = "HA_HIVP_B_HIV"
+
+FAN_COLOR = "rgb(31, 119, 180)"
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def cached_fan(last_year, last_value, end_year):
+    """Paths for every slider rate, computed once per starting point."""
+    return reduction_fan(last_year, last_value, end_year)
+
+def fan_figure(fan, rate, title, yaxis_title, name):
+    """
+    Fan of every reduction rate from ``reduction_fan``, with guide lines at
+    ``FAN_RATES`` and the path of the selected ``rate`` highlighted.
+    """
+    years, rates, paths = fan["years"], fan["rates"], fan["paths"]
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=years, y=paths[0], mode="lines", line=dict(width=0), showlegend=False, hoverinfo="skip"))
+    fig.add_trace(go.Scatter(
+        x=years, y=paths[-1], mode="lines", line=dict(width=0), fill="tonexty",
+        fillcolor="rgba(31, 119, 180, 0.15)", name=f"{rates[0]:g}-{rates[-1]:g}% per year", hoverinfo="skip",
+    ))
+    for guide in FAN_RATES:
+        fig.add_trace(go.Scatter(
+            x=years, y=paths[rate_row(rates, guide)], mode="lines", showlegend=False,
+            line=dict(width=1, dash="dot", color="rgba(31, 119, 180, 0.5)"),
+            hovertemplate=f"{guide}% per year: %{{y:.1f}}<extra></extra>",
+        ))
+    fig.add_trace(go.Scatter(
+        x=years, y=paths[rate_row(rates, rate)], mode="lines+markers", name=name,
+        line=dict(width=3, color=FAN_COLOR),
+    ))
+    fig.update_layout(title=title, xaxis_title="Year", yaxis_title=yaxis_title, height=400)
+    return fig
 
 def run_simulation():
     st.header("Interactive Simulation: RMNCAH-N Indicator Progress")
@@ -31,16 +72,18 @@ def run_simulation():
         yaxis_title="Value",
         height=400
     )
-    st.plotly_chart(fig_sim, use_container_width=True)
+    plotly_chart(fig_sim, use_container_width=True)
 
     st.markdown("---")
     # === Malaria ===
     st.header("Malaria Incidence Rate Projection and Simulation")
 
-    malaria_path = "data/malaria_indicators_zmb.csv"
     try:
-        df_malaria = load_malaria()
-        df_malaria = df_malaria[["YEAR (DISPLAY)", "Numeric"]].dropna()
+        df_malaria = get_dataset(
+            "malaria",
+            columns=["YEAR (DISPLAY)", "Numeric"],
+            filters={"GHO (CODE)": MALARIA_INCIDENCE_CODE},
+        ).dropna()
         df_malaria = df_malaria.sort_values("YEAR (DISPLAY)")
     except Exception as e:
         st.error(f"Failed to load malaria data: {e}")
@@ -53,39 +96,34 @@ def run_simulation():
         title="Malaria Incidence Rate Over Time - Zambia",
         labels={"YEAR (DISPLAY)": "Year", "Numeric": "Incidence per 1000"}
     )
-    st.plotly_chart(fig_malaria, use_container_width=True)
+    plotly_chart(fig_malaria, use_container_width=True)
 
     annual_reduction_malaria = st.slider("Annual Reduction Rate for Malaria Incidence (%)", 0.0, 20.0, 5.0, step=0.1)
     last_year_malaria = int(df_malaria["YEAR (DISPLAY)"].max())
     last_value_malaria = df_malaria.loc[df_malaria["YEAR (DISPLAY)"] == last_year_malaria, "Numeric"].values[0]
 
-    years_future_malaria = list(range(last_year_malaria + 1, 2027))
-    projected_values_malaria = [last_value_malaria * ((1 - annual_reduction_malaria / 100) ** i) for i in range(1, len(years_future_malaria) + 1)]
-
-    fig_proj_malaria = go.Figure()
-    fig_proj_malaria.add_trace(go.Scatter(x=years_future_malaria, y=projected_values_malaria, mode='lines+markers', name='Projected Malaria Incidence'))
-    fig_proj_malaria.update_layout(
-        title=f"Malaria Incidence Projection with {annual_reduction_malaria}% Annual Reduction",
-        xaxis_title="Year",
-        yaxis_title="Incidence per 1000",
-        height=400
+    fan_malaria = cached_fan(last_year_malaria, float(last_value_malaria), TARGET_YEAR)
+    plotly_chart(
+        fan_figure(
+            fan_malaria,
+            annual_reduction_malaria,
+            title=f"Malaria Incidence Projection with {annual_reduction_malaria}% Annual Reduction",
+            yaxis_title="Incidence per 1000",
+            name="Projected Malaria Incidence",
+        ),
+        use_container_width=True,
     )
-    st.plotly_chart(fig_proj_malaria, use_container_width=True)
 
     st.markdown("---")
     # === HIV ===
     st.header("HIV Incidence Projection and Simulation")
 
-    hiv_path = "data/hiv-prevalence_national_zmb.csv"
     try:
-        df_hiv = load_data(hiv_path)
-        # Assuming columns like 'Year' and 'Value' or similar, adjust if necessary
-        # Check your CSV column names and adjust below:
-        if "SurveyYear" in df_hiv.columns and "Value" in df_hiv.columns:
-            df_hiv = df_hiv[["SurveyYear", "Value"]].dropna().sort_values("SurveyYear")
-        else:
-            st.warning("HIV data columns 'Year' or 'Value' not found.")
-            return
+        df_hiv = get_dataset(
+            "hiv-prevalence",
+            columns=["SurveyYear", "Value"],
+            filters={"IndicatorId": HIV_PREVALENCE_ID},
+        ).dropna().sort_values("SurveyYear")
     except Exception as e:
         st.error(f"Failed to load HIV data: {e}")
         return
@@ -97,82 +135,64 @@ def run_simulation():
         title="HIV Incidence Over Time - Zambia",
         labels={"Year": "Year", "Value": "Incidence"}
     )
-    st.plotly_chart(fig_hiv, use_container_width=True)
+    plotly_chart(fig_hiv, use_container_width=True)
 
     annual_reduction_hiv = st.slider("Annual Reduction Rate for HIV Incidence (%)", 0.0, 20.0, 3.0, step=0.1)
     last_year_hiv = int(df_hiv["SurveyYear"].max())
     last_value_hiv = df_hiv.loc[df_hiv["SurveyYear"] == last_year_hiv, "Value"].values[0]
 
-    years_future_hiv = list(range(last_year_hiv + 1, 2027))
-    projected_values_hiv = [last_value_hiv * ((1 - annual_reduction_hiv / 100) ** i) for i in range(1, len(years_future_hiv) + 1)]
-
-    fig_proj_hiv = go.Figure()
-    fig_proj_hiv.add_trace(go.Scatter(x=years_future_hiv, y=projected_values_hiv, mode='lines+markers', name='Projected HIV Incidence'))
-    fig_proj_hiv.update_layout(
-        title=f"HIV Incidence Projection with {annual_reduction_hiv}% Annual Reduction",
-        xaxis_title="SurveyYear",
-        yaxis_title="Incidence",
-        height=400
+    fan_hiv = cached_fan(last_year_hiv, float(last_value_hiv), TARGET_YEAR)
+    plotly_chart(
+        fan_figure(
+            fan_hiv,
+            annual_reduction_hiv,
+            title=f"HIV Incidence Projection with {annual_reduction_hiv}% Annual Reduction",
+            yaxis_title="Incidence",
+            name="Projected HIV Incidence",
+        ),
+        use_container_width=True,
     )
-    st.plotly_chart(fig_proj_hiv, use_container_width=True)
 
     st.markdown("---")
-# === Tuberculosis ===
-st.header("Tuberculosis Incidence Projection and Simulation")
-
-tb_path = "data/tuberculosis_indicators_zmb.csv"
-try:
-    df_tb = load_data(tb_path)
-    # Adjust column names here to your dataset; assuming 'YEAR (DISPLAY)' and 'Value'
-    if "YEAR (DISPLAY)" in df_tb.columns and "Value" in df_tb.columns:
-        df_tb = df_tb[["YEAR (DISPLAY)", "Value"]].dropna().sort_values("YEAR (DISPLAY)")
-    else:
-        st.warning("TB data columns 'YEAR (DISPLAY)' or 'Value' not found.")
-        st.stop()
-except Exception as e:
-    st.error(f"Failed to load Tuberculosis data: {e}")
-    st.stop()
-
-# Ensure Value is numeric
-    df_tb["Value"] = pd.to_numeric(df_tb["Value"], errors="coerce")
-    df_tb = df_tb.dropna(subset=["Value"])
+    # === Tuberculosis ===
+    st.header("Tuberculosis Incidence Projection and Simulation")
+
+    try:
+        df_tb = get_dataset(
+            "tuberculosis",
+            columns=["YEAR (DISPLAY)", "Numeric"],
+            filters={"GHO (CODE)": TB_INCIDENCE_CODE},
+        ).dropna().sort_values("YEAR (DISPLAY)")
+    except Exception as e:
+        st.error(f"Failed to load Tuberculosis data: {e}")
+        return
 
     fig_tb = px.line(
         df_tb,
         x="YEAR (DISPLAY)",
-        y="Value",
+        y="Numeric",
         title="Tuberculosis Incidence Over Time - Zambia",
-        labels={"YEAR (DISPLAY)": "Year", "Value": "Incidence per 100,000"}
+        labels={"YEAR (DISPLAY)": "Year", "Numeric": "Incidence per 100,000"}
     )
-    st.plotly_chart(fig_tb, use_container_width=True)
+    plotly_chart(fig_tb, use_container_width=True)
 
     annual_reduction_tb = st.slider(
-        "Annual Reduction Rate for TB Incidence (%)", 
+        "Annual Reduction Rate for TB Incidence (%)",
         0.0, 20.0, 4.0, step=0.1
     )
     last_year_tb = int(df_tb["YEAR (DISPLAY)"].max())
     last_value_tb = float(
-        df_tb.loc[df_tb["YEAR (DISPLAY)"] == last_year_tb, "Value"].values[0]
+        df_tb.loc[df_tb["YEAR (DISPLAY)"] == last_year_tb, "Numeric"].values[0]
     )
 
-    years_future_tb = list(range(last_year_tb + 1, 2027))
-    projected_values_tb = [
-        last_value_tb * ((1 - annual_reduction_tb / 100) ** i)
-        for i in range(1, len(years_future_tb) + 1)
-    ]
-
-    fig_proj_tb = go.Figure()
-    fig_proj_tb.add_trace(go.Scatter(
-        x=years_future_tb, 
-        y=projected_values_tb, 
-        mode='lines+markers', 
-        name='Projected TB Incidence'
-    ))
-    fig_proj_tb.update_layout(
-        title=f"Tuberculosis Incidence Projection with {annual_reduction_tb}% Annual Reduction",
-        xaxis_title="Year",
-        yaxis_title="Incidence per 100,000",
-        height=400
+    fan_tb = cached_fan(last_year_tb, last_value_tb, TARGET_YEAR)
+    plotly_chart(
+        fan_figure(
+            fan_tb,
+            annual_reduction_tb,
+            title=f"Tuberculosis Incidence Projection with {annual_reduction_tb}% Annual Reduction",
+            yaxis_title="Incidence per 100,000",
+            name="Projected TB Incidence",
+        ),
+        use_container_width=True,
     )
-    st.plotly_chart(fig_proj_tb, use_container_width=True)
-
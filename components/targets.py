@@ -0,0 +1,35 @@
+import streamlit as st
+from utils.data_loader import load_target_progress
+from utils.targets import TARGET_YEAR
+
+def show_target_tracker():
+    st.header(f"Are We on Track for the {TARGET_YEAR} Targets?")
+    st.markdown(
+        "Annual reduction needed from the latest observation to reach each target, against the rate "
+        "observed over the preceding years (log-linear trend). Negative rates are increases; "
+        "the gap is how much faster the indicator has to move, largest first. Where the tracked "
+        "series measures the indicator differently from the NHSP baseline, the target is rescaled "
+        "to the series by the ratio of the two in the baseline year."
+    )
+
+    progress = load_target_progress()
+    st.dataframe(
+        progress[[
+            "status", "label", "unit", "last_year", "last_value", "series_target", "rescaled",
+            "required_rate_pct", "observed_rate_pct", "gap_pct", "projected",
+        ]],
+        column_config={
+            "status": st.column_config.TextColumn("Status"),
+            "label": st.column_config.TextColumn("Indicator"),
+            "unit": st.column_config.TextColumn("Unit"),
+            "last_year": st.column_config.NumberColumn("Latest year", format="%d"),
+            "last_value": st.column_config.NumberColumn("Latest value", format="%.1f"),
+            "series_target": st.column_config.NumberColumn(f"Target {TARGET_YEAR}", format="%.0f"),
+            "rescaled": st.column_config.CheckboxColumn("Rescaled"),
+            "required_rate_pct": st.column_config.NumberColumn("Required %/yr", format="%.1f"),
+            "observed_rate_pct": st.column_config.NumberColumn("Observed %/yr", format="%.1f"),
+            "gap_pct": st.column_config.NumberColumn("Gap (points)", format="%.1f"),
+            "projected": st.column_config.NumberColumn(f"{TARGET_YEAR} at observed rate", format="%.1f"),
+        },
+        hide_index=True,
+    )
@@ -2,14 +2,19 @@
 import numpy as np
 import pandas as pd
 import plotly.express as px
-from sklearn.linear_model import LinearRegression
 import streamlit as st
+from utils.annual_reduction import reduction_paths
+from utils.figures import plotly_chart
+from utils.trends import fit_linear_trends, predict_trends
 
 
 def linear_projection(years, values, future_years=5):
     """
     Fit a linear regression on historical data and project values forward.
 
+    Uses the closed-form fit of utils/trends.py; ``project_series`` there
+    projects whole datasets in one batch.
+
     Args:
         years (array-like): Historical years.
         values (array-like): Corresponding indicator values.
@@ -20,18 +25,16 @@ def linear_projection(years, values, future_years=5):
         proj_values (np.array): Predicted values for projected years.
     """
     mask = (~pd.isna(years)) & (~pd.isna(values))
-    x = years[mask].values.reshape(-1, 1)
-    y = values[mask].values
+    x = np.asarray(years[mask], dtype=np.float64)
+    y = np.asarray(values[mask], dtype=np.float64)
     if len(x) < 2:
         return None, None
 
-    model = LinearRegression()
-    model.fit(x, y)
-
+    fit = fit_linear_trends(x[None], y[None], np.ones((1, len(x)), dtype=bool))
     last_year = int(np.max(x))
     proj_years = np.arange(last_year + 1, last_year + 1 + future_years)
-    proj_values = model.predict(proj_years.reshape(-1, 1))
-    return proj_years, proj_values
+    proj_values, _, _ = predict_trends(fit, proj_years)
+    return proj_years, proj_values[0]
 
 
 def simulate_annual_reduction(last_year, last_value, annual_reduction_rate, years=5):
@@ -46,16 +49,12 @@ def simulate_annual_reduction(last_year, last_value, annual_reduction_rate, year
 
     Returns:
         sim_years (np.array): Simulated years.
-        sim_values (list): Simulated values after annual reductions.
+        sim_values (np.array): Simulated values after annual reductions.
+
+    ``reduction_paths`` (utils/annual_reduction.py) evaluates many rates at once.
     """
     sim_years = np.arange(last_year + 1, last_year + 1 + years)
-    sim_values = []
-    current_value = last_value
-
-    for _ in range(years):
-        current_value *= (1 - annual_reduction_rate / 100)
-        sim_values.append(current_value)
-
+    sim_values = reduction_paths(last_value, [annual_reduction_rate], years)[0]
     return sim_years, sim_values
 
 
@@ -122,7 +121,7 @@ def interactive_malaria_simulation(df_malaria, annual_reduction_rate=5.0, simula
                     marker=dict(symbol="star", size=12, color="red"),
                     text=[f"Target: {target_value}"], textposition="top center")
 
-    st.plotly_chart(fig, use_container_width=True)
+    plotly_chart(fig, use_container_width=True)
     st.markdown(f"**Simulation Summary:** With an annual reduction rate of {annual_reduction_rate:.1f}%, "
                 f"malaria incidence is projected to be {sim_values[-1]:.1f} per 1000 population in {sim_years[-1]}.")
 
@@ -145,7 +144,7 @@ def run_example_simulation():
     fig1 = plot_trend_with_projection(df_example, "Year", "Value",
                                      title="Malaria Incidence Rate Projection",
                                      targets={2026: 201})
-    st.plotly_chart(fig1)
+    plotly_chart(fig1)
 
     st.subheader("Example: Interactive Malaria Incidence Simulation")
     annual_reduction = st.slider("Annual Reduction Rate (%)", 0.0, 20.0, 5.0, 0.1)
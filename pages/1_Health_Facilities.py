@@ -1,35 +1,48 @@
+import folium
 import streamlit as st
-import geopandas as gpd
-import plotly.express as px
+from streamlit_folium import st_folium
+from utils.data_loader import load_facility_store
+from utils.facilities import CLUSTER_MAX_ZOOM, ZAMBIA_BBOX, facility_markers
+from components.facility_map import facility_feature_group, viewport_bbox
+
+MAP_KEY = "facility_map"
+DEFAULT_ZOOM = 6
 
 st.title("🏥 Health Facilities Map")
 
 try:
-    gdf = gpd.read_file("data/zambia_health_facilities.geojson")
+    # Shared, indexed facility points; 'name' already falls back to 'name:en', else 'Unknown Facility'
+    store = load_facility_store()
 
-    # Create a column for hover info: prefer 'name', fallback to 'name:en', else 'Unknown'
-    if 'name' in gdf.columns and gdf['name'].notnull().any():
-        gdf['hover_name'] = gdf['name'].fillna(gdf.get('name:en', 'Unknown Facility'))
-    elif 'name:en' in gdf.columns:
-        gdf['hover_name'] = gdf['name:en'].fillna('Unknown Facility')
-    else:
-        gdf['hover_name'] = 'Unknown Facility'
+    # Viewport reported by the map on the previous interaction
+    view = st.session_state.get(MAP_KEY) or {}
+    zoom = view.get("zoom") or DEFAULT_ZOOM
+    # Zambia's extent until the map has reported its own viewport
+    bbox = viewport_bbox(view.get("bounds")) or ZAMBIA_BBOX
 
-    fig_map = px.scatter_mapbox(
-        gdf,
-        lat=gdf.geometry.y,
-        lon=gdf.geometry.x,
-        hover_name='hover_name',
-        zoom=6,
-        height=500,
-        title="Health Facilities in Zambia"
+    markers = facility_markers(store, zoom, bbox=bbox)
+    st.caption(
+        f"{len(markers):,} markers in view at zoom {int(zoom)} "
+        f"({len(store['points']):,} facilities in total). Facilities are grouped "
+        f"into clusters up to zoom {CLUSTER_MAX_ZOOM} and shown individually beyond it."
     )
-    fig_map.update_layout(
-        mapbox_style="open-street-map",
-        margin={"r":0, "t":40, "l":0, "b":0},
-        hoverlabel=dict(bgcolor="white", font_size=12)
+
+    # The base map never changes, so the component stays mounted and only the
+    # facility layer is replaced as the user pans and zooms.
+    south, west, north, east = ZAMBIA_BBOX
+    base_map = folium.Map(
+        location=((south + north) / 2, (west + east) / 2),
+        zoom_start=DEFAULT_ZOOM,
+        tiles="OpenStreetMap",
+    )
+    st_folium(
+        base_map,
+        key=MAP_KEY,
+        height=500,
+        use_container_width=True,
+        returned_objects=["bounds", "zoom"],
+        feature_group_to_add=facility_feature_group(markers),
     )
-    st.plotly_chart(fig_map, use_container_width=True)
 
 except Exception as e:
     st.warning(f"Could not load map data: {e}")
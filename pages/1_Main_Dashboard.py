@@ -1,16 +1,15 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
-from utils.data_loader import load_data
+from utils.data_loader import query_warehouse
+from utils.figures import plot_frame, plotly_chart
 
 st.set_page_config(page_title="Main Dashboard", layout="wide")
 st.title("📈 Main Health Dashboard")
 
-# Load health indicators CSV
-DATA_PATH = "data/worldbank_health_indicators.csv"
+INFANT_MORTALITY = "Mortality rate, infant, male (per 1,000 live births)"
 
 try:
-    df = load_data(DATA_PATH)
+    df = query_warehouse(dataset="worldbank", indicator=INFANT_MORTALITY, columns=["year", "value"])
 except Exception as e:
     st.error(f"Error loading data: {e}")
     st.stop()
@@ -18,16 +17,16 @@ except Exception as e:
 st.subheader("Overview of Key Health Indicators Over Time")
 
 # Example plot: Infant Mortality Rate over years
-if "Mortality rate, infant, male (per 1,000 live births)" in df.columns:
+if not df.empty:
     fig = px.line(
-        df,
-        x="Year",
-        y="Mortality rate, infant, male (per 1,000 live births)",
+        plot_frame(df, ["year", "value"]),
+        x="year",
+        y="value",
         title="Infant Mortality Rate (Male) Over Time",
-        labels={"Year": "Year", "Mortality rate, infant, male (per 1,000 live births)": "Infant Mortality Rate (per 1000 live births)"},
+        labels={"year": "Year", "value": "Infant Mortality Rate (per 1000 live births)"},
     )
-    st.plotly_chart(fig, use_container_width=True)
+    plotly_chart(fig, use_container_width=True)
 else:
-    st.warning("Infant mortality rate column not found in data.")
+    st.warning("Infant mortality rate not found in data.")
 
 # Add other key indicator plots similarly...
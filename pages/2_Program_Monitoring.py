@@ -1,15 +1,20 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
-from utils.data_loader import load_data
+from utils.data_loader import query_warehouse
+from utils.figures import plot_frame, plotly_chart
 
 st.set_page_config(page_title="Strategic Planning", layout="wide")
 st.title("📅 Strategic Planning Insights")
 
-DATA_PATH = "data/worldbank_health_indicators.csv"
+EXPENDITURE_INDICATOR = "Current health expenditure (% of GDP)"
+LIFE_EXPECTANCY_INDICATOR = "Life expectancy at birth, male (years)"
 
 try:
-    df = load_data(DATA_PATH)
+    df = query_warehouse(
+        dataset="worldbank",
+        indicator=[EXPENDITURE_INDICATOR, LIFE_EXPECTANCY_INDICATOR],
+        columns=["indicator", "year", "value"],
+    )
 except Exception as e:
     st.error(f"Error loading data: {e}")
     st.stop()
@@ -17,27 +22,29 @@ except Exception as e:
 st.subheader("Health Expenditure and Life Expectancy Trends")
 
 # Example: Current health expenditure (% of GDP) over years
-if "Current health expenditure (% of GDP)" in df.columns:
+expenditure = df[df["indicator"] == EXPENDITURE_INDICATOR]
+if not expenditure.empty:
     fig = px.area(
-        df,
-        x="Year",
-        y="Current health expenditure (% of GDP)",
+        plot_frame(expenditure, ["year", "value"]),
+        x="year",
+        y="value",
         title="Current Health Expenditure (% of GDP) Over Time",
-        labels={"Year": "Year", "Current health expenditure (% of GDP)": "Health Expenditure (% GDP)"},
+        labels={"year": "Year", "value": "Health Expenditure (% GDP)"},
     )
-    st.plotly_chart(fig, use_container_width=True)
+    plotly_chart(fig, use_container_width=True)
 else:
-    st.warning("Health expenditure column not found in data.")
+    st.warning("Health expenditure not found in data.")
 
 # Example: Life expectancy at birth (male)
-if "Life expectancy at birth, male (years)" in df.columns:
+life_expectancy = df[df["indicator"] == LIFE_EXPECTANCY_INDICATOR]
+if not life_expectancy.empty:
     fig2 = px.line(
-        df,
-        x="Year",
-        y="Life expectancy at birth, male (years)",
+        plot_frame(life_expectancy, ["year", "value"]),
+        x="year",
+        y="value",
         title="Life Expectancy at Birth (Male) Over Time",
-        labels={"Year": "Year", "Life expectancy at birth, male (years)": "Life Expectancy (Years)"},
+        labels={"year": "Year", "value": "Life Expectancy (Years)"},
     )
-    st.plotly_chart(fig2, use_container_width=True)
+    plotly_chart(fig2, use_container_width=True)
 else:
-    st.warning("Life expectancy column not found in data.")
+    st.warning("Life expectancy not found in data.")
@@ -1,75 +1,78 @@
 # policy_simulation.py
 
+import time
+
 import streamlit as st
 import numpy as np
 import pandas as pd
-import plotly.express as px
-from utils.data_loader import load_data
+import plotly.graph_objects as go
+from utils.data_loader import latest_observation
+from utils.figures import plotly_chart
+from utils.policy_model import (
+    LEVER_LABELS,
+    LEVERS,
+    lever_grids,
+    policy_sweep,
+    project_trajectory,
+    simulate_policy_impact,
+    tornado_swings,
+)
+from utils.policy_optimizer import COST_SCALES, FUNDED_LEVERS, efficiency_curve, pareto_front
+from utils.policy_monte_carlo import (
+    BASE_LIFE_EXP_SD,
+    BASE_U5_REL_SD,
+    MC_DRAWS,
+    MC_SEED,
+    WEIGHT_SIGMA,
+    simulate_draws,
+    trajectory_bands,
+)
+
+# Line colours (RGB) of the projection chart
+PROJECTION_COLORS = {
+    "Life Expectancy": "31, 119, 180",
+    "Under-5 Mortality Rate": "214, 39, 40",
+}
+
+# NHSP 2022-2026 under-5 mortality target (per 1,000 live births)
+U5_TARGET = 25
+
+# World Bank series behind the baseline, in order of preference (the extract
+# has no total life expectancy, so the male series stands in)
+BASELINE_LIFE_EXP_SERIES = (
+    "Life expectancy at birth, total (years)",
+    "Life expectancy at birth, male (years)",
+)
+BASELINE_U5_SERIES = ("Mortality rate, under-5 (per 1,000 live births)",)
+
+# Used when a baseline series has no observation
+DEFAULT_BASELINE = {"life_exp": 64, "u5_mortality": 61, "year": 2020}
+
+def _baseline_observation(candidates):
+    for series in candidates:
+        obs = latest_observation("worldbank", series)
+        if obs is not None:
+            return series, obs
+    return None, None
 
-@st.cache_data
 def load_baseline_health_data():
     """
-    Load baseline health indicators from World Bank dataset or similar.
-    Returns latest year, life expectancy, under-5 mortality rate.
-    """
-    df = load_data("data/worldbank_health_indicators.csv")
-    if df.empty:
-        st.warning("Baseline health data not available.")
-        return 64, 61, 2020  # fallback default baseline values
-    
-    latest_year = df['Year'].max()
-    
-    # Ensure latest_year is an int, not Timestamp
-    if hasattr(latest_year, "year"):
-        latest_year = latest_year.year
-    
-    # Use columns likely available in your dataset; adjust if needed
-    le_col = 'Life expectancy at birth, total (years)'
-    u5mr_col = 'Mortality rate, under-5 (per 1000 live births)'
-    
-    if le_col in df.columns and u5mr_col in df.columns:
-        life_expectancy = df.loc[df['Year'] == pd.to_datetime(str(latest_year)), le_col].values[0]
-        u5_mortality = df.loc[df['Year'] == pd.to_datetime(str(latest_year)), u5mr_col].values[0]
-        return life_expectancy, u5_mortality, latest_year
-    
-    # Defaults if columns missing
-    return 64, 61, latest_year
-
-def simulate_policy_impact(
-    budget_million,
-    hospital_pct,
-    staff_increase_pct,
-    vacc_coverage_pct,
-    hiv_art_pct,
-    malaria_coverage_pct,
-    tb_treatment_pct,
-    base_life_exp,
-    base_u5_mortality,
-):
+    Baseline health indicators: the latest observations in the snapshot of the
+    World Bank dataset (see ``load_snapshot``).
+    Returns latest life expectancy, under-5 mortality rate and the most recent of their years.
     """
-    Simple weighted model to simulate policy impact on life expectancy and under-5 mortality.
-    """
-    life_exp_gain = (
-        (budget_million / 5000) * 2 +
-        (staff_increase_pct / 50) * 1.5 +
-        ((vacc_coverage_pct - 80) / 20) * 1 +
-        (hiv_art_pct - 70) * 0.05 +
-        (malaria_coverage_pct - 70) * 0.05 +
-        (tb_treatment_pct - 80) * 0.05
-    )
-    mortality_drop = (
-        (budget_million / 5000) * 1 +
-        (staff_increase_pct / 50) * 1.2 +
-        ((vacc_coverage_pct - 80) / 20) * 0.8 +
-        (hiv_art_pct - 70) * 0.04 +
-        (malaria_coverage_pct - 70) * 0.04 +
-        (tb_treatment_pct - 80) * 0.04
-    )
+    le_series, le = _baseline_observation(BASELINE_LIFE_EXP_SERIES)
+    u5_series, u5 = _baseline_observation(BASELINE_U5_SERIES)
+    if le is None or u5 is None:
+        st.warning("Baseline health data not available; using default values where missing.")
 
-    projected_life_exp = base_life_exp + life_exp_gain
-    projected_u5_mortality = max(0, base_u5_mortality - mortality_drop)
-
-    return projected_life_exp, projected_u5_mortality, life_exp_gain, mortality_drop
+    life_expectancy = le["value"] if le is not None else DEFAULT_BASELINE["life_exp"]
+    u5_mortality = u5["value"] if u5 is not None else DEFAULT_BASELINE["u5_mortality"]
+    years = [obs["year"] for obs in (le, u5) if obs is not None]
+    sources = [series for series in (le_series, u5_series) if series]
+    if sources:
+        st.caption("World Bank series: " + "; ".join(sources))
+    return life_expectancy, u5_mortality, int(max(years)) if years else DEFAULT_BASELINE["year"]
 
 def run_simulation():
     st.header("🛠️ Health Policy Simulation for Zambia")
@@ -108,9 +111,8 @@ def run_simulation():
 
     # Time projections over next 10 years
     years = np.arange(base_year, base_year + 11)
-    life_exp_proj = base_life_exp + np.cumsum(np.repeat(gain_life_exp / 10, 11))
-    u5_mort_proj = base_u5_mortality - np.cumsum(np.repeat(drop_mort / 10, 11))
-    u5_mort_proj = np.clip(u5_mort_proj, 0, None)
+    life_exp_proj = project_trajectory(base_life_exp, gain_life_exp)
+    u5_mort_proj = np.clip(project_trajectory(base_u5_mortality, -drop_mort), 0, None)
 
     df_proj = pd.DataFrame({
         "Year": years,
@@ -118,14 +120,55 @@ def run_simulation():
         "Under-5 Mortality Rate": u5_mort_proj,
     })
 
-    fig = px.line(
-        df_proj,
-        x="Year",
-        y=["Life Expectancy", "Under-5 Mortality Rate"],
+    scenario = {
+        "budget_million": budget,
+        "staff_increase_pct": staff_increase,
+        "vacc_coverage_pct": vaccination_coverage,
+        "hiv_art_pct": hiv_art_coverage,
+        "malaria_coverage_pct": malaria_coverage,
+        "tb_treatment_pct": tb_treatment_success,
+    }
+
+    with st.expander("Uncertainty (Monte Carlo)"):
+        show_bands = st.checkbox("Show uncertainty bands", value=True)
+        draws = st.select_slider("Draws", options=[10_000, 50_000, 100_000, 250_000], value=MC_DRAWS)
+        seed = int(st.number_input("Random seed", value=MC_SEED, step=1))
+        st.caption(
+            f"Each draw scales every effect weight by a log-normal factor (sigma {WEIGHT_SIGMA}) and "
+            f"perturbs the baseline (life expectancy ±{BASE_LIFE_EXP_SD:g} years, under-5 mortality "
+            f"±{BASE_U5_REL_SD:.0%}, 1 SD). Bands show the 5–95th and 25–75th percentiles."
+        )
+
+    if show_bands:
+        all_bands = cached_bands(
+            tuple(scenario.items()), float(base_life_exp), float(base_u5_mortality), int(base_year), draws, seed
+        )
+
+    fig = go.Figure()
+    for indicator, color in PROJECTION_COLORS.items():
+        if show_bands:
+            bands = all_bands[all_bands["Indicator"] == indicator]
+            for low, high, opacity in (("p5", "p95", 0.15), ("p25", "p75", 0.3)):
+                fig.add_trace(go.Scatter(
+                    x=bands["Year"], y=bands[high], mode="lines", line=dict(width=0),
+                    showlegend=False, hoverinfo="skip",
+                ))
+                fig.add_trace(go.Scatter(
+                    x=bands["Year"], y=bands[low], mode="lines", line=dict(width=0),
+                    fill="tonexty", fillcolor=f"rgba({color}, {opacity})",
+                    name=f"{indicator} ({low}–{high})", hoverinfo="skip",
+                ))
+        fig.add_trace(go.Scatter(
+            x=df_proj["Year"], y=df_proj[indicator], mode="lines",
+            line=dict(color=f"rgb({color})"), name=indicator,
+        ))
+    fig.update_layout(
         title="📈 Projected Policy Impact Over Time",
-        labels={"value": "Metric", "variable": "Indicator"},
+        xaxis_title="Year",
+        yaxis_title="Metric",
+        legend_title_text="Indicator",
     )
-    st.plotly_chart(fig, use_container_width=True)
+    plotly_chart(fig, use_container_width=True)
 
     # Summary text
     st.subheader("Summary & Insights")
@@ -144,5 +187,183 @@ def run_simulation():
         """
     )
 
+    run_sweep(scenario, base_life_exp, base_u5_mortality)
+    run_optimizer(scenario, base_life_exp, base_u5_mortality)
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner="Simulating uncertainty...")
+def cached_bands(scenario, base_life_exp, base_u5_mortality, base_year, draws, seed):
+    # Keyed on the scenario, so moving a slider back re-uses earlier draws.
+    # Drawn in the server process: forking a pool from its threads is unsafe
+    # and costs more than the draws.
+    result = simulate_draws(dict(scenario), base_life_exp, base_u5_mortality, draws=draws, seed=seed)
+    return trajectory_bands(result, base_year)
+
+@st.cache_data(ttl=3600, show_spinner="Evaluating scenarios...")
+def cached_sweep(points, base_life_exp, base_u5_mortality, pair):
+    start = time.perf_counter()
+    result = policy_sweep(lever_grids(points), base_life_exp, base_u5_mortality, pair, u5_target=U5_TARGET)
+    return result, time.perf_counter() - start
+
+def run_sweep(scenario, base_life_exp, base_u5_mortality):
+    """
+    Evaluate every combination of lever levels at once and show the response
+    surface (sensitivity heatmap) and one-at-a-time swings (tornado chart).
+    """
+    st.subheader("🔬 Policy Sweep: the Whole Response Surface")
+    st.markdown("""
+    Instead of probing one slider combination at a time, the sweep evaluates every combination
+    of lever levels across the slider ranges in a single vectorized pass.
+    """)
+
+    col1, col2, col3, col4 = st.columns(4)
+    points = col1.select_slider("Levels per lever", options=[5, 10, 15, 20], value=10)
+    x_lever = col2.selectbox("Heatmap x-axis", LEVERS, index=0, format_func=LEVER_LABELS.get)
+    y_lever = col3.selectbox(
+        "Heatmap y-axis", [lever for lever in LEVERS if lever != x_lever], index=0, format_func=LEVER_LABELS.get
+    )
+    outcome = col4.radio("Outcome", ["Life Expectancy", "Under-5 Mortality Rate"])
+    key = "life_exp" if outcome == "Life Expectancy" else "u5_mortality"
+
+    sweep, seconds = cached_sweep(points, float(base_life_exp), float(base_u5_mortality), (y_lever, x_lever))
+    stats = sweep[key]
+
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Scenarios evaluated", f"{sweep['scenarios']:,}", f"{seconds * 1000:.0f} ms", delta_color="off")
+    m2.metric(f"{outcome} range", f"{stats['min']:.1f} – {stats['max']:.1f}")
+    m3.metric(f"Scenarios with U5MR ≤ {U5_TARGET}", f"{sweep['u5_target_share']:.1%}")
+
+    grids = lever_grids(points)
+    fig_heat = go.Figure(go.Heatmap(
+        x=grids[x_lever],
+        y=grids[y_lever],
+        z=stats["heatmap"],
+        colorscale="RdYlGn" if key == "life_exp" else "RdYlGn_r",
+        colorbar=dict(title=outcome),
+        hovertemplate="%{x}, %{y}: %{z:.2f}<extra></extra>",
+    ))
+    fig_heat.update_layout(
+        title=f"{outcome}: mean over all other lever combinations",
+        xaxis_title=LEVER_LABELS[x_lever],
+        yaxis_title=LEVER_LABELS[y_lever],
+    )
+    plotly_chart(fig_heat, use_container_width=True)
+
+    # Tornado: each lever swept across its range with the others at the sliders
+    swings = tornado_swings(scenario, base_life_exp, base_u5_mortality)
+    current = simulate_policy_impact(hospital_pct=None, base_life_exp=base_life_exp, base_u5_mortality=base_u5_mortality, **scenario)
+    current = float(current[0] if key == "life_exp" else current[1])
+    order = sorted(LEVERS, key=lambda lever: abs(swings[lever][key][1] - swings[lever][key][0]))
+    low = np.array([min(swings[lever][key]) for lever in order])
+    high = np.array([max(swings[lever][key]) for lever in order])
+
+    fig_tornado = go.Figure(go.Bar(
+        y=[LEVER_LABELS[lever] for lever in order],
+        x=high - low,
+        base=low,
+        orientation="h",
+        marker_color="#1f77b4",
+        hovertemplate="%{base:.2f} – %{x:.2f} span<extra></extra>",
+    ))
+    fig_tornado.add_vline(x=current, line_dash="dash", annotation_text="Current scenario")
+    fig_tornado.update_layout(
+        title=f"Sensitivity of {outcome} to Each Lever (others held at the sliders)",
+        xaxis_title=outcome,
+        showlegend=False,
+    )
+    plotly_chart(fig_tornado, use_container_width=True)
+
+    best = stats["best"]
+    st.markdown(
+        f"**Best scenario on the grid** ({outcome.lower()} of "
+        f"{stats['max'] if key == 'life_exp' else stats['min']:.1f}): "
+        + ", ".join(f"{LEVER_LABELS[lever]} {best[lever]:,.0f}" for lever in LEVERS)
+    )
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner="Optimizing allocations...")
+def cached_allocations(scenario, base_life_exp, base_u5_mortality, envelope, cost_scales, weight_life_exp):
+    # Keyed on the full constraint set: scenario, baseline, envelope and cost curves
+    scenario, cost_scales = dict(scenario), dict(cost_scales)
+    front = pareto_front(scenario, base_life_exp, base_u5_mortality, envelope, cost_scales)
+    curve = efficiency_curve(
+        scenario, base_life_exp, base_u5_mortality, envelope, weight_life_exp=weight_life_exp, cost_scales=cost_scales
+    )
+    return front, curve
+
+def run_optimizer(scenario, base_life_exp, base_u5_mortality):
+    """
+    Split an additional investment across the programme levers to maximize
+    life expectancy or minimize under-5 mortality.
+    """
+    st.subheader("🎯 Budget Allocation Optimizer")
+    st.markdown("""
+    Rather than hand-tuning the sliders, let the optimizer split an additional investment across
+    the programme levers. Each lever improves from its current slider value toward the top of its
+    range with diminishing returns.
+    """)
+
+    col1, col2 = st.columns(2)
+    envelope = col1.slider("Investment to allocate (Million ZMW)", 100, 5000, 1000, step=100)
+    objective = col2.radio("Objective", ["Maximize life expectancy", "Minimize under-5 mortality"])
+    weight_life_exp = 1.0 if objective == "Maximize life expectancy" else 0.0
+
+    with st.expander("Cost curves"):
+        st.caption("Spend (Million ZMW) that closes about 63% of the gap between a lever's current value and the top of its range.")
+        cost_cols = st.columns(len(FUNDED_LEVERS))
+        cost_scales = {
+            lever: float(col.number_input(LEVER_LABELS[lever], min_value=10.0, value=COST_SCALES[lever], step=50.0))
+            for col, lever in zip(cost_cols, FUNDED_LEVERS)
+        }
+
+    front, curve = cached_allocations(
+        tuple(scenario.items()), float(base_life_exp), float(base_u5_mortality),
+        float(envelope), tuple(cost_scales.items()), weight_life_exp,
+    )
+    best = curve.iloc[-1]
+
+    m1, m2 = st.columns(2)
+    m1.metric("Life expectancy with optimal allocation", f"{best['life_exp']:.1f} years")
+    m2.metric("Under-5 mortality with optimal allocation", f"{best['u5_mortality']:.2f} per 1000")
+
+    fig_alloc = go.Figure(go.Bar(
+        x=[best[lever] for lever in FUNDED_LEVERS],
+        y=[LEVER_LABELS[lever] for lever in FUNDED_LEVERS],
+        orientation="h",
+        marker_color="#1f77b4",
+        hovertemplate="%{y}: %{x:,.0f} M ZMW<extra></extra>",
+    ))
+    fig_alloc.update_layout(title=f"Optimal Allocation of {envelope:,} Million ZMW", xaxis_title="Million ZMW")
+    plotly_chart(fig_alloc, use_container_width=True)
+
+    outcome_col, outcome_label = (
+        ("life_exp", "Life Expectancy") if weight_life_exp else ("u5_mortality", "Under-5 Mortality Rate")
+    )
+    fig_curve = go.Figure(go.Scatter(
+        x=curve["envelope"], y=curve[outcome_col], mode="lines+markers", line=dict(color="#1f77b4"),
+    ))
+    fig_curve.update_layout(
+        title=f"{outcome_label} vs. Investment (optimal allocation at each level)",
+        xaxis_title="Investment (Million ZMW)",
+        yaxis_title=outcome_label,
+    )
+    plotly_chart(fig_curve, use_container_width=True)
+
+    if len(front) > 1:
+        fig_front = go.Figure(go.Scatter(
+            x=front["u5_mortality"], y=front["life_exp"], mode="lines+markers",
+            customdata=front["weight_life_exp"],
+            hovertemplate="U5MR %{x:.2f}, LE %{y:.2f}<br>weight on LE %{customdata:.2f}<extra></extra>",
+        ))
+        fig_front.update_layout(
+            title="Pareto Front: Life Expectancy vs. Under-5 Mortality",
+            xaxis_title="Under-5 Mortality Rate",
+            yaxis_title="Life Expectancy",
+        )
+        plotly_chart(fig_front, use_container_width=True)
+    else:
+        st.info(
+            "Under the current model weights both outcomes rank the levers identically, so one allocation "
+            "is optimal for both objectives (the Pareto front is a single point)."
+        )
+
 if __name__ == "__main__":
     run_simulation()
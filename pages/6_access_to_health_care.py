@@ -1,6 +1,8 @@
+import numpy as np
 import streamlit as st
 import plotly.express as px
-from utils.data_loader import load_healthcare_access
+from utils.data_loader import load_access_grid, load_facility_store, load_healthcare_access
+from utils.figures import plotly_chart
 
 st.title("🏥 Access to Health Care Analysis")
 
@@ -26,7 +28,7 @@ fig_indicators = px.bar(
     title="Distribution of Health Care Indicators (Zambia)",
     labels={"Count": "Number of Records"},
 )
-st.plotly_chart(fig_indicators, use_container_width=True)
+plotly_chart(fig_indicators, use_container_width=True)
 
 # Trend over time for selected indicator
 st.subheader("Indicator Trend Over Time")
@@ -42,4 +44,60 @@ fig_trend = px.line(
     title=f"{selected_indicator} Over Time",
     markers=True
 )
-st.plotly_chart(fig_trend, use_container_width=True)
+plotly_chart(fig_trend, use_container_width=True)
+
+# Physical access: distance from every part of the country to a facility
+st.subheader("Distance to the Nearest Facility")
+st.caption(
+    "Great-circle distance from a regular grid over Zambia (trimmed to the area "
+    "spanned by the mapped facilities) to the closest facility in "
+    "data/zambia_health_facilities.geojson."
+)
+
+store = load_facility_store()
+points = store["points"]
+
+col1, col2, col3 = st.columns(3)
+amenities = col1.multiselect(
+    "Facility type", sorted(points["amenity"].dropna().unique()), default=["clinic", "hospital"]
+)
+operators = col2.multiselect(
+    "Operator", sorted(points["operator_type"].dropna().unique()),
+    help="Only a minority of facilities record an operator; leave empty to include all.",
+)
+spacing_km = col3.select_slider("Grid spacing (km)", options=[2, 5, 10, 20], value=5)
+
+distance, catchments = load_access_grid(amenities, operators, spacing_km)
+
+if len(catchments) == 0:
+    st.info("No facilities match the selected filters.")
+else:
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Median distance", f"{np.median(distance):.1f} km")
+    m2.metric("Within 5 km", f"{(distance <= 5).mean():.0%}")
+    m3.metric("Beyond 20 km", f"{(distance > 20).mean():.0%}")
+
+    # Binned here so the figure carries 50 bars instead of every grid cell
+    counts, edges = np.histogram(np.minimum(distance, 100), bins=50, range=(0, 100))
+    fig_distance = px.bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        title="Distance to the Nearest Selected Facility (grid cells, capped at 100 km)",
+        labels={"x": "Distance (km)", "y": "Grid cells"},
+    )
+    fig_distance.update_traces(width=edges[1] - edges[0])
+    plotly_chart(fig_distance, use_container_width=True)
+
+    st.markdown(f"**Largest catchments** ({spacing_km} km grid cells for which the facility is the nearest one)")
+    st.dataframe(
+        catchments[["name", "amenity", "operator_type", "catchment", "mean_distance_km"]]
+        .head(15)
+        .rename(columns={
+            "name": "Facility",
+            "amenity": "Type",
+            "operator_type": "Operator",
+            "catchment": "Grid cells",
+            "mean_distance_km": "Mean distance (km)",
+        }),
+        hide_index=True,
+    )
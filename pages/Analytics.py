@@ -1,65 +1,53 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
-from utils.data_loader import load_data, load_dhs_data, load_malaria, load_hiv_prevalence, load_tuberculosis
+from utils.data_loader import query_warehouse
+from utils.figures import plot_frame, plotly_chart
 
 st.set_page_config(page_title="Analytics - Zambia Health", layout="wide")
 st.title("📅 Zambia Health Strategic Analytics")
 
-# Load datasets
-DATA_PATH_WB = "data/worldbank_health_indicators.csv"
+# Every section reads the long indicator warehouse (utils/warehouse.py):
+# integer years and numeric values, whatever the source layout
+EXPENDITURE_INDICATOR = "Current health expenditure (% of GDP)"
+
 try:
-    df_wb = load_data(DATA_PATH_WB)
+    df_wb = query_warehouse(dataset="worldbank", columns=["indicator", "year", "value"])
 except Exception as e:
     st.error(f"Error loading World Bank data: {e}")
     st.stop()
 
-df_dhs = load_dhs_data()
-df_malaria = load_malaria()
-df_hiv = load_hiv_prevalence()
-df_tb = load_tuberculosis()
-
-# Filter World Bank data for Zambia only
-if "Country Name" in df_wb.columns:
-    df_wb = df_wb[df_wb["Country Name"].str.lower() == "zambia"]
-
-# Parse Year columns consistently
-def parse_year_col(df, col="Year"):
-    if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
-        df[col] = pd.to_datetime(df[col], format="%Y", errors="coerce")
-    return df
-
-df_wb = parse_year_col(df_wb)
-df_dhs = parse_year_col(df_dhs, col="SurveyYear")
-df_malaria = parse_year_col(df_malaria, col="YEAR (DISPLAY)")
-df_hiv = parse_year_col(df_hiv, col="SurveyYear")
-df_tb = parse_year_col(df_tb, col="Year")
+df_dhs = query_warehouse(dataset="dhs-mobile", columns=["indicator", "breakdown", "year", "value"])
+df_malaria = query_warehouse(dataset="malaria", columns=["indicator", "breakdown", "year", "value"])
+df_hiv = query_warehouse(dataset="hiv-prevalence", columns=["indicator", "breakdown", "year", "value"])
+df_tb = query_warehouse(dataset="tuberculosis", columns=["indicator", "breakdown", "year", "value"])
 
 # Section 1: Health Expenditure & Life Expectancy from World Bank
 st.subheader("Health Expenditure & Life Expectancy Trends (World Bank Data)")
 
-if "Current health expenditure (% of GDP)" in df_wb.columns:
+df_exp = df_wb[df_wb["indicator"] == EXPENDITURE_INDICATOR]
+if not df_exp.empty:
     fig_exp = px.area(
-        df_wb,
-        x="Year",
-        y="Current health expenditure (% of GDP)",
+        plot_frame(df_exp, ["year", "value"]),
+        x="year",
+        y="value",
         title="Health Expenditure (% of GDP) Over Time",
-        labels={"Year": "Year", "Current health expenditure (% of GDP)": "Health Expenditure (% GDP)"},
+        labels={"year": "Year", "value": "Health Expenditure (% GDP)"},
     )
-    st.plotly_chart(fig_exp, use_container_width=True)
+    plotly_chart(fig_exp, use_container_width=True)
 else:
     st.warning("Health expenditure data not available.")
 
-life_cols = [c for c in df_wb.columns if "Life expectancy at birth" in c]
-if life_cols:
+df_life = df_wb[df_wb["indicator"].str.contains("Life expectancy at birth", regex=False)]
+if not df_life.empty:
     fig_life = px.line(
-        df_wb,
-        x="Year",
-        y=life_cols,
+        plot_frame(df_life, ["year", "value", "indicator"]),
+        x="year",
+        y="value",
+        color="indicator",
         title="Life Expectancy at Birth Over Time",
-        labels={"value": "Years", "variable": "Indicator"},
+        labels={"year": "Year", "value": "Years", "indicator": "Indicator"},
     )
-    st.plotly_chart(fig_life, use_container_width=True)
+    plotly_chart(fig_life, use_container_width=True)
 else:
     st.warning("Life expectancy data not available.")
 
@@ -67,20 +55,20 @@ else:
 st.subheader("DHS Key Health Indicators")
 
 if not df_dhs.empty:
-    indicators = df_dhs["Indicator"].unique()
+    indicators = df_dhs["indicator"].unique()
     selected_indicator = st.selectbox("Select DHS Indicator", indicators)
 
-    dhs_filtered = df_dhs[df_dhs["Indicator"] == selected_indicator]
-    if "SurveyYear" in dhs_filtered.columns and "Value" in dhs_filtered.columns:
-        fig_dhs = px.line(
-            dhs_filtered,
-            x="SurveyYear",
-            y="Value",
-            title=f"{selected_indicator} Trend in Zambia (DHS)",
-            labels={"SurveyYear": "Year", "Value": "Value (%)"},
-            markers=True,
-        )
-        st.plotly_chart(fig_dhs, use_container_width=True)
+    dhs_filtered = df_dhs[df_dhs["indicator"] == selected_indicator]
+    fig_dhs = px.line(
+        plot_frame(dhs_filtered, ["year", "value", "breakdown"]),
+        x="year",
+        y="value",
+        color="breakdown",
+        title=f"{selected_indicator} Trend in Zambia (DHS)",
+        labels={"year": "Year", "value": "Value (%)", "breakdown": "Breakdown"},
+        markers=True,
+    )
+    plotly_chart(fig_dhs, use_container_width=True)
 else:
     st.info("DHS data not available.")
 
@@ -88,51 +76,51 @@ else:
 st.subheader("Communicable Diseases Trends")
 
 # Malaria cases and mortality
-if not df_malaria.empty and "Numeric" in df_malaria.columns:
-    df_malaria_zmb = df_malaria[df_malaria["COUNTRY (DISPLAY)"].str.lower() == "zambia"]
-    if not df_malaria_zmb.empty:
-        fig_malaria = px.line(
-            df_malaria_zmb,
-            x="YEAR (DISPLAY)",
-            y="Numeric",
-            color="GHO (DISPLAY)",
-            title="Malaria Indicators in Zambia",
-            labels={"YEAR (DISPLAY)": "Year", "Numeric": "Value"},
-            markers=True,
-        )
-        st.plotly_chart(fig_malaria, use_container_width=True)
+if not df_malaria.empty:
+    fig_malaria = px.line(
+        plot_frame(df_malaria, ["year", "value", "indicator"]),
+        x="year",
+        y="value",
+        color="indicator",
+        title="Malaria Indicators in Zambia",
+        labels={"year": "Year", "value": "Value", "indicator": "Indicator"},
+        markers=True,
+    )
+    plotly_chart(fig_malaria, use_container_width=True)
 
 # HIV prevalence (from DHS or hiv data)
-if not df_hiv.empty and "Value" in df_hiv.columns:
-    hiv_indicators = df_hiv["Indicator"].unique()
+if not df_hiv.empty:
+    hiv_indicators = df_hiv["indicator"].unique()
     selected_hiv = st.selectbox("Select HIV Indicator", hiv_indicators)
-    hiv_filtered = df_hiv[df_hiv["Indicator"] == selected_hiv]
+    hiv_filtered = df_hiv[df_hiv["indicator"] == selected_hiv]
     if not hiv_filtered.empty:
         fig_hiv = px.line(
-            hiv_filtered,
-            x="SurveyYear",
-            y="Value",
+            plot_frame(hiv_filtered, ["year", "value", "breakdown"]),
+            x="year",
+            y="value",
+            color="breakdown",
             title=f"HIV Indicator: {selected_hiv}",
-            labels={"SurveyYear": "Year", "Value": "Value (%)"},
+            labels={"year": "Year", "value": "Value (%)", "breakdown": "Breakdown"},
             markers=True,
         )
-        st.plotly_chart(fig_hiv, use_container_width=True)
+        plotly_chart(fig_hiv, use_container_width=True)
 
 # Tuberculosis incidence
-if not df_tb.empty and "Value" in df_tb.columns:
-    tb_indicators = df_tb["GHO (DISPLAY)"].unique()
+if not df_tb.empty:
+    tb_indicators = df_tb["indicator"].unique()
     selected_tb = st.selectbox("Select Tuberculosis Indicator", tb_indicators)
-    tb_filtered = df_tb[df_tb["GHO (DISPLAY)"] == selected_tb]
+    tb_filtered = df_tb[df_tb["indicator"] == selected_tb]
     if not tb_filtered.empty:
         fig_tb = px.line(
-            tb_filtered,
-            x="YEAR (DISPLAY)",
-            y="Value",
+            plot_frame(tb_filtered, ["year", "value", "breakdown"]),
+            x="year",
+            y="value",
+            color="breakdown",
             title=f"Tuberculosis Indicator: {selected_tb}",
-            labels={"Year": "Year", "Value": "Value per 100,000"},
+            labels={"year": "Year", "value": "Value", "breakdown": "Breakdown"},
             markers=True,
         )
-        st.plotly_chart(fig_tb, use_container_width=True)
+        plotly_chart(fig_tb, use_container_width=True)
 
 # Strategic Context Summary
 st.markdown("""
@@ -3,7 +3,9 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from utils.data_loader import load_acute
+from utils.cube import cube_frame, cube_indicators, describe_by_year
+from utils.data_loader import load_acute, load_cube
+from utils.figures import plot_frame, plotly_chart
 
 st.set_page_config(page_title="Acute Respiratory Infection Analysis", layout="wide")
 
@@ -13,49 +15,43 @@ This page presents analysis of DHS data on children with symptoms of ARI (Acute
 Filter by year and explore trends and summary statistics.
 """)
 
-# Load data
-df = load_acute()
-
-# Filter for Zambia only if column exists
-if "CountryName" in df.columns: # type: ignore
-    df = df[df["CountryName"] == "Zambia"] # type: ignore
+# Load data: dense cube of the Zambia rows, with precomputed summaries
+cube = load_cube("acute", filters={"CountryName": "Zambia"})
 
 # Check if data available after filtering
-if df.empty: # type: ignore
+if not len(cube["indicators"]):
     st.warning("No data available for Zambia.")
     st.stop()
 
 # Show raw data option
 if st.checkbox("Show Raw Data"):
-    st.dataframe(df)
+    st.dataframe(load_acute())
 
 # Select years available
-years = sorted(df["SurveyYear"].dropna().unique()) # type: ignore
+years = list(cube["years"])
 selected_years = st.multiselect("Select Survey Year(s)", years, default=years)
 
 if not selected_years:
     st.warning("Please select at least one survey year.")
     st.stop()
 
-df_filtered = df[df["SurveyYear"].isin(selected_years)] # type: ignore
-
 # Summary statistics
 st.subheader(f"📊 Summary Statistics for Selected Years")
-st.write(df_filtered.groupby("SurveyYear")["Value"].describe())
+st.write(describe_by_year(cube, years=selected_years))
 
 # Indicator list for filtering
-indicators = df_filtered["Indicator"].unique()
+indicators = cube_indicators(cube, selected_years)
 selected_indicator = st.selectbox("Select Indicator", indicators)
 
-df_indicator = df_filtered[df_filtered["Indicator"] == selected_indicator]
+df_indicator = cube_frame(cube, selected_indicator, selected_years)
 
 # Plot time series for the indicator
 fig = px.line(
-    df_indicator,
+    plot_frame(df_indicator, ["SurveyYear", "Value"]),
     x="SurveyYear",
     y="Value",
     markers=True,
     title=f"Trend of '{selected_indicator}' in Zambia",
     labels={"SurveyYear": "Year", "Value": "Value (%)"}
 )
-st.plotly_chart(fig, use_container_width=True)
+plotly_chart(fig, use_container_width=True)
@@ -3,7 +3,11 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from utils.data_loader import load_dhs_data
+from utils.boundaries import area_key
+from utils.cube import cube_frame, describe_by_year
+from utils.data_loader import drill_down, load_boundaries, load_cube, load_dhs_data, load_regions, load_trend_projections
+from utils.figures import plot_frame, plotly_chart
+from utils.regions import level_name
 
 st.set_page_config(page_title="DHS Data Analysis", layout="wide")
 
@@ -17,32 +21,28 @@ st.markdown(
 
 
 
-df = load_dhs_data()
+cube = load_cube("dhs-mobile")
 
-if not df.empty:
+if len(cube["indicators"]):
     # Show raw data toggle
     if st.checkbox("Show raw DHS data"):
-        st.dataframe(df)
+        st.dataframe(load_dhs_data())
 
     # --- Filters ---
-    indicators = df["Indicator"].dropna().unique()
-    selected_indicator = st.selectbox("Select Indicator", sorted(indicators))
+    selected_indicator = st.selectbox("Select Indicator", cube["indicators"])
 
-    years = df["SurveyYear"].dropna().unique()
-    selected_years = st.multiselect("Select Years", sorted(years), default=sorted(years))
+    years = list(cube["years"])
+    selected_years = st.multiselect("Select Years", years, default=years)
 
-    # Filtered Data
-    filtered_df = df[
-        (df["Indicator"] == selected_indicator) &
-        (df["SurveyYear"].isin(selected_years))
-    ]
+    # Filtered Data: a slice of the precomputed cube
+    filtered_df = cube_frame(cube, selected_indicator, selected_years)
 
     # --- Visualizations ---
     if not filtered_df.empty:
         st.subheader(f"Trend for: {selected_indicator}")
 
         fig = px.line(
-            filtered_df,
+            plot_frame(filtered_df, ["SurveyYear", "Value", "CharacteristicLabel"]),
             x="SurveyYear",
             y="Value",
             color="CharacteristicLabel",
@@ -50,10 +50,72 @@ if not df.empty:
             title=f"{selected_indicator} by Year",
             labels={"Value": "Percentage", "SurveyYear": "Year"}
         )
-        st.plotly_chart(fig, use_container_width=True)
+
+        if st.checkbox("Show linear trend projection", help="Fitted on every survey round; 95% prediction interval on hover."):
+            projections = load_trend_projections(["dhs-mobile"])
+            projections = projections[
+                (projections["indicator"] == selected_indicator)
+                & projections["breakdown"].isin(filtered_df["CharacteristicLabel"].astype(str).unique())
+            ]
+            colors = {trace.name: trace.line.color for trace in fig.data}
+            for (_, group), rows in projections.groupby(["indicator_id", "breakdown"], sort=False, observed=True):
+                fig.add_scatter(
+                    x=rows["Year"],
+                    y=rows["Projection"],
+                    customdata=rows[["Lower", "Upper"]].to_numpy(),
+                    mode="lines",
+                    name=f"{group} (trend)",
+                    legendgroup=group,
+                    line=dict(dash="dash", color=colors.get(group)),
+                    hovertemplate="%{x}: %{y:.1f} (%{customdata[0]:.1f} to %{customdata[1]:.1f})",
+                )
+
+        plotly_chart(fig, use_container_width=True)
 
         # Summary stats
         st.subheader("Summary Statistics")
-        st.write(filtered_df.groupby("SurveyYear")["Value"].describe())
+        st.write(describe_by_year(cube, selected_indicator, selected_years))
+
+        # --- Regional drill-down (subnational exports only) ---
+        regions = load_regions("dhs-mobile")
+        if (regions["Level"] > 0).any():
+            st.subheader("Regional Drill-down")
+            provinces = sorted(regions.loc[regions["Level"] == 1, "Province"])
+            area = st.selectbox("Area", ["National", *provinces])
+            step = drill_down("dhs-mobile", selected_indicator, None if area == "National" else area, selected_years)
+            children = step["children"]
+            child_level = 1 if area == "National" else 2
+            if not children.empty:
+                latest_year = children["SurveyYear"].max()
+                latest = plot_frame(children[children["SurveyYear"] == latest_year], ["Area", "Value"])
+                fig = px.bar(
+                    latest,
+                    x="Area",
+                    y="Value",
+                    title=f"{selected_indicator} by {level_name(child_level)} ({latest_year})",
+                )
+                plotly_chart(fig, use_container_width=True)
+
+                # Choropleth when boundaries of the level are in data/boundaries/
+                boundaries = load_boundaries(child_level, latest["Area"])
+                if boundaries is not None:
+                    fig = px.choropleth_map(
+                        latest.assign(Key=area_key(latest["Area"]).to_numpy()),
+                        geojson=boundaries["geojson"],
+                        locations="Key",
+                        featureidkey="id",
+                        color="Value",
+                        hover_name="Area",
+                        hover_data={"Key": False},
+                        center=boundaries["center"],
+                        zoom=boundaries["zoom"],
+                        map_style="carto-positron",
+                        opacity=0.7,
+                    )
+                    fig.update_layout(margin=dict(l=0, r=0, t=0, b=0))
+                    plotly_chart(fig, use_container_width=True)
+                st.write(step["rollup"])
+            else:
+                st.info(f"No subnational values for {area}.")
     else:
         st.warning("No data available for the selected filters.")
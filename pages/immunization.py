@@ -3,7 +3,9 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from utils.data_loader import load_immunization
+from utils.cube import cube_frame, describe_by_indicator
+from utils.data_loader import load_cube, load_immunization
+from utils.figures import plot_frame, plotly_chart
 
 # Page title and description
 st.title("💉 Immunization Analysis")
@@ -12,27 +14,27 @@ This section provides insights into immunization coverage based on DHS survey da
 It allows filtering by survey year and analyzing trends over time.
 """)
 
-# Load the CSV file
-df = load_immunization()
+# Load the dense indicator cube (precomputed summaries per year)
+cube = load_cube("immunization")
 
 # Show raw data option
 if st.checkbox("Show Raw Data"):
-    st.dataframe(df)
+    st.dataframe(load_immunization())
 
 # Filter by year
-years = sorted(df["SurveyYear"].unique())
+years = list(cube["years"])
 selected_year = st.selectbox("Select Survey Year", years)
 
-df_year = df[df["SurveyYear"] == selected_year]
+df_year = cube_frame(cube, years=selected_year)
 
 # Summary statistics
 st.subheader(f"📊 Summary for {selected_year}")
-st.write(df_year.groupby("Indicator")["Value"].describe())
+st.write(describe_by_indicator(cube, selected_year))
 
 # Plot immunization rates
 st.subheader("📈 Immunization Coverage Trends")
 fig = px.bar(
-    df_year,
+    plot_frame(df_year, ["Indicator", "Value"]),
     x="Indicator",
     y="Value",
     color="Indicator",
@@ -40,19 +42,19 @@ fig = px.bar(
     labels={"Value": "Coverage (%)", "Indicator": "Immunization Type"},
 )
 fig.update_layout(xaxis_tickangle=45)
-st.plotly_chart(fig, use_container_width=True)
+plotly_chart(fig, use_container_width=True)
 
 # Time series trend for all years
 st.subheader("⏳ Trends Over Time")
-indicator_choice = st.selectbox("Select Immunization Indicator", df["Indicator"].unique())
+indicator_choice = st.selectbox("Select Immunization Indicator", cube["indicators"])
 
-df_indicator = df[df["Indicator"] == indicator_choice]
+df_indicator = cube_frame(cube, indicator_choice)
 fig2 = px.line(
-    df_indicator,
+    plot_frame(df_indicator, ["SurveyYear", "Value"]),
     x="SurveyYear",
     y="Value",
     markers=True,
     title=f"Trend of {indicator_choice} Over Time",
     labels={"Value": "Coverage (%)", "SurveyYear": "Year"},
 )
-st.plotly_chart(fig2, use_container_width=True)
+plotly_chart(fig2, use_container_width=True)
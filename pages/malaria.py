@@ -5,6 +5,7 @@ import pandas as pd
 import plotly.express as px
 import os
 from utils.data_loader import load_malaria
+from utils.figures import plot_frame, plotly_chart
 
 # --- Page Config ---
 st.set_page_config(page_title="Malaria Data Analysis - Zambia", page_icon="🦟", layout="wide")
@@ -27,7 +28,7 @@ with st.expander("📄 View Raw Zambia Data"):
 # --- Yearly Trend of Malaria Mortality ---
 if "YEAR (DISPLAY)" in df.columns and "Numeric" in df.columns:
     fig_trend = px.line(
-        df,
+        plot_frame(df, ["YEAR (DISPLAY)", "Numeric", "GHO (DISPLAY)"]),
         x="YEAR (DISPLAY)",
         y="Numeric",
         color="GHO (DISPLAY)",
@@ -35,18 +36,18 @@ if "YEAR (DISPLAY)" in df.columns and "Numeric" in df.columns:
         markers=True
     )
     fig_trend.update_layout(yaxis_title="Value", xaxis_title="Year")
-    st.plotly_chart(fig_trend, use_container_width=True)
+    plotly_chart(fig_trend, use_container_width=True)
 
 # --- Value Distribution ---
 if "Numeric" in df.columns:
     fig_hist = px.histogram(
-        df,
+        plot_frame(df, ["Numeric"]),
         x="Numeric",
         nbins=20,
         title="Distribution of Malaria Indicator Values in Zambia",
         marginal="box"
     )
-    st.plotly_chart(fig_hist, use_container_width=True)
+    plotly_chart(fig_hist, use_container_width=True)
 
 # --- Download Zambia Data ---
 st.download_button(
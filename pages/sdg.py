@@ -1,8 +1,10 @@
 # sdg.py
 
 import streamlit as st
-import pandas as pd
 import plotly.express as px
+from utils.cube import cube_frame
+from utils.data_loader import load_cube, load_sdgs
+from utils.figures import plot_frame, plotly_chart
 
 # Page title and description
 st.title("🌍 SDG Health Targets Analysis")
@@ -11,33 +13,27 @@ This page provides analysis of Sustainable Development Goal (SDG) health indicat
 based on DHS datasets. You can filter by survey year, indicator, and view trends over time.
 """)
 
-# Load CSV
-file_path = "data/sdgs_national_zmb.csv"
-try:
-    df = pd.read_csv(file_path)
-except FileNotFoundError:
-    st.error(f"CSV file not found at {file_path}. Please ensure it is in the correct folder.")
-    st.stop()
+# Load data: countries first, then the dense indicator cube of the selected one
+countries = sorted(load_sdgs(columns=["CountryName"])["CountryName"].dropna().unique())
 
 # Optional raw data view
 if st.checkbox("Show Raw Data"):
-    st.dataframe(df)
+    st.dataframe(load_sdgs())
 
 # Filter by country
-countries = sorted(df["CountryName"].unique())
 selected_country = st.selectbox("Select Country", countries)
-df_country = df[df["CountryName"] == selected_country]
+cube = load_cube("sdgs", filters={"CountryName": selected_country})
 
 # Filter by year
-years = sorted(df_country["SurveyYear"].unique())
+years = list(cube["years"])
 selected_year = st.selectbox("Select Survey Year", years)
-df_year = df_country[df_country["SurveyYear"] == selected_year]
+df_year = cube_frame(cube, years=selected_year)
 
 
 # Bar chart for selected year
 st.subheader("📈 Indicator Values for Selected Year")
 fig = px.bar(
-    df_year,
+    plot_frame(df_year, ["Indicator", "Value"]),
     x="Indicator",
     y="Value",
     color="Indicator",
@@ -45,19 +41,19 @@ fig = px.bar(
     labels={"Value": "Value", "Indicator": "Indicator"},
 )
 fig.update_layout(xaxis_tickangle=45)
-st.plotly_chart(fig, use_container_width=True)
+plotly_chart(fig, use_container_width=True)
 
 # Time series trend for selected indicator
 st.subheader("⏳ Trends Over Time")
-indicator_choice = st.selectbox("Select Indicator", df_country["Indicator"].unique())
-df_indicator = df_country[df_country["Indicator"] == indicator_choice]
+indicator_choice = st.selectbox("Select Indicator", cube["indicators"])
+df_indicator = cube_frame(cube, indicator_choice)
 
 fig2 = px.line(
-    df_indicator,
+    plot_frame(df_indicator, ["SurveyYear", "Value"]),
     x="SurveyYear",
     y="Value",
     markers=True,
     title=f"Trend of {indicator_choice} in {selected_country} Over Time",
     labels={"Value": "Value", "SurveyYear": "Year"},
 )
-st.plotly_chart(fig2, use_container_width=True)
+plotly_chart(fig2, use_container_width=True)
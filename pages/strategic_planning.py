@@ -1,5 +1,5 @@
 import streamlit as st
-from components import summary, indicators, interventions, modeling_advice, simulation
+from components import summary, indicators, interventions, modeling_advice, simulation, targets
 
 
 st.set_page_config(page_title="Strategic Health Planning", layout="wide", page_icon="📈")
@@ -13,14 +13,16 @@ aligned with the National Health Strategic Plan 2022-2026, Zambia Vision 2030, a
 # Show summary
 summary.show_summary()
 
-# Load indicator data
-data_file = "data/worldbank_health_indicators.csv"  # Replace with your actual data path
+# Key indicators from the World Bank, WHO GHO and DHS data (cached, see utils/targets.py)
 try:
-    df = indicators.load_indicator_data(data_file)
-    indicators.show_indicators(df)
+    tracker = indicators.load_indicator_data()
+    indicators.show_indicators(tracker)
 except Exception as e:
     st.error(f"Error loading indicator data: {e}")
 
+# Required versus observed progress for every target
+targets.show_target_tracker()
+
 # Run your modular simulation function here
 simulation.run_simulation()
 
@@ -0,0 +1,221 @@
+# utils/access.py
+"""
+Batch distance-to-facility and catchment engine.
+
+Answers "how far is each location from its nearest clinic/hospital" for
+millions of query points at once, over the facility store built in
+utils/facilities.py:
+
+- query points are converted to unit-sphere vectors chunk by chunk, so
+  memory stays bounded whatever the number of points
+- a KD-tree over the (optionally filtered) facility vectors returns the k
+  nearest facilities per point; the straight-line distance between unit
+  vectors converts exactly to the great-circle (haversine) distance
+- chunks can be spread over a process pool for very large batches
+- catchments (the query points whose nearest facility is a given one) are
+  counted with a single ``bincount``
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import shapely
+from scipy.spatial import cKDTree
+
+from utils.facilities import EARTH_RADIUS_KM, chord_to_km, to_unit_vectors
+
+# Query points converted and searched per batch
+CHUNK_SIZE = 250_000
+
+# Tree used by pool workers, set once per process by _init_worker
+_WORKER_TREE = None
+
+
+def facility_subset(store, amenity=None, operator_type=None):
+    """
+    Positions (in ``store["points"]``) of the facilities matching the filters.
+
+    Args:
+        store (dict): Output of ``build_facility_store``.
+        amenity (str or list): OSM ``amenity`` values to keep, e.g. "hospital".
+        operator_type (str or list): OSM ``operator:type`` values to keep, e.g. "public".
+
+    Returns:
+        np.ndarray: Sorted int positions.
+    """
+    points = store["points"]
+    keep = np.ones(len(points), dtype=bool)
+    for col, wanted in (("amenity", amenity), ("operator_type", operator_type)):
+        if wanted is None:
+            continue
+        values = list(wanted) if isinstance(wanted, (list, tuple, set)) else [wanted]
+        keep &= points[col].isin(values).to_numpy()
+    return np.flatnonzero(keep)
+
+
+def _facility_tree(store, subset):
+    if len(subset) == len(store["points"]):
+        return store["tree"]
+    return cKDTree(store["tree"].data[subset])
+
+
+def _query_chunk(tree, lat, lon, k):
+    chord, idx = tree.query(to_unit_vectors(lat, lon), k=k)
+    return chord_to_km(chord).astype(np.float32), idx.astype(np.int32)
+
+
+def _init_worker(tree):
+    global _WORKER_TREE
+    _WORKER_TREE = tree
+
+
+def _query_chunk_in_worker(args):
+    lat, lon, k = args
+    return _query_chunk(_WORKER_TREE, lat, lon, k)
+
+
+def nearest_facility_distances(
+    store,
+    lat,
+    lon,
+    k=1,
+    amenity=None,
+    operator_type=None,
+    chunk_size=CHUNK_SIZE,
+    processes=1,
+):
+    """
+    Great-circle distance from every query point to its ``k`` nearest facilities.
+
+    Args:
+        store (dict): Output of ``build_facility_store``.
+        lat, lon (array-like): Query coordinates in degrees.
+        k (int): Number of nearest facilities per point.
+        amenity, operator_type: Facility filters (see ``facility_subset``).
+        chunk_size (int): Query points handled per batch.
+        processes (int): Worker processes; 1 runs in the calling process.
+
+    Returns:
+        tuple: ``(distance_km, facility)``, float32 and int32 arrays of shape
+        (n,) when k == 1, else (n, k), nearest first. ``facility`` holds
+        positions in ``store["points"]``. Slots without a facility (fewer
+        than k match the filters) hold inf and -1.
+    """
+    lat = np.asarray(lat, dtype=np.float64).ravel()
+    lon = np.asarray(lon, dtype=np.float64).ravel()
+    n = len(lat)
+    subset = facility_subset(store, amenity=amenity, operator_type=operator_type)
+    shape = (n,) if k == 1 else (n, k)
+
+    distance = np.full(shape, np.inf, dtype=np.float32)
+    facility = np.full(shape, -1, dtype=np.int32)
+    if n == 0 or len(subset) == 0:
+        return distance, facility
+
+    k_found = min(k, len(subset))
+    tree = _facility_tree(store, subset)
+    bounds = [(start, min(start + chunk_size, n)) for start in range(0, n, chunk_size)]
+    jobs = [(lat[start:stop], lon[start:stop], k_found) for start, stop in bounds]
+
+    if processes > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(tree,)) as pool:
+            results = list(pool.map(_query_chunk_in_worker, jobs))
+    else:
+        results = [_query_chunk(tree, *job) for job in jobs]
+
+    for (start, stop), (dist, idx) in zip(bounds, results):
+        if k == 1:
+            distance[start:stop] = dist
+            facility[start:stop] = subset[idx]
+        else:
+            dist = dist.reshape(stop - start, k_found)
+            idx = idx.reshape(stop - start, k_found)
+            distance[start:stop, :k_found] = dist
+            facility[start:stop, :k_found] = subset[idx]
+    return distance, facility
+
+
+def catchment_counts(facility, n_facilities, weights=None):
+    """
+    Number (or total weight, e.g. population) of query points served by each facility.
+
+    Args:
+        facility (np.ndarray): Nearest-facility positions, as returned by
+            ``nearest_facility_distances`` with k == 1.
+        n_facilities (int): Number of facilities in the store.
+        weights (array-like): Optional weight per query point.
+
+    Returns:
+        np.ndarray: One value per facility position.
+    """
+    facility = np.asarray(facility)
+    matched = facility >= 0
+    if weights is not None:
+        weights = np.asarray(weights, dtype=np.float64)[matched]
+    return np.bincount(facility[matched], weights=weights, minlength=n_facilities)
+
+
+def grid_points(bbox, spacing_km):
+    """
+    Regular grid of query points over a (south, west, north, east) box.
+
+    The longitude step is widened with latitude so cells stay roughly
+    ``spacing_km`` square.
+
+    Returns:
+        tuple: ``(lat, lon)`` float64 arrays.
+    """
+    south, west, north, east = bbox
+    km_per_deg = np.pi * EARTH_RADIUS_KM / 180
+    lat_step = spacing_km / km_per_deg
+    lon_step = lat_step / np.cos(np.radians((south + north) / 2))
+    lat, lon = np.meshgrid(
+        np.arange(south + lat_step / 2, north, lat_step),
+        np.arange(west + lon_step / 2, east, lon_step),
+        indexing="ij",
+    )
+    return lat.ravel(), lon.ravel()
+
+
+def within_facility_hull(store, lat, lon):
+    """
+    Mask of query points inside the convex hull of all facilities.
+
+    A stand-in for the national boundary when trimming a rectangular grid:
+    cells outside it (neighbouring countries) would otherwise dominate the
+    long tail of distances.
+    """
+    points = store["points"]
+    hull = shapely.MultiPoint(np.column_stack((points["lon"].to_numpy(), points["lat"].to_numpy()))).convex_hull
+    shapely.prepare(hull)
+    return shapely.contains_xy(hull, np.asarray(lon), np.asarray(lat))
+
+
+def facility_catchments(store, lat, lon, amenity=None, operator_type=None, weights=None, nearest=None):
+    """
+    Facilities with the number of query points for which they are the nearest one.
+
+    Args:
+        nearest (tuple): ``(distance, facility)`` already returned by
+            ``nearest_facility_distances`` for the same points and filters,
+            to skip the tree query.
+
+    Returns:
+        pd.DataFrame: The matching facilities with ``catchment`` and
+        ``mean_distance_km`` columns, largest catchment first.
+    """
+    if nearest is None:
+        nearest = nearest_facility_distances(store, lat, lon, amenity=amenity, operator_type=operator_type)
+    distance, facility = nearest
+    n = len(store["points"])
+    counts = catchment_counts(facility, n, weights=weights)
+    total_km = catchment_counts(facility, n, weights=distance)
+    plain_counts = catchment_counts(facility, n)
+
+    subset = facility_subset(store, amenity=amenity, operator_type=operator_type)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_km = total_km / plain_counts
+    return (
+        store["points"].iloc[subset]
+        .assign(catchment=counts[subset], mean_distance_km=mean_km[subset].astype(np.float32))
+        .sort_values("catchment", ascending=False)
+    )
@@ -0,0 +1,81 @@
+# utils/annual_reduction.py
+"""
+Constant annual-reduction scenarios for programme indicators.
+
+An indicator falling by ``r`` percent a year from ``last_value`` is worth
+``last_value * (1 - r / 100) ** k`` after ``k`` years. Evaluating that for
+a whole vector of rates and horizons is one broadcast power, so the pages
+compute every rate their sliders offer once and draw the full range as a
+fan; moving a slider only selects a precomputed row.
+
+``required_reduction_rate`` is the inverse: the constant rate that takes a
+value to a target in a given number of years.
+"""
+import numpy as np
+
+# Rates (% per year) behind the reduction sliders: 0.0 to 20.0 in 0.1 steps
+REDUCTION_RATES = np.arange(201) / 10
+
+# Rates drawn as guide lines inside a fan
+FAN_RATES = (5, 10, 15)
+
+
+def reduction_paths(last_value, rates_pct, horizon, include_start=False):
+    """
+    Values after 1..``horizon`` years of constant annual percentage reductions.
+
+    Args:
+        last_value (float or np.ndarray): Starting value(s); array values add
+            leading axes.
+        rates_pct (array-like): Annual reduction rates in percent.
+        horizon (int): Years projected.
+        include_start (bool): Prepend year 0 (``last_value`` itself).
+
+    Returns:
+        np.ndarray: ``(..., len(rates_pct), horizon)`` projected values
+        (``horizon + 1`` columns with ``include_start``).
+    """
+    r = np.atleast_1d(np.asarray(rates_pct, dtype=np.float64)) / 100
+    k = np.arange(0 if include_start else 1, horizon + 1)
+    return np.asarray(last_value, dtype=np.float64)[..., None, None] * (1 - r)[:, None] ** k[None, :]
+
+
+def reduction_fan(last_year, last_value, end_year, rates=REDUCTION_RATES):
+    """
+    Every reduction path from the last observation to ``end_year``.
+
+    Returns:
+        dict: ``years`` (from ``last_year`` to ``end_year``), ``rates`` and
+        ``paths``, shape ``(len(rates), len(years))``, each starting at
+        ``last_value``.
+    """
+    horizon = max(int(end_year) - int(last_year), 0)
+    return {
+        "years": np.arange(int(last_year), int(last_year) + horizon + 1),
+        "rates": np.asarray(rates, dtype=np.float64),
+        "paths": reduction_paths(float(last_value), rates, horizon, include_start=True),
+    }
+
+
+def rate_row(rates, rate):
+    """Row of ``rates`` closest to ``rate`` (a slider value)."""
+    return int(np.abs(np.asarray(rates) - rate).argmin())
+
+
+def required_reduction_rate(last_value, target, years):
+    """
+    Constant annual reduction (%) taking ``last_value`` to ``target`` in ``years`` years.
+
+    The inverse of ``reduction_paths``; arguments broadcast against each
+    other. Negative rates are required increases (a target above the last
+    value). NaN where ``years`` is not positive or a value is not positive.
+    """
+    last_value, target, years = np.broadcast_arrays(
+        np.asarray(last_value, dtype=np.float64),
+        np.asarray(target, dtype=np.float64),
+        np.asarray(years, dtype=np.float64),
+    )
+    valid = (years > 0) & (last_value > 0) & (target > 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rate = -np.expm1(np.log(target / last_value) / years) * 100
+    return np.where(valid, rate, np.nan)
@@ -0,0 +1,169 @@
+# utils/boundaries.py
+"""
+Multi-resolution administrative boundaries for choropleth maps.
+
+Province and district outlines are far more detailed than a map can show at
+the zoom it is viewed at, and every vertex is shipped to the browser inside
+the figure. ``build_boundary_levels`` therefore precomputes each layer once
+at several levels of detail (``BOUNDARY_LODS``):
+
+- the areas are simplified together with ``shapely.coverage_simplify``, so
+  a shared border is simplified once and neighbouring areas keep meeting
+  exactly (no slivers or overlaps, unlike simplifying each polygon alone)
+- coordinates are snapped to a grid matching the tolerance, so they
+  serialize with a handful of decimals
+- the result is stored as WKB, one row per area and level of detail, in
+  the disk tier of utils/cache.py
+
+``lod_for_zoom`` picks the coarsest level whose tolerance stays under one
+screen pixel at a map zoom, and ``boundary_geojson`` turns the stored rows
+of the areas on the map into the GeoJSON a Plotly choropleth takes.
+"""
+import json
+
+import numpy as np
+import pandas as pd
+import shapely
+
+from utils.facilities import to_mercator
+
+BOUNDARY_DIR = "data/boundaries"
+
+# Administrative level (utils/regions.py) -> boundary file and its area name
+# property. The files are not shipped; a missing layer disables its maps.
+BOUNDARY_LAYERS = {
+    1: {"path": f"{BOUNDARY_DIR}/zmb_admin1.geojson", "name": "ADM1_EN"},
+    2: {"path": f"{BOUNDARY_DIR}/zmb_admin2.geojson", "name": "ADM2_EN"},
+}
+
+# Level of detail -> simplification tolerance and coordinate grid, in
+# degrees (0.001 deg is ~110 m). "full" keeps every vertex at ~0.1 m.
+BOUNDARY_LODS = {
+    "full": {"tolerance": 0.0, "grid": 1e-6},
+    "fine": {"tolerance": 0.001, "grid": 1e-4},
+    "medium": {"tolerance": 0.005, "grid": 1e-3},
+    "coarse": {"tolerance": 0.02, "grid": 1e-3},
+}
+
+# Size of the map the view is fitted to, in screen pixels
+MAP_WIDTH_PX = 700
+MAP_HEIGHT_PX = 450
+MAX_ZOOM = 12
+
+
+def area_key(names):
+    """Join key of area names: lowercase letters and digits only ("North-Western" -> "northwestern")."""
+    return pd.Series(names, dtype=object).astype(str).str.lower().str.replace(r"[^a-z0-9]+", "", regex=True)
+
+
+def simplify_coverage(geoms, tolerance):
+    """
+    Simplify polygons that tile an area together, keeping shared borders
+    identical. Falls back to simplifying each polygon alone on shapely
+    builds without ``coverage_simplify`` (GEOS < 3.12).
+    """
+    if tolerance <= 0:
+        return geoms
+    if hasattr(shapely, "coverage_simplify"):
+        return shapely.coverage_simplify(geoms, tolerance)
+    return shapely.simplify(geoms, tolerance, preserve_topology=True)
+
+
+def build_boundary_levels(gdf, name_col):
+    """
+    Encode a boundary layer at every level of detail.
+
+    Args:
+        gdf (gpd.GeoDataFrame): Area polygons; reprojected to WGS84 if needed.
+            Features sharing a name are merged into one area.
+        name_col (str): Property holding the area name.
+
+    Returns:
+        pd.DataFrame: key (``area_key`` of the name), name, lod, wkb and
+        vertices, one row per area and level of detail.
+    """
+    if gdf.crs is not None and gdf.crs.to_epsg() != 4326:
+        gdf = gdf.to_crs(4326)
+    names = gdf[name_col].astype(str).to_numpy(dtype=object)
+    keys = area_key(names).to_numpy(dtype=object)
+    geoms = shapely.make_valid(np.asarray(gdf.geometry.array, dtype=object))
+
+    unique, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    areas = np.array([shapely.union_all(geoms[inverse == i]) for i in range(len(unique))], dtype=object)
+
+    frames = []
+    for lod, spec in BOUNDARY_LODS.items():
+        encoded = shapely.set_precision(simplify_coverage(areas, spec["tolerance"]), spec["grid"])
+        frames.append(pd.DataFrame({
+            "key": unique,
+            "name": names[first],
+            "lod": lod,
+            "wkb": shapely.to_wkb(encoded),
+            "vertices": shapely.get_num_coordinates(encoded).astype(np.int64),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def lod_for_zoom(zoom):
+    """
+    Coarsest level of detail whose tolerance is below one screen pixel at
+    ``zoom`` (256 px Web-Mercator tiles, pixel width taken at the equator).
+    """
+    pixel_deg = 360.0 / (256 * 2 ** float(zoom))
+    fitting = [(spec["tolerance"], lod) for lod, spec in BOUNDARY_LODS.items() if spec["tolerance"] <= pixel_deg]
+    return max(fitting)[1]
+
+
+def boundary_view(levels, keys=None, width_px=MAP_WIDTH_PX, height_px=MAP_HEIGHT_PX):
+    """
+    Map view fitting some areas of a layer.
+
+    Args:
+        levels (pd.DataFrame): Output of ``build_boundary_levels``.
+        keys (list): Area keys to fit. Defaults to every area.
+
+    Returns:
+        dict: ``center`` ({"lat", "lon"}), ``zoom`` and the ``lod`` to draw at
+        that zoom, or None when none of ``keys`` is in the layer.
+    """
+    rows = levels[levels["lod"] == "coarse"]
+    if keys is not None:
+        rows = rows[rows["key"].isin(list(keys))]
+    if rows.empty:
+        return None
+    west, south, east, north = shapely.total_bounds(shapely.from_wkb(rows["wkb"].to_numpy()))
+    x, y = to_mercator([south, north], [west, east])
+    # Mercator spans in tiles of 256 px at zoom 0
+    span_x, span_y = max(x[1] - x[0], 1e-9), max(y[0] - y[1], 1e-9)
+    zoom = float(np.clip(np.log2(min(width_px / (256 * span_x), height_px / (256 * span_y))), 0, MAX_ZOOM))
+    return {
+        "center": {"lat": float(south + north) / 2, "lon": float(west + east) / 2},
+        "zoom": zoom,
+        "lod": lod_for_zoom(zoom),
+    }
+
+
+def boundary_geojson(levels, lod, keys=None):
+    """
+    GeoJSON FeatureCollection of some areas of a layer at one level of detail.
+
+    Args:
+        levels (pd.DataFrame): Output of ``build_boundary_levels``.
+        lod (str): Key of ``BOUNDARY_LODS``.
+        keys (list): Area keys to include. Defaults to every area.
+
+    Returns:
+        dict: Features with ``id`` set to the area key (match it with
+        ``featureidkey="id"``) and the area ``name`` as property.
+    """
+    rows = levels[levels["lod"] == lod]
+    if keys is not None:
+        rows = rows[rows["key"].isin(list(keys))]
+    geometries = shapely.to_geojson(shapely.from_wkb(rows["wkb"].to_numpy()))
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "id": key, "properties": {"name": name}, "geometry": json.loads(geometry)}
+            for key, name, geometry in zip(rows["key"], rows["name"], geometries)
+        ],
+    }
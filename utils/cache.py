@@ -0,0 +1,118 @@
+# utils/cache.py
+"""
+File fingerprints and the persistent on-disk tier of parsed frames.
+
+In-memory caches are keyed on ``file_fingerprint(path)`` so that dropping a
+refreshed export into ``data/`` invalidates only the entries built from that
+file. Parsed frames are also written to ``FRAME_CACHE_DIR`` as Parquet, so a
+freshly started process reads them back instead of re-parsing the CSVs.
+"""
+import glob
+import os
+import re
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+FRAME_CACHE_DIR = "data/store/frames"
+
+# Bump when the parsed layout of stored frames changes (dtypes, columns) so
+# artifacts written by older code are rebuilt instead of read back.
+FORMAT_VERSION = 2
+
+
+def file_fingerprint(path):
+    """
+    Cheap fingerprint of a source file (modification time + size).
+
+    Returns:
+        str: e.g. "17c2f3a1b2c3d4e5-1b3e7-v2", changes whenever the file is
+        replaced or edited, or when ``FORMAT_VERSION`` is bumped.
+    """
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}-v{FORMAT_VERSION}"
+
+
+def _frame_key(key):
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", key)
+
+
+def _frame_path(key, fingerprint, cache_dir):
+    return os.path.join(cache_dir, f"{_frame_key(key)}@{fingerprint}.parquet")
+
+
+def read_cached_frame(key, fingerprint, columns=None, cache_dir=FRAME_CACHE_DIR):
+    """
+    Read a parsed frame from the disk tier.
+
+    Returns:
+        pd.DataFrame or None: None when no frame exists for this fingerprint.
+    """
+    path = _frame_path(key, fingerprint, cache_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        return pd.read_parquet(path, columns=None if columns is None else list(columns))
+    except Exception:
+        # Partially written or unreadable entry: treat as a miss
+        return None
+
+
+def cached_fingerprints(key, cache_dir=FRAME_CACHE_DIR):
+    """Fingerprints with a frame of ``key`` in the disk tier (the previous version of a refreshed file)."""
+    prefix = f"{_frame_key(key)}@"
+    return [
+        os.path.basename(path)[len(prefix):-len(".parquet")]
+        for path in glob.glob(os.path.join(cache_dir, f"{prefix}*.parquet"))
+    ]
+
+
+def write_cached_frame(key, fingerprint, df, cache_dir=FRAME_CACHE_DIR):
+    """Persist a parsed frame and drop the entries of older fingerprints of the same key."""
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _frame_path(key, fingerprint, cache_dir)
+
+    # Write then rename so concurrent readers never see a partial file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    for col in df.columns:
+        # An all-empty categorical has untyped categories and would read back
+        # as an object column; give it string categories instead.
+        if isinstance(df[col].dtype, pd.CategoricalDtype) and len(df[col].cat.categories) == 0:
+            df[col] = df[col].cat.set_categories(pd.Index([], dtype=str))
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+    for stale in glob.glob(os.path.join(cache_dir, f"{_frame_key(key)}@*.parquet")):
+        if stale != path:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+
+def write_cached_batches(key, fingerprint, schema, batches, cache_dir=FRAME_CACHE_DIR):
+    """
+    Stream Arrow record batches matching ``schema`` into the disk tier, so
+    a frame larger than memory can be persisted; otherwise as ``write_cached_frame``.
+
+    Returns:
+        int: Rows written.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _frame_path(key, fingerprint, cache_dir)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+
+    rows = 0
+    with pq.ParquetWriter(tmp_path, schema) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    os.replace(tmp_path, path)
+
+    for stale in glob.glob(os.path.join(cache_dir, f"{_frame_key(key)}@*.parquet")):
+        if stale != path:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+    return rows
@@ -0,0 +1,141 @@
+# utils/catalog.py
+"""
+Declarative catalog of every dataset the app reads.
+
+Each entry describes where a dataset lives and how to parse it:
+
+- ``path``: source file under ``data/``
+- ``format``: ``"csv"`` (parsed directly) or ``"dhs-store"`` (served from the
+  partitioned Parquet store, see utils/dhs_store.py)
+- ``encoding``: text encoding of the source file, or None to detect it
+  once per file version (``source_encoding`` in utils/streaming.py)
+- ``schema``: column layout family (``"worldbank"``, ``"gho"`` or ``"dhs"``)
+- ``dtypes``: compact dtypes applied while parsing CSV sources; float
+  columns not listed are stored as ``FLOAT_DTYPE``
+- ``year_col``: name of the column holding the observation year
+
+``WAREHOUSE_LAYOUTS`` maps each schema onto the long indicator warehouse
+(see utils/warehouse.py), and ``ROW_KEYS`` names the columns identifying a
+row of each schema, so a refreshed export can be diffed against the stored
+version (see utils/refresh.py).
+
+Adding a survey or country export is a new entry here, not a new loader.
+"""
+
+FLOAT_DTYPE = "float32"
+
+# WHO Global Health Observatory exports share one layout
+GHO_DTYPES = {
+    "GHO (CODE)": "category",
+    "GHO (DISPLAY)": "category",
+    "GHO (URL)": "category",
+    "YEAR (DISPLAY)": "int16",
+    "STARTYEAR": "int16",
+    "ENDYEAR": "int16",
+    "REGION (CODE)": "category",
+    "REGION (DISPLAY)": "category",
+    "COUNTRY (CODE)": "category",
+    "COUNTRY (DISPLAY)": "category",
+    "DIMENSION (TYPE)": "category",
+    "DIMENSION (CODE)": "category",
+    "DIMENSION (NAME)": "category",
+    "Numeric": "float32",
+    "Value": "str",
+    "Low": "float32",
+    "High": "float32",
+}
+
+
+def _dhs(path):
+    return {
+        "path": path,
+        "format": "dhs-store",
+        "encoding": None,
+        "schema": "dhs",
+        "dtypes": None,  # typed by DHS_SCHEMA in utils/dhs_store.py
+        "year_col": "SurveyYear",
+    }
+
+
+CATALOG = {
+    "worldbank": {
+        "path": "data/worldbank_health_indicators.csv",
+        "format": "csv",
+        "encoding": None,
+        "schema": "worldbank",
+        "dtypes": {"Year": "int16"},
+        "year_col": "Year",
+    },
+    "malaria": {
+        "path": "data/malaria_indicators_zmb.csv",
+        "format": "csv",
+        "encoding": None,
+        "schema": "gho",
+        "dtypes": GHO_DTYPES,
+        "year_col": "YEAR (DISPLAY)",
+    },
+    "tuberculosis": {
+        "path": "data/tuberculosis_indicators_zmb.csv",
+        "format": "csv",
+        "encoding": None,
+        "schema": "gho",
+        "dtypes": GHO_DTYPES,
+        "year_col": "YEAR (DISPLAY)",
+    },
+    # DHS STATcompiler exports (29-column layout)
+    "access-to-health-care": _dhs("data/access-to-health-care.csv"),
+    "acute": _dhs("data/acute-respiratory-infection-ari_national_zmb.csv"),
+    "adult-mortality": _dhs("data/adult-mortality_national_zmb.csv"),
+    "covid-19-prevention": _dhs("data/covid-19-prevention_national_zmb.csv"),
+    "dhs-mobile": _dhs("data/dhs-mobile_national_zmb.csv"),
+    "dhs-quickstats": _dhs("data/dhs-quickstats_national_zmb.csv"),
+    "diarrhea": _dhs("data/diarrhea_national_zmb.csv"),
+    "health-insurance": _dhs("data/health-insurance_national_zmb.csv"),
+    "hiv-prevalence": _dhs("data/hiv-prevalence_national_zmb.csv"),
+    "immunization": _dhs("data/immunization_national_zmb.csv"),
+    "sdgs": _dhs("data/sdgs_national_zmb.csv"),
+    "select-malaria-indicators": _dhs("data/select-malaria-indicators_national_zmb.csv"),
+}
+
+
+# schema -> how rows map onto the long warehouse table (utils/warehouse.py).
+# ``indicator_id`` columns identify a series, ``indicator`` and ``breakdown``
+# label it; wide layouts hold one indicator per column next to the year. DHS
+# exports reuse a few ``IndicatorId`` values for two indicators told apart
+# only by ``IndicatorOrder``, so it is part of the key.
+WAREHOUSE_LAYOUTS = {
+    "worldbank": {"wide": True, "year": "Year"},
+    "gho": {
+        "indicator_id": ["GHO (CODE)", "DIMENSION (CODE)"],
+        "indicator": "GHO (DISPLAY)",
+        "breakdown": "DIMENSION (NAME)",
+        "year": "YEAR (DISPLAY)",
+        "value": "Numeric",
+        "ci_low": "Low",
+        "ci_high": "High",
+    },
+    "dhs": {
+        "indicator_id": ["IndicatorId", "CharacteristicId", "ByVariableId", "IndicatorOrder"],
+        "indicator": "Indicator",
+        "breakdown": "CharacteristicLabel",
+        "year": "SurveyYear",
+        "value": "Value",
+        "ci_low": "CILow",
+        "ci_high": "CIHigh",
+    },
+}
+
+
+# schema -> columns identifying one row across versions of an export.
+# GHO exports carry one row per indicator, year and dimension value; the wide
+# World Bank file one row per year.
+ROW_KEYS = {
+    "worldbank": ["Year"],
+    "gho": ["GHO (CODE)", "YEAR (DISPLAY)", "DIMENSION (CODE)"],
+    "dhs": ["SurveyId", "DataId"],
+}
+
+
+def datasets_with_schema(schema):
+    """Names of catalog entries using the given column layout."""
+    return [name for name, spec in CATALOG.items() if spec["schema"] == schema]
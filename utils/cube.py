@@ -0,0 +1,266 @@
+# utils/cube.py
+"""
+Dense indicator cube over a DHS dataset, with materialized rollups.
+
+The DHS pages filter a dataset by indicator, survey year and breakdown,
+then summarize ``Value`` with ``groupby(...).describe()``. ``build_cube``
+lays the dataset out once as dense arrays with the axes
+
+- ``indicators``: ``Indicator`` labels (sorted)
+- ``years``: ``SurveyYear`` (sorted)
+- ``characteristics``: (``CharacteristicCategory``, ``CharacteristicLabel``) pairs
+- variants: several rows can share a cell (the same indicator label under
+  two indicator ids, or one per by-variable such as a recall period), so
+  the last axis holds them side by side, padded with NaN
+
+for each measure in ``CUBE_MEASURES``. A widget change is then an index
+lookup and an array slice (``cube_frame``), and the ``describe`` tables
+the pages show are precomputed over the breakdown axes
+(``describe_by_year``, ``describe_by_indicator``).
+
+When a refreshed export changes a few rows, ``update_cube`` refills only
+the (indicator, year) blocks holding them and the rollups over those blocks.
+"""
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from utils.warehouse import text_values
+
+CUBE_MEASURES = ["Value", "CILow", "CIHigh"]
+CUBE_COLUMNS = ["Indicator", "SurveyYear", "CharacteristicCategory", "CharacteristicLabel", *CUBE_MEASURES]
+
+# Columns of the rollups, as in ``pd.Series.describe``
+DESCRIBE_STATS = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+
+
+def describe_cells(values, axis):
+    """
+    ``describe`` statistics of ``values`` over ``axis``, ignoring NaN.
+
+    Returns:
+        np.ndarray: The remaining axes plus a trailing axis of ``DESCRIBE_STATS``.
+    """
+    axis = tuple(np.atleast_1d(axis))
+    values = np.moveaxis(np.asarray(values, dtype=np.float64), axis, range(-len(axis), 0))
+    values = values.reshape(*values.shape[:values.ndim - len(axis)], -1)
+
+    count = (~np.isnan(values)).sum(axis=-1)
+    # Empty cells give NaN statistics; the "all-NaN slice" warnings say the same
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        quartiles = np.nanpercentile(values, [25, 50, 75], axis=-1)
+        stats = [
+            count,
+            np.nanmean(values, axis=-1),
+            np.nanstd(values, axis=-1, ddof=1),
+            np.nanmin(values, axis=-1),
+            *quartiles,
+            np.nanmax(values, axis=-1),
+        ]
+    return np.stack(stats, axis=-1)
+
+
+def build_cube(df):
+    """
+    Lay out a DHS dataset as a dense cube.
+
+    Args:
+        df (pd.DataFrame): Rows with ``CUBE_COLUMNS``.
+
+    Returns:
+        dict: ``indicators`` and ``years`` (pd.Index), ``characteristics``
+        (pd.MultiIndex of category and label), ``measures`` (measure ->
+        array of shape ``(indicators, years, characteristics, variants)``)
+        and the ``Value`` rollups ``by_indicator_year``
+        ``(indicators, years, stats)``, ``by_year`` ``(years, stats)`` and
+        ``by_indicator`` ``(indicators, stats)``.
+    """
+    df = df.dropna(subset=["Indicator", "SurveyYear"])
+    ind_codes, indicators = pd.factorize(df["Indicator"].astype(str), sort=True)
+    year_codes, years = pd.factorize(df["SurveyYear"].astype(np.int64), sort=True)
+    char_codes, characteristics = pd.factorize(
+        pd.MultiIndex.from_arrays(
+            [text_values(df[col]) for col in ("CharacteristicCategory", "CharacteristicLabel")],
+            names=["CharacteristicCategory", "CharacteristicLabel"],
+        ),
+        sort=True,
+    )
+
+    shape = (len(indicators), len(years), len(characteristics))
+    cell = np.ravel_multi_index((ind_codes, year_codes, char_codes), shape) if len(df) else np.zeros(0, dtype=np.int64)
+    variant = pd.Series(cell).groupby(cell).cumcount().to_numpy()
+    n_variants = int(variant.max()) + 1 if len(variant) else 1
+
+    measures = {}
+    for measure in CUBE_MEASURES:
+        values = np.full((*shape, n_variants), np.nan, dtype=np.float32)
+        values[ind_codes, year_codes, char_codes, variant] = df[measure].to_numpy(dtype=np.float32)
+        measures[measure] = values
+
+    value = measures["Value"]
+    return {
+        "indicators": pd.Index(indicators, name="Indicator"),
+        "years": pd.Index(years, name="SurveyYear"),
+        "characteristics": characteristics,
+        "measures": measures,
+        "by_indicator_year": describe_cells(value, (2, 3)),
+        "by_year": describe_cells(value, (0, 2, 3)),
+        "by_indicator": describe_cells(value, (1, 2, 3)),
+    }
+
+
+def update_cube(cube, df, changed):
+    """
+    Cube of ``df`` derived from the cube of an earlier version of it.
+
+    Args:
+        cube (dict): Output of ``build_cube`` for the earlier version; left unchanged.
+        df (pd.DataFrame): Current rows with ``CUBE_COLUMNS``.
+        changed (pd.DataFrame): Rows added, removed or changed since the
+            earlier version (both versions of a changed row), with ``CUBE_COLUMNS``.
+
+    Returns:
+        dict or None: The updated cube, or None when the change does not fit
+        its axes (a new indicator, year or breakdown, or more variants per
+        cell) and the cube has to be rebuilt.
+    """
+    changed = changed.dropna(subset=["Indicator", "SurveyYear"])
+    if not len(changed):
+        return cube
+    ind = cube["indicators"].get_indexer(changed["Indicator"].astype(str))
+    year = cube["years"].get_indexer(changed["SurveyYear"].astype(np.int64))
+    if (ind < 0).any() or (year < 0).any():
+        return None
+    blocks = np.unique(np.stack([ind, year], axis=1), axis=0)
+    ind, year = blocks[:, 0], blocks[:, 1]
+
+    df = df.dropna(subset=["Indicator", "SurveyYear"])
+    df_ind = cube["indicators"].get_indexer(df["Indicator"].astype(str))
+    df_year = cube["years"].get_indexer(df["SurveyYear"].astype(np.int64))
+    shape = (len(cube["indicators"]), len(cube["years"]))
+    in_block = np.isin(
+        np.ravel_multi_index((np.maximum(df_ind, 0), np.maximum(df_year, 0)), shape),
+        np.ravel_multi_index((ind, year), shape),
+    ) & (df_ind >= 0) & (df_year >= 0)
+    rows = df[in_block]
+    row_ind, row_year = df_ind[in_block], df_year[in_block]
+    row_char = cube["characteristics"].get_indexer(pd.MultiIndex.from_arrays(
+        [text_values(rows[col]) for col in ("CharacteristicCategory", "CharacteristicLabel")]
+    ))
+    if (row_char < 0).any():
+        return None
+    cell = np.ravel_multi_index((row_ind, row_year, row_char), (*shape, len(cube["characteristics"])))
+    variant = pd.Series(cell).groupby(cell).cumcount().to_numpy()
+    if len(variant) and variant.max() >= cube["measures"]["Value"].shape[-1]:
+        return None
+
+    measures = {}
+    for measure, values in cube["measures"].items():
+        values = values.copy()
+        values[ind, year] = np.nan
+        values[row_ind, row_year, row_char, variant] = rows[measure].to_numpy(dtype=np.float32)
+        measures[measure] = values
+
+    value = measures["Value"]
+    by_indicator_year, by_year, by_indicator = (cube[k].copy() for k in ("by_indicator_year", "by_year", "by_indicator"))
+    by_indicator_year[ind, year] = describe_cells(value[ind, year], (1, 2))
+    years, indicators = np.unique(year), np.unique(ind)
+    by_year[years] = describe_cells(value[:, years], (0, 2, 3))
+    by_indicator[indicators] = describe_cells(value[indicators], (1, 2, 3))
+    return {
+        **cube,
+        "measures": measures,
+        "by_indicator_year": by_indicator_year,
+        "by_year": by_year,
+        "by_indicator": by_indicator,
+    }
+
+
+def _year_positions(cube, years):
+    if years is None:
+        return np.arange(len(cube["years"]))
+    pos = cube["years"].get_indexer(np.atleast_1d(years))
+    return pos[pos >= 0]
+
+
+def cube_indicators(cube, years=None):
+    """Indicators with at least one value in ``years`` (all years by default)."""
+    counts = cube["by_indicator_year"][:, _year_positions(cube, years), 0]
+    return cube["indicators"][counts.sum(axis=1) > 0]
+
+
+def cube_frame(cube, indicator=None, years=None, measures=("Value",)):
+    """
+    Observed cells of a slice as rows.
+
+    Args:
+        cube (dict): Output of ``build_cube``.
+        indicator (str): Indicator to keep. Defaults to all.
+        years (int or list): Survey years to keep. Defaults to all.
+        measures (list): Measures to return.
+
+    Returns:
+        pd.DataFrame: ``Indicator``, ``SurveyYear``, ``CharacteristicCategory``,
+        ``CharacteristicLabel`` and ``measures``, one row per observed value.
+    """
+    ind_pos = np.arange(len(cube["indicators"]))
+    if indicator is not None:
+        loc = cube["indicators"].get_indexer([indicator])
+        ind_pos = loc[loc >= 0]
+    year_pos = _year_positions(cube, years)
+
+    block = np.ix_(ind_pos, year_pos)
+    value = cube["measures"]["Value"][block]
+    i, y, c, v = np.nonzero(~np.isnan(value))
+    chars = cube["characteristics"][c]
+    out = pd.DataFrame({
+        "Indicator": cube["indicators"][ind_pos[i]],
+        "SurveyYear": cube["years"][year_pos[y]],
+        "CharacteristicCategory": chars.get_level_values(0),
+        "CharacteristicLabel": chars.get_level_values(1),
+    })
+    for measure in measures:
+        out[measure] = cube["measures"][measure][block][i, y, c, v]
+    return out
+
+
+def _describe_frame(stats, index):
+    out = pd.DataFrame(stats, index=index, columns=DESCRIBE_STATS)
+    return out[out["count"] > 0]
+
+
+def describe_by_year(cube, indicator=None, years=None):
+    """
+    ``Value`` statistics per survey year over every breakdown, read from the
+    rollups: of one indicator, or of all of them pooled.
+
+    Matches ``df.groupby("SurveyYear")["Value"].describe()`` on the same rows.
+    """
+    year_pos = _year_positions(cube, years)
+    if indicator is None:
+        stats = cube["by_year"][year_pos]
+    else:
+        loc = cube["indicators"].get_indexer([indicator])
+        if loc[0] < 0:
+            return pd.DataFrame(columns=DESCRIBE_STATS, index=cube["years"][:0])
+        stats = cube["by_indicator_year"][loc[0], year_pos]
+    return _describe_frame(stats, cube["years"][year_pos])
+
+
+def describe_by_indicator(cube, year=None):
+    """
+    ``Value`` statistics per indicator over every breakdown in one survey
+    year (all years pooled by default), read from the rollups.
+
+    Matches ``df.groupby("Indicator")["Value"].describe()`` on the same rows.
+    """
+    if year is None:
+        stats = cube["by_indicator"]
+    else:
+        pos = _year_positions(cube, year)
+        if not len(pos):
+            return pd.DataFrame(columns=DESCRIBE_STATS, index=cube["indicators"][:0])
+        stats = cube["by_indicator_year"][:, pos[0]]
+    return _describe_frame(stats, cube["indicators"])
@@ -1,14 +1,37 @@
 # utils/data_loader.py
+import numpy as np
 import pandas as pd
 import streamlit as st
 import geopandas as gpd
 import os
+import time
+from utils.access import facility_catchments, grid_points, nearest_facility_distances, within_facility_hull
+from utils.boundaries import BOUNDARY_LAYERS, area_key, boundary_geojson, boundary_view, build_boundary_levels
+from utils.cache import cached_fingerprints, file_fingerprint, read_cached_frame, write_cached_batches, write_cached_frame
+from utils.catalog import CATALOG, FLOAT_DTYPE, ROW_KEYS, WAREHOUSE_LAYOUTS
+from utils.cube import CUBE_COLUMNS, build_cube, update_cube
+from utils.dhs_store import read_dhs, store_regions
+from utils.facilities import FACILITIES_PATH, ZAMBIA_BBOX, build_facility_store, read_facility_points
+from utils.query_engine import build_query_engine, run_query
+from utils.regions import REGION_COLUMNS, ROLLUP_KEY, area_names, region_rollup
+from utils.refresh import delta_counts, delta_rows, diff_rows, incremental, log_change, record_delta, update_projections, update_snapshot
+from utils.streaming import catalog_schema, required_columns, source_encoding, stream_ingest
+from utils.targets import NHSP_TARGETS, indicator_tracker, target_datasets, target_progress
+from utils.trends import TREND_HORIZON, TREND_LEVEL, project_series, snapshot_table
+from utils.warehouse import build_warehouse, ingest, query
 
-@st.cache_data
 def load_data(path):
     if not os.path.exists(path):
         st.error(f"CSV file not found: {path}")
         st.stop()
+    return shared_view(_load_csv(path, file_fingerprint(path)))
+
+@st.cache_resource(show_spinner=False)
+def _load_csv(path, fingerprint):
+    # Keyed on the file fingerprint so a refreshed export replaces the entry
+    df = read_cached_frame(path, fingerprint)
+    if df is not None:
+        return freeze_frame(df)
 
     df = pd.read_csv(path)
     if 'Year' in df.columns:
@@ -16,7 +39,51 @@ def load_data(path):
             df['Year'] = pd.to_datetime(df['Year'], format='%Y', errors='coerce')
         except Exception as e:
             st.warning(f"Year column could not be parsed: {e}")
-    return df
+    df = compact_frame(df)
+    write_cached_frame(path, fingerprint, df)
+    return freeze_frame(df)
+
+def load_facility_store(path=FACILITIES_PATH):
+    """Indexed health facility points, built once and shared by the map pages (see utils/facilities.py)."""
+    if not os.path.exists(path):
+        st.error(f"Facility file not found: {path}")
+        st.stop()
+    return _load_facility_store(path, file_fingerprint(path))
+
+@st.cache_resource(ttl=3600, max_entries=2, show_spinner=False)
+def _load_facility_store(path, fingerprint):
+    store = build_facility_store(read_facility_points(path))
+    store["points"] = freeze_frame(store["points"])
+    return store
+
+def load_access_grid(amenities=(), operators=(), spacing_km=5, path=FACILITIES_PATH):
+    """
+    Distance from a grid over Zambia (trimmed to the facilities' hull) to the
+    nearest matching facility, and the catchment of each facility (see
+    utils/access.py). Cached per version of the facility file.
+
+    Args:
+        amenities, operators (tuple): Facility filters; empty keeps all.
+        spacing_km (float): Grid spacing.
+
+    Returns:
+        tuple: ``(distance, catchments)``: km per grid point and the output
+        of ``facility_catchments``.
+    """
+    if not os.path.exists(path):
+        st.error(f"Facility file not found: {path}")
+        st.stop()
+    return _load_access_grid(path, file_fingerprint(path), tuple(amenities), tuple(operators), spacing_km)
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner="Computing distances...")
+def _load_access_grid(path, fingerprint, amenities, operators, spacing_km):
+    store = load_facility_store(path)
+    lat, lon = grid_points(ZAMBIA_BBOX, spacing_km)
+    inside = within_facility_hull(store, lat, lon)
+    lat, lon = lat[inside], lon[inside]
+    filters = {"amenity": list(amenities) or None, "operator_type": list(operators) or None}
+    nearest = nearest_facility_distances(store, lat, lon, **filters)
+    return nearest[0], facility_catchments(store, lat, lon, nearest=nearest, **filters)
 
 @st.cache_data
 def load_geojson(path: str) -> gpd.GeoDataFrame:
@@ -48,82 +115,479 @@ def load_geojson(path: str) -> gpd.GeoDataFrame:
         st.error(f"Failed to load geospatial data from {path}: {e}")
         st.stop()
 
-@st.cache_data
-def load_healthcare_access():
-    path = "data/access-to-health-care.csv"
-    if not os.path.exists(path):
-        st.error(f"CSV file not found: {path}")
-        st.stop()
-    return pd.read_csv(path)
+def freeze_frame(df):
+    """
+    Rebuild a frame on private buffers so it can be shared between sessions.
 
-@st.cache_data
-def load_covid_data():
-    path = "data/covid-19-prevention_national_zmb.csv"
-    if not os.path.exists(path):
-        st.error(f"CSV file not found: {path}")
-        st.stop()
-    return pd.read_csv(path)
+    NumPy-backed and categorical columns are made read-only: writing into
+    them on this frame (``df.loc[...] = ...``, or through ``.to_numpy()``)
+    raises ``ValueError: assignment destination is read-only``. Extension
+    columns (Arrow-backed strings, nullable ints) are copied but stay
+    writable, which is why pages are served a ``shared_view`` of it.
+    """
+    columns = {}
+    for col in df.columns:
+        values = df[col].array
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            codes = np.array(values.codes, copy=True)
+            codes.flags.writeable = False
+            columns[col] = pd.Categorical.from_codes(codes, dtype=df[col].dtype)
+        elif isinstance(df[col].dtype, np.dtype):
+            data = df[col].to_numpy(copy=True)
+            data.flags.writeable = False
+            columns[col] = data
+        else:
+            # Extension arrays (Arrow-backed strings, nullable ints)
+            columns[col] = values.copy()
+    return pd.DataFrame(columns, index=df.index, copy=False)
 
-@st.cache_data
-def load_dhs_data():
-    path = "data/dhs-mobile_national_zmb.csv"
-    if not os.path.exists(path):
-        st.error(f"DHS CSV file not found: {path}")
-        st.stop()
-    return pd.read_csv(path)
+def shared_view(df):
+    """
+    Shallow view of a shared frozen frame: no data is copied. Adding or
+    replacing columns and ``df.loc[...] = ...`` writes, whatever the column
+    dtypes, succeed and copy on write, so only the view changes and the
+    shared frame never does. Writes into a buffer taken from the view
+    (``.to_numpy()``) still raise on read-only columns.
+    """
+    return df.copy(deep=False)
 
-@st.cache_data
-def load_immunization():
-    path = "data/immunization_national_zmb.csv"
-    if not os.path.exists(path):
-        st.error(f"CSV file not found: {path}")
-        st.stop()
-    return pd.read_csv(path)
+@st.cache_resource(ttl=3600, max_entries=32, show_spinner=False)
+def _load_dataset(name, fingerprint, columns, filters):
+    # One frozen frame per slice, shared by every session and rerun
+    spec = CATALOG[name]
+    if spec["format"] == "dhs-store":
+        # The store refreshes this dataset itself when its source fingerprint changed
+        return freeze_frame(read_dhs(name, columns=columns, filters=dict(filters)))
 
-@st.cache_data
-def load_malaria():
-    path = "data/malaria_indicators_zmb.csv"
-    if not os.path.exists(path):
-        st.error(f"CSV file not found: {path}")
-        st.stop()
-    return pd.read_csv(path, encoding="latin1")
+    usecols = None
+    if columns is not None:
+        usecols = list(dict.fromkeys(list(columns) + [col for col, _ in filters]))
 
-@st.cache_data
-def load_acute():
-    path = "data/acute-respiratory-infection-ari_national_zmb.csv"
-    if not os.path.exists(path):
-        st.error(f"CSV file not found: {path}")
-        st.stop()
-    return pd.read_csv(path)
+    # Disk tier first; on a miss stream the file into it once, in bounded
+    # memory and validated (see utils/streaming.py), then read the slice back
+    df = read_cached_frame(name, fingerprint, columns=usecols)
+    if df is None:
+        ingest_csv_source(name, fingerprint)
+        df = read_cached_frame(name, fingerprint, columns=usecols)
 
-@st.cache_data
-def load_health_insurance():
-    path = "data/health-insurance_national_zmb.csv"
-    if not os.path.exists(path):
-        st.error(f"CSV file not found: {path}")
-        st.stop()
-    return pd.read_csv(path)
+    for col, values in filters:
+        df = df[df[col].isin(values)]
+    if columns is not None:
+        df = df[list(columns)]
+    return freeze_frame(df.reset_index(drop=True))
 
-@st.cache_data
-def load_sdgs():
-    path = "data/sdgs_national_zmb.csv"
-    if not os.path.exists(path):
-        st.error(f"CSV file not found: {path}")
-        st.stop()
-    return pd.read_csv(path)
+def ingest_csv_source(name, fingerprint):
+    """
+    Stream a CSV catalog source into the disk tier of parsed frames.
 
-@st.cache_data
-def load_tuberculosis():
-    path = "data/tuberculosis_indicators_zmb.csv"
-    if not os.path.exists(path):
-        st.error(f"CSV file not found: {path}")
-        st.stop()
-    return pd.read_csv(path)
+    When the tier holds an earlier version of the file, the new rows are
+    diffed against it on the schema's ``ROW_KEYS`` and the delta is logged
+    and recorded, so derived artifacts update only what it touches (see
+    utils/refresh.py).
 
-@st.cache_data
-def load_hiv_prevalence():
-    path = "data/hiv-prevalence_national_zmb.csv"
-    if not os.path.exists(path):
-        st.error(f"CSV file not found: {path}")
+    Returns:
+        dict: The ``stream_ingest`` report (rows, quarantined, rows/s...).
+    """
+    start = time.perf_counter()
+    spec = CATALOG[name]
+    previous = [fp for fp in cached_fingerprints(name) if fp != fingerprint]
+    old = read_cached_frame(name, previous[0]) if previous else None
+
+    columns = pd.read_csv(spec["path"], encoding=source_encoding(spec), nrows=0).columns
+    schema = catalog_schema(spec, columns)
+    report = stream_ingest(
+        name,
+        spec["path"],
+        schema,
+        lambda batches: write_cached_batches(name, fingerprint, schema, batches),
+        required=required_columns(spec),
+        encoding=source_encoding(spec),
+    )
+
+    mode, counts = "full", {"added": report["written"]}
+    if old is not None:
+        try:
+            delta = diff_rows(old, read_cached_frame(name, fingerprint), ROW_KEYS[spec["schema"]])
+        except (KeyError, ValueError):
+            # The key columns changed or repeat: derived artifacts are rebuilt
+            delta = None
+        if delta is not None:
+            record_delta(name, previous[0], fingerprint, delta)
+            mode, counts = "incremental", delta_counts(delta)
+    log_change(name, previous[0] if previous else None, fingerprint, mode, time.perf_counter() - start, counts)
+    return report
+
+def compact_frame(df):
+    """Downcast float columns the catalog dtypes left at float64 to FLOAT_DTYPE."""
+    wide = df.select_dtypes(include="float64").columns
+    if len(wide):
+        df[wide] = df[wide].astype(FLOAT_DTYPE)
+    return df
+
+def get_dataset(name, columns=None, filters=None):
+    """
+    Load a dataset registered in utils/catalog.py.
+
+    Args:
+        name (str): Catalog name, e.g. "immunization" or "worldbank".
+        columns (list): Columns to load. Defaults to all columns.
+        filters (dict): {column: value or list of values} row filters. The key
+            "year" refers to the dataset's year column.
+
+    Returns:
+        pd.DataFrame: A zero-copy read-only view of the requested slice (see
+        ``shared_view``). Slices are shared across sessions and keyed on the
+        source file's fingerprint, so a refreshed file is picked up on the
+        next call; they are evicted after an hour or when more than 32 are held.
+    """
+    if name not in CATALOG:
+        raise KeyError(f"Unknown dataset '{name}'. Registered: {', '.join(CATALOG)}")
+
+    spec = CATALOG[name]
+    if not os.path.exists(spec["path"]):
+        st.error(f"CSV file not found: {spec['path']}")
         st.stop()
-    return pd.read_csv(path)
+
+    normalized = []
+    for col, wanted in (filters or {}).items():
+        col = spec["year_col"] if col == "year" else col
+        values = tuple(wanted) if isinstance(wanted, (list, tuple, set)) else (wanted,)
+        normalized.append((col, values))
+
+    return shared_view(_load_dataset(
+        name,
+        file_fingerprint(spec["path"]),
+        None if columns is None else tuple(columns),
+        tuple(sorted(normalized)),
+    ))
+
+def load_cube(name, filters=None):
+    """
+    Dense indicator cube of a DHS dataset with its describe rollups (see
+    utils/cube.py), built once per version of the source file and filters
+    and shared across sessions. Its arrays are read-only.
+
+    Args:
+        name (str): DHS catalog name.
+        filters (dict): Row filters applied before the cube is built (as in
+            ``get_dataset``), e.g. ``{"CountryName": "Zambia"}``.
+    """
+    normalized = tuple(sorted(
+        (col, tuple(wanted) if isinstance(wanted, (list, tuple, set)) else (wanted,))
+        for col, wanted in (filters or {}).items()
+    ))
+    return _load_cube(name, file_fingerprint(CATALOG[name]["path"]), normalized)
+
+@st.cache_resource(ttl=3600, max_entries=32, show_spinner=False)
+def _load_cube(name, fingerprint, filters):
+    df = get_dataset(name, columns=CUBE_COLUMNS, filters={col: list(values) for col, values in filters} or None)
+
+    def update(previous, deltas):
+        # Only the (indicator, year) blocks holding changed rows are refilled
+        changed = delta_rows(deltas[name])
+        for col, values in filters:
+            changed = changed[changed[col].isin(values)]
+        return update_cube(previous, df, changed)
+
+    cube = incremental("cube", (name, filters), {name: fingerprint}, lambda: build_cube(df), update)
+    for arr in (*cube["measures"].values(), cube["by_indicator_year"], cube["by_year"], cube["by_indicator"]):
+        arr.flags.writeable = False
+    return cube
+
+def load_regions(name):
+    """
+    Areas of a DHS dataset (``Level``, ``Province`` pairs, see
+    utils/regions.py), listed from the store's partitions without reading rows.
+    """
+    return shared_view(_load_regions(name, file_fingerprint(CATALOG[name]["path"])))
+
+@st.cache_resource(ttl=3600, max_entries=32, show_spinner=False)
+def _load_regions(name, fingerprint):
+    return freeze_frame(store_regions(name))
+
+def load_region_rollups(name):
+    """
+    ``Value`` statistics over the provinces of the country and over the
+    districts of each province, per indicator and survey year (see
+    ``region_rollup``), built once per version of the source file from the
+    subnational partitions only.
+    """
+    return shared_view(_load_region_rollups(name, file_fingerprint(CATALOG[name]["path"])))
+
+@st.cache_resource(ttl=3600, max_entries=32, show_spinner=False)
+def _load_region_rollups(name, fingerprint):
+    levels = sorted(int(level) for level in load_regions(name)["Level"].unique() if level > 0)
+    if not levels:
+        return freeze_frame(region_rollup(pd.DataFrame(columns=[*ROLLUP_KEY, "Value"])))
+    df = get_dataset(name, columns=[*REGION_COLUMNS, "Indicator", "SurveyYear", "Value"], filters={"Level": levels})
+    return freeze_frame(region_rollup(df))
+
+DRILL_COLUMNS = [*REGION_COLUMNS, "CountryName", "CharacteristicLabel", "IsTotal", "Indicator", "SurveyYear", "Value", "CILow", "CIHigh"]
+
+def drill_down(name, indicator, province=None, years=None):
+    """
+    One step of the national -> province -> district drill-down of a DHS
+    dataset. Only the partitions of the two levels involved (and, below the
+    national level, of ``province``) are read.
+
+    Args:
+        name (str): DHS catalog name.
+        indicator (str): Indicator label.
+        province (str): Province to drill into, or None for the national level.
+        years (list): Survey years to keep. Defaults to all.
+
+    Returns:
+        dict: ``area`` (rows of the national level or of the province),
+        ``children`` (rows of its provinces or districts, with their name in
+        ``Area``) and ``rollup`` (statistics over the children per survey
+        year, from ``load_region_rollups``); shared read-only views.
+    """
+    level = 0 if province is None else 1
+    filters = {"Level": [level, level + 1], "Indicator": indicator}
+    if province is not None:
+        filters["Province"] = province
+    if years is not None:
+        filters["SurveyYear"] = list(years)
+    rows = get_dataset(name, columns=DRILL_COLUMNS, filters=filters)
+
+    children = rows[rows["Level"] == level + 1]
+    children = children.assign(Area=area_names(children["CharacteristicLabel"]))
+
+    rollup = load_region_rollups(name)
+    rollup = rollup[
+        (rollup["Level"] == level)
+        & (rollup["Province"] == (province or ""))
+        & (rollup["Indicator"] == indicator)
+        & (rollup["SurveyYear"].isin(years) if years is not None else True)
+    ]
+    return {
+        "area": rows[rows["Level"] == level],
+        "children": children,
+        "rollup": rollup.set_index("SurveyYear").drop(columns=["Level", "Province", "Indicator"]),
+    }
+
+def load_boundaries(level, areas=None):
+    """
+    Choropleth boundaries of the areas of an administrative level (see
+    utils/boundaries.py), at the level of detail for the zoom that fits them.
+
+    Args:
+        level (int): Administrative level, a key of ``BOUNDARY_LAYERS``.
+        areas (list): Area names to draw. Defaults to the whole layer.
+
+    Returns:
+        dict or None: ``geojson`` (features keyed by ``area_key``),
+        ``center``, ``zoom`` and ``lod``; None when the layer's boundary file
+        is not in ``data/boundaries/`` or holds none of ``areas``. Shared
+        between sessions: read it, do not modify it.
+    """
+    layer = BOUNDARY_LAYERS.get(level)
+    if layer is None or not os.path.exists(layer["path"]):
+        return None
+    keys = None if areas is None else tuple(sorted(area_key(areas).unique()))
+    return _load_boundaries(level, file_fingerprint(layer["path"]), keys)
+
+@st.cache_resource(ttl=3600, max_entries=64, show_spinner=False)
+def _load_boundaries(level, fingerprint, keys):
+    # Decoded and serialized once per set of areas on the map
+    levels = _load_boundary_levels(level, fingerprint)
+    view = boundary_view(levels, keys)
+    if view is None:
+        return None
+    return {"geojson": boundary_geojson(levels, view["lod"], keys), **view}
+
+@st.cache_resource(ttl=3600, max_entries=8, show_spinner=False)
+def _load_boundary_levels(level, fingerprint):
+    # Simplified once per version of the boundary file, then read back as WKB
+    key = f"boundaries-{level}"
+    levels = read_cached_frame(key, fingerprint)
+    if levels is None:
+        layer = BOUNDARY_LAYERS[level]
+        levels = build_boundary_levels(load_geojson(layer["path"]), layer["name"])
+        write_cached_frame(key, fingerprint, levels)
+    return freeze_frame(levels)
+
+def _catalog_fingerprints():
+    return tuple(file_fingerprint(spec["path"]) for spec in CATALOG.values())
+
+def load_query_engine():
+    """
+    The DuckDB engine over every catalog dataset (see utils/query_engine.py),
+    shared across sessions and reopened when any source file changes.
+    """
+    return _load_query_engine(_catalog_fingerprints())
+
+@st.cache_resource(ttl=3600, max_entries=2, show_spinner=False)
+def _load_query_engine(fingerprints):
+    return build_query_engine()
+
+def query_dataset(view, columns=None, where=None, ranges=None, group_by=None, aggregates=None, order_by=None, limit=None):
+    """
+    Filtered (aggregated) rows of one dataset, computed by the query engine
+    with column and filter pushdown (see ``run_query``) and cached per query.
+
+    e.g. ``query_dataset("dhs-mobile", where={"Indicator": name}, group_by=["SurveyYear"],
+    aggregates={"mean": ("mean", "Value")})``
+
+    Returns:
+        pd.DataFrame: A shared read-only view (see ``shared_view``).
+    """
+    return shared_view(_query_dataset(
+        _catalog_fingerprints(), view, columns, where, ranges, group_by, aggregates, order_by, limit,
+    ))
+
+@st.cache_resource(ttl=3600, max_entries=256, show_spinner=False)
+def _query_dataset(fingerprints, view, columns, where, ranges, group_by, aggregates, order_by, limit):
+    return freeze_frame(run_query(
+        _load_query_engine(fingerprints), view,
+        columns=columns, where=where, ranges=ranges, group_by=group_by,
+        aggregates=aggregates, order_by=order_by, limit=limit,
+    ))
+
+def _warehouse_names(names):
+    return tuple(names or [name for name, spec in CATALOG.items() if spec["schema"] in WAREHOUSE_LAYOUTS])
+
+def load_warehouse(names=None):
+    """
+    The long-format indicator warehouse (see utils/warehouse.py).
+
+    Args:
+        names (list): Catalog names. Defaults to every dataset whose schema
+            has an entry in ``WAREHOUSE_LAYOUTS``.
+
+    Returns:
+        pd.DataFrame: A shared read-only view (see ``shared_view``).
+    """
+    names = _warehouse_names(names)
+    return shared_view(_load_warehouse(names, tuple(file_fingerprint(CATALOG[name]["path"]) for name in names)))
+
+@st.cache_resource(ttl=3600, max_entries=16, show_spinner=False)
+def _load_warehouse(names, fingerprints):
+    # Each dataset is ingested and cached on its own fingerprint, so a
+    # refreshed file only re-ingests itself
+    return freeze_frame(build_warehouse(
+        [_ingest_dataset(name, fingerprint) for name, fingerprint in zip(names, fingerprints)]
+    ))
+
+@st.cache_resource(ttl=3600, max_entries=32, show_spinner=False)
+def _ingest_dataset(name, fingerprint):
+    return ingest(get_dataset(name), name, CATALOG[name]["schema"])
+
+def query_warehouse(names=None, **filters):
+    """
+    Rows of the warehouse matching ``filters`` (see ``query`` in
+    utils/warehouse.py), e.g. ``query_warehouse(dataset="malaria", year_range=(2010, None))``.
+    """
+    return query(load_warehouse(names), **filters)
+
+def load_trend_projections(names=None, horizon=TREND_HORIZON, level=TREND_LEVEL):
+    """
+    Linear projections with prediction intervals for every series of ``names``
+    (see ``project_series``), fitted in one batch and shared across sessions.
+    """
+    names = _warehouse_names(names)
+    fingerprints = tuple(file_fingerprint(CATALOG[name]["path"]) for name in names)
+    return shared_view(_load_trend_projections(names, fingerprints, horizon, level))
+
+def _schemas(names):
+    return {name: CATALOG[name]["schema"] for name in names}
+
+@st.cache_resource(ttl=3600, max_entries=16, show_spinner=False)
+def _load_trend_projections(names, fingerprints, horizon, level):
+    # Loading the warehouse first refreshes the changed sources and records their deltas
+    long = load_warehouse(names)
+    return freeze_frame(incremental(
+        "projections", (names, horizon, level), dict(zip(names, fingerprints)),
+        lambda: project_series(long, horizon=horizon, level=level),
+        lambda previous, deltas: update_projections(previous, long, deltas, _schemas(names), horizon=horizon, level=level),
+    ))
+
+def load_snapshot(names=None):
+    """
+    Latest observation, its year and the change since the previous one for
+    every indicator series (see ``snapshot_table``), built once per version
+    of the source files.
+
+    Returns:
+        pd.DataFrame: Indexed by (``dataset``, ``indicator_id``); a shared read-only view.
+    """
+    names = _warehouse_names(names)
+    return shared_view(_load_snapshot(names, tuple(file_fingerprint(CATALOG[name]["path"]) for name in names)))
+
+@st.cache_resource(ttl=3600, max_entries=16, show_spinner=False)
+def _load_snapshot(names, fingerprints):
+    long = load_warehouse(names)
+    return freeze_frame(incremental(
+        "snapshot", names, dict(zip(names, fingerprints)),
+        lambda: snapshot_table(long),
+        lambda previous, deltas: update_snapshot(previous, long, deltas, _schemas(names)),
+    ))
+
+def latest_observation(dataset, indicator_id):
+    """
+    Row of ``load_snapshot`` for one series, or None when it has no
+    observation (e.g. an indicator missing from the export).
+    """
+    snapshot = load_snapshot()
+    key = (dataset, indicator_id)
+    return snapshot.loc[key] if key in snapshot.index else None
+
+def load_target_progress():
+    """
+    Progress toward every NHSP target (see ``target_progress``), solved once
+    per version of the source files and shared across sessions.
+    """
+    names = tuple(target_datasets())
+    return shared_view(_load_target_progress(names, tuple(file_fingerprint(CATALOG[name]["path"]) for name in names)))
+
+@st.cache_resource(ttl=3600, max_entries=4, show_spinner=False)
+def _load_target_progress(names, fingerprints):
+    return freeze_frame(target_progress(load_warehouse(names), NHSP_TARGETS))
+
+def load_indicator_tracker():
+    """
+    Baseline, latest and target values of the NHSP key indicators, and their
+    observed history (see ``indicator_tracker``).
+
+    Returns:
+        tuple: ``(summary, history)`` shared read-only views, rebuilt only
+        when one of the source files changes.
+    """
+    names = tuple(target_datasets())
+    summary, history = _load_indicator_tracker(names, tuple(file_fingerprint(CATALOG[name]["path"]) for name in names))
+    return shared_view(summary), shared_view(history)
+
+@st.cache_resource(ttl=3600, max_entries=4, show_spinner=False)
+def _load_indicator_tracker(names, fingerprints):
+    summary, history = indicator_tracker(load_warehouse(names), NHSP_TARGETS)
+    return freeze_frame(summary), freeze_frame(history)
+
+def load_healthcare_access(columns=None):
+    return get_dataset("access-to-health-care", columns=columns)
+
+def load_covid_data(columns=None):
+    return get_dataset("covid-19-prevention", columns=columns)
+
+def load_dhs_data(columns=None):
+    return get_dataset("dhs-mobile", columns=columns)
+
+def load_immunization(columns=None):
+    return get_dataset("immunization", columns=columns)
+
+def load_malaria(columns=None):
+    return get_dataset("malaria", columns=columns)
+
+def load_acute(columns=None):
+    return get_dataset("acute", columns=columns)
+
+def load_health_insurance(columns=None):
+    return get_dataset("health-insurance", columns=columns)
+
+def load_sdgs(columns=None):
+    return get_dataset("sdgs", columns=columns)
+
+def load_tuberculosis(columns=None):
+    return get_dataset("tuberculosis", columns=columns)
+
+def load_hiv_prevalence(columns=None):
+    return get_dataset("hiv-prevalence", columns=columns)
@@ -0,0 +1,445 @@
+# utils/dhs_store.py
+"""
+Columnar store for the DHS STATcompiler exports.
+
+All DHS-schema CSVs under ``data/`` are compacted into one Parquet dataset
+partitioned by ``dataset``, administrative ``Level``, ``Province`` and
+``SurveyYear`` (rows sorted by ``Indicator`` inside each file), so loaders
+only read the partitions and columns a page needs instead of re-parsing the
+text files. ``Level`` and ``Province`` are derived from the region columns
+of each row (see utils/regions.py): national exports land in ``Level=0``,
+and a drill-down into one province reads only its own partitions.
+
+CSVs are streamed in bounded-memory chunks and validated against
+``DHS_SCHEMA`` on the way in (utils/streaming.py).
+
+A ``manifest.json`` next to the partitions records the fingerprint of the
+CSV each dataset was built from. A dataset whose source changed is
+refreshed on its next read (``refresh_dhs_store``): the new export is
+diffed against the stored rows on ``SurveyId`` + ``DataId`` and only the
+delta is applied, i.e. the files holding removed or changed rows are
+rewritten without them and added or changed rows land in new
+``<name>-delta-<fingerprint>-*`` files (see utils/refresh.py).
+
+Refreshes and builds hold an exclusive lock on the store (``store_lock``)
+and reads a shared one, so concurrent sessions neither apply the same delta
+twice nor scan a half-rewritten dataset. Build (or rebuild and compact) the
+whole store with::
+
+    python -m utils.dhs_store
+"""
+import json
+import os
+import shutil
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from utils.cache import file_fingerprint
+from utils.catalog import CATALOG, ROW_KEYS, datasets_with_schema
+from utils.refresh import delta_counts, delta_size, diff_rows, log_change, record_delta
+from utils.regions import REGION_COLUMNS, assign_regions
+from utils.streaming import required_columns, source_encoding, stream_ingest
+
+STORE_DIR = "data/store/dhs"
+
+# Dataset name -> source CSV (all share the 29-column DHS layout)
+DHS_DATASETS = {name: CATALOG[name]["path"] for name in datasets_with_schema("dhs")}
+
+_TEXT = pa.dictionary(pa.int32(), pa.string())
+
+# Compact Arrow schema of the stored rows: dictionary-encoded text (pandas
+# categoricals), int16 years, float32 values/CIs and boolean flags.
+DHS_SCHEMA = pa.schema([
+    ("ISO3", _TEXT),
+    ("DataId", pa.int32()),
+    ("Indicator", _TEXT),
+    ("Value", pa.float32()),
+    ("Precision", pa.int8()),
+    ("DHS_CountryCode", _TEXT),
+    ("CountryName", _TEXT),
+    ("SurveyYear", pa.int16()),
+    ("SurveyId", _TEXT),
+    ("IndicatorId", _TEXT),
+    ("IndicatorOrder", pa.int32()),
+    ("IndicatorType", _TEXT),
+    ("CharacteristicId", pa.int32()),
+    ("CharacteristicOrder", pa.int32()),
+    ("CharacteristicCategory", _TEXT),
+    ("CharacteristicLabel", _TEXT),
+    ("ByVariableId", pa.int32()),
+    ("ByVariableLabel", _TEXT),
+    ("IsTotal", pa.bool_()),
+    ("IsPreferred", pa.bool_()),
+    ("SDRID", _TEXT),
+    ("RegionId", _TEXT),
+    ("SurveyYearLabel", _TEXT),
+    ("SurveyType", _TEXT),
+    ("DenominatorWeighted", pa.float32()),
+    ("DenominatorUnweighted", pa.float32()),
+    ("CILow", pa.float32()),
+    ("CIHigh", pa.float32()),
+    ("LevelRank", pa.float32()),
+])
+
+# Stored rows: the DHS columns plus the administrative level and province
+STORE_SCHEMA = DHS_SCHEMA.append(pa.field("Level", pa.int8())).append(pa.field("Province", pa.string()))
+
+# Partitioning inside one ``dataset=<name>`` directory
+STORE_PARTITIONING = ds.partitioning(
+    pa.schema([("Level", pa.int8()), ("Province", pa.string()), ("SurveyYear", pa.int16())]),
+    flavor="hive",
+)
+
+# Bump when the directory layout changes, so datasets stored under an older
+# one are rebuilt instead of refreshed in place
+STORE_LAYOUT = 2
+
+
+@contextmanager
+def store_lock(store_dir=STORE_DIR, shared=False):
+    """
+    Hold a lock on the store, across threads and processes: shared for
+    reads, exclusive for builds and refreshes. Not reentrant.
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    with open(os.path.join(store_dir, ".lock"), "a+") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        else:
+            # No shared locks on Windows: readers take turns too
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _tmp_path(path):
+    # A leading "." keeps scanners (pyarrow datasets, DuckDB globs) off partial files
+    directory, base = os.path.split(path)
+    return os.path.join(directory, f".{base}.{os.getpid()}.tmp")
+
+
+def _read_manifest(store_dir):
+    try:
+        with open(os.path.join(store_dir, "manifest.json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _built_fingerprint(manifest, name):
+    """Fingerprint of the source a dataset was stored from, None if not stored under ``STORE_LAYOUT``."""
+    entry = manifest.get(name)
+    if isinstance(entry, dict) and entry.get("layout") == STORE_LAYOUT:
+        return entry["fingerprint"]
+    return None
+
+
+def _write_manifest(store_dir, manifest):
+    path = os.path.join(store_dir, "manifest.json")
+    tmp_path = _tmp_path(path)
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def stale_datasets(datasets=None, store_dir=STORE_DIR):
+    """Datasets whose source CSV changed (or was never built) since the last build."""
+    manifest = _read_manifest(store_dir)
+    names = list(DHS_DATASETS) if datasets is None else list(datasets)
+    return [
+        name for name in names
+        if _built_fingerprint(manifest, name) != file_fingerprint(DHS_DATASETS[name])
+        or not os.path.isdir(os.path.join(store_dir, f"dataset={name}"))
+    ]
+
+
+def with_regions(batches):
+    """
+    Add the ``Level`` and ``Province`` columns (``assign_regions``) to a
+    stream of ``DHS_SCHEMA`` record batches in export order.
+    """
+    provinces = {}
+    for batch in batches:
+        level, province = assign_regions(batch.to_pandas(), provinces)
+        yield pa.RecordBatch.from_arrays(
+            [*batch.columns, pa.array(level.to_numpy(), pa.int8()), pa.array(province.to_numpy(), pa.string())],
+            schema=STORE_SCHEMA,
+        )
+
+
+def _ingest_dhs(name, write):
+    return stream_ingest(
+        name,
+        DHS_DATASETS[name],
+        DHS_SCHEMA,
+        lambda batches: write(with_regions(batches)),
+        required=required_columns(CATALOG[name]),
+        encoding=source_encoding(CATALOG[name]),
+        sort_by=["SurveyYear", "Indicator"],
+    )
+
+
+def build_dhs_store(datasets=None, store_dir=STORE_DIR):
+    """
+    Compact DHS CSVs into the partitioned Parquet store.
+
+    Each CSV is streamed in chunks (see utils/streaming.py): HXL tag rows
+    are dropped and rows that fail validation are quarantined.
+
+    Args:
+        datasets (list): Dataset names to (re)build. Defaults to all of ``DHS_DATASETS``.
+        store_dir (str): Root directory of the store.
+
+    Returns:
+        dict: The ``stream_ingest`` report of each dataset (rows written,
+        quarantined, rows/s...).
+    """
+    with store_lock(store_dir):
+        return _build_datasets(datasets, store_dir)
+
+
+def _build_datasets(datasets, store_dir):
+    # Callers hold the store lock
+    names = list(DHS_DATASETS) if datasets is None else list(datasets)
+    reports = {}
+    fingerprints = {}
+    for name in names:
+        fingerprints[name] = file_fingerprint(DHS_DATASETS[name])
+        dataset_dir = os.path.join(store_dir, f"dataset={name}")
+
+        # Replace the whole dataset so partitions for dropped survey years go too
+        shutil.rmtree(dataset_dir, ignore_errors=True)
+
+        def write(batches, dataset_dir=dataset_dir, name=name):
+            ds.write_dataset(
+                batches,
+                dataset_dir,
+                schema=STORE_SCHEMA,
+                format="parquet",
+                partitioning=STORE_PARTITIONING,
+                basename_template=f"{name}-{{i}}.parquet",
+                existing_data_behavior="overwrite_or_ignore",
+            )
+
+        reports[name] = _ingest_dhs(name, write)
+
+    manifest = _read_manifest(store_dir)
+    manifest.update({name: {"fingerprint": fp, "layout": STORE_LAYOUT} for name, fp in fingerprints.items()})
+    _write_manifest(store_dir, manifest)
+    return reports
+
+
+def _open_dataset(dataset_dir):
+    return ds.dataset(dataset_dir, schema=STORE_SCHEMA, format="parquet", partitioning=STORE_PARTITIONING)
+
+
+def read_export(name):
+    """
+    Stream a DHS CSV through validation into memory (as ``build_dhs_store``
+    would store it), for diffing against the stored version.
+
+    Returns:
+        tuple: ``(frame, report)``.
+    """
+    batches = []
+    report = _ingest_dhs(name, batches.extend)
+    return pa.Table.from_batches(batches, schema=STORE_SCHEMA).to_pandas(), report
+
+
+def apply_delta(name, delta, fingerprint, store_dir=STORE_DIR):
+    """
+    Upsert a delta (see ``diff_rows``) into one stored dataset. The caller
+    holds the store lock.
+
+    Files of the survey years holding removed or changed rows are rewritten
+    without them (only those years' partitions are scanned); added and
+    changed rows are written as new ``<name>-delta-<fingerprint>-*`` files,
+    named after the source ``fingerprint`` the delta leads to so applying
+    it again overwrites them instead of adding the rows twice.
+
+    Returns:
+        int: Files rewritten.
+    """
+    dataset_dir = os.path.join(store_dir, f"dataset={name}")
+    key = ROW_KEYS["dhs"]
+    dropped = pd.concat([delta["removed"], delta["changed_old"]])
+    rewritten = 0
+    if len(dropped):
+        dropped_keys = pd.MultiIndex.from_frame(dropped[key].astype(str))
+        years = ds.field("SurveyYear").isin(sorted(dropped["SurveyYear"].unique().tolist()))
+        for fragment in _open_dataset(dataset_dir).get_fragments(filter=years):
+            table = fragment.to_table(schema=fragment.physical_schema)
+            stored_keys = pd.MultiIndex.from_frame(table.select(key).to_pandas().astype(str))
+            drop = stored_keys.isin(dropped_keys)
+            if not drop.any():
+                continue
+            rewritten += 1
+            if drop.all():
+                os.remove(fragment.path)
+                continue
+            tmp_path = _tmp_path(fragment.path)
+            pq.write_table(table.filter(pa.array(~drop)), tmp_path)
+            os.replace(tmp_path, fragment.path)
+
+    upserted = pd.concat([delta["added"], delta["changed_new"]])
+    if len(upserted):
+        upserted = upserted.sort_values(["SurveyYear", "Indicator"], kind="stable")
+        ds.write_dataset(
+            pa.Table.from_pandas(upserted, schema=STORE_SCHEMA, preserve_index=False),
+            dataset_dir,
+            format="parquet",
+            partitioning=STORE_PARTITIONING,
+            basename_template=f"{name}-delta-{fingerprint}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+    return rewritten
+
+
+def refresh_dhs_store(datasets=None, store_dir=STORE_DIR):
+    """
+    Bring stale datasets of the store up to date with their source CSVs.
+
+    A dataset already in the store is refreshed incrementally: the new
+    export is diffed against the stored rows on ``ROW_KEYS["dhs"]`` and only
+    the delta is applied (``apply_delta``); the delta is recorded for the
+    derived artifacts (utils/refresh.py). A dataset never built, or whose
+    export repeats a row key, is built in full. Every refresh is appended
+    to the change log.
+
+    Staleness is checked again once the store lock is held, so of several
+    sessions finding the same dataset stale only the first refreshes it.
+
+    Args:
+        datasets (list): Dataset names to check. Defaults to all of ``DHS_DATASETS``.
+        store_dir (str): Root directory of the store.
+
+    Returns:
+        dict: The change-log entry of each refreshed dataset.
+    """
+    with store_lock(store_dir):
+        return _refresh_datasets(stale_datasets(datasets, store_dir=store_dir), store_dir)
+
+
+def _refresh_datasets(names, store_dir):
+    manifest = _read_manifest(store_dir)
+    entries = {}
+    for name in names:
+        start = time.perf_counter()
+        old_fingerprint, new_fingerprint = _built_fingerprint(manifest, name), file_fingerprint(DHS_DATASETS[name])
+        dataset_dir = os.path.join(store_dir, f"dataset={name}")
+
+        delta = None
+        if old_fingerprint is not None and os.path.isdir(dataset_dir):
+            old = _open_dataset(dataset_dir).to_table().to_pandas()
+            new, _ = read_export(name)
+            try:
+                delta = diff_rows(old, new, ROW_KEYS["dhs"])
+            except ValueError:
+                delta = None
+
+        if delta is None:
+            report = _build_datasets([name], store_dir)[name]
+            mode, counts = "full", {"added": report["written"]}
+        else:
+            if delta_size(delta):
+                apply_delta(name, delta, new_fingerprint, store_dir=store_dir)
+            manifest = _read_manifest(store_dir)
+            manifest[name] = {"fingerprint": new_fingerprint, "layout": STORE_LAYOUT}
+            _write_manifest(store_dir, manifest)
+            record_delta(name, old_fingerprint, new_fingerprint, delta)
+            mode, counts = "incremental", delta_counts(delta)
+        entries[name] = log_change(name, old_fingerprint, new_fingerprint, mode, time.perf_counter() - start, counts)
+    return entries
+
+
+def scan_dataset(dataset_dir, columns=None, filters=None):
+    """
+    Rows of one stored dataset directory, pruning partitions and columns.
+
+    Args:
+        dataset_dir (str): A ``dataset=<name>`` directory of the store.
+        columns (list): Columns to return. Defaults to the full DHS layout.
+        filters (dict): ``{column: value or list of values}`` row filters, pushed
+            down to the scanner (``Level``, ``Province`` and ``SurveyYear``
+            prune whole partitions).
+
+    Returns:
+        pd.DataFrame: Matching rows with text columns as categoricals.
+    """
+    # The level, province and year partitions and the Indicator row-group
+    # statistics prune what is read
+    store = _open_dataset(dataset_dir)
+
+    flt = None
+    for col, wanted in (filters or {}).items():
+        values = list(wanted) if isinstance(wanted, (list, tuple, set)) else [wanted]
+        term = ds.field(col).isin(values)
+        flt = term if flt is None else flt & term
+
+    columns = DHS_SCHEMA.names if columns is None else list(columns)
+    return store.to_table(columns=columns, filter=flt).to_pandas()
+
+
+def read_dhs(dataset, columns=None, filters=None, store_dir=STORE_DIR):
+    """
+    Read one DHS dataset from the store (see ``scan_dataset``), refreshing
+    it first when its source CSV changed.
+
+    Args:
+        dataset (str): Name from ``DHS_DATASETS``.
+        columns (list): Columns to return. Defaults to the full DHS layout.
+        filters (dict): ``{column: value or list of values}`` row filters.
+        store_dir (str): Root directory of the store.
+
+    Returns:
+        pd.DataFrame: Matching rows with text columns as categoricals.
+    """
+    if stale_datasets([dataset], store_dir=store_dir):
+        refresh_dhs_store([dataset], store_dir=store_dir)
+    with store_lock(store_dir, shared=True):
+        return scan_dataset(os.path.join(store_dir, f"dataset={dataset}"), columns=columns, filters=filters)
+
+
+def store_regions(dataset, store_dir=STORE_DIR):
+    """
+    Areas stored for one DHS dataset, read from the partition directories
+    alone (no rows are scanned).
+
+    Returns:
+        pd.DataFrame: Unique ``Level``, ``Province`` pairs, sorted.
+    """
+    if stale_datasets([dataset], store_dir=store_dir):
+        refresh_dhs_store([dataset], store_dir=store_dir)
+    with store_lock(store_dir, shared=True):
+        keys = [
+            ds.get_partition_keys(fragment.partition_expression)
+            for fragment in _open_dataset(os.path.join(store_dir, f"dataset={dataset}")).get_fragments()
+        ]
+    regions = pd.DataFrame(keys, columns=[*REGION_COLUMNS, "SurveyYear"])[REGION_COLUMNS]
+    return regions.drop_duplicates().sort_values(REGION_COLUMNS, ignore_index=True)
+
+
+if __name__ == "__main__":
+    for name, report in build_dhs_store().items():
+        print(
+            f"{name:28s} {report['written']:8d} rows  {report['quarantined']:5d} quarantined"
+            f"  {report['hxl']:2d} HXL  {report['rows_per_s']:10,.0f} rows/s"
+        )
@@ -0,0 +1,231 @@
+# utils/facilities.py
+"""
+Compact, indexed store of health facility points.
+
+The GeoJSON is parsed once with the standard library (no GDAL/GeoPandas on
+the request path) into NumPy coordinate arrays and categorical attributes.
+Two indexes answer spatial queries without scanning every point:
+
+- a KD-tree over unit-sphere vectors for exact great-circle radius and
+  k-nearest queries
+- the points sorted by longitude, so a bounding box is a ``searchsorted``
+  window plus a latitude mask over that window only
+
+For maps, a clustering pyramid is precomputed: at every zoom level up to
+``CLUSTER_MAX_ZOOM`` the points are binned on a Web-Mercator pixel grid and
+each occupied cell becomes one aggregated marker. Beyond that zoom the
+individual facilities are sent.
+"""
+import json
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+FACILITIES_PATH = "data/zambia_health_facilities.geojson"
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Zambia's extent as (south, west, north, east)
+ZAMBIA_BBOX = (-18.1, 21.9, -8.2, 33.8)
+
+# Zoom levels up to this one are served as clusters, deeper ones as points
+CLUSTER_MAX_ZOOM = 12
+# Side of a clustering cell in screen pixels (256 px Web-Mercator tiles)
+CLUSTER_CELL_PX = 40
+
+# GeoJSON property -> store column
+FACILITY_ATTRIBUTES = {
+    "amenity": "amenity",
+    "healthcare": "healthcare",
+    "operator:type": "operator_type",
+}
+
+
+def to_unit_vectors(lat, lon):
+    """Convert degree coordinates to 3D unit vectors (rows of x, y, z)."""
+    lat = np.radians(np.asarray(lat, dtype=np.float64))
+    lon = np.radians(np.asarray(lon, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+
+
+def chord_to_km(chord):
+    """Great-circle distance (km) for a straight-line distance between unit vectors."""
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(np.asarray(chord) / 2, 0, 1))
+
+
+def km_to_chord(km):
+    """Straight-line distance between unit vectors for a great-circle distance (km)."""
+    return 2 * np.sin(np.asarray(km) / (2 * EARTH_RADIUS_KM))
+
+
+def read_facility_points(path=FACILITIES_PATH):
+    """
+    Parse facility points from a GeoJSON FeatureCollection.
+
+    Returns:
+        pd.DataFrame: lat, lon, name, amenity, healthcare, operator_type, osm_id.
+    """
+    with open(path, encoding="utf-8") as f:
+        features = json.load(f)["features"]
+
+    features = [
+        feat for feat in features
+        if feat.get("geometry") and feat["geometry"].get("type") == "Point"
+    ]
+    coords = np.array([feat["geometry"]["coordinates"][:2] for feat in features], dtype=np.float64)
+    coords = coords.reshape(-1, 2)
+    props = [feat.get("properties") or {} for feat in features]
+
+    names = pd.Series([p.get("name") for p in props], dtype=object)
+    names = names.fillna(pd.Series([p.get("name:en") for p in props], dtype=object))
+
+    points = pd.DataFrame({
+        "lat": coords[:, 1],
+        "lon": coords[:, 0],
+        "name": names.fillna("Unknown Facility").astype(str),
+    })
+    for prop, col in FACILITY_ATTRIBUTES.items():
+        points[col] = pd.Series([p.get(prop) for p in props], dtype=object).astype("category")
+    points["osm_id"] = pd.Series([p.get("osm_id") for p in props], dtype="Int64")
+    return points
+
+
+def to_mercator(lat, lon):
+    """Normalized Web-Mercator coordinates in [0, 1) (x east, y south)."""
+    lat = np.clip(np.asarray(lat, dtype=np.float64), -85.05112878, 85.05112878)
+    x = (np.asarray(lon, dtype=np.float64) + 180.0) / 360.0
+    sin_lat = np.sin(np.radians(lat))
+    y = 0.5 - np.log((1 + sin_lat) / (1 - sin_lat)) / (4 * np.pi)
+    return np.clip(x, 0, 1 - 1e-12), np.clip(y, 0, 1 - 1e-12)
+
+
+def build_cluster_pyramid(points, max_zoom=CLUSTER_MAX_ZOOM, cell_px=CLUSTER_CELL_PX):
+    """
+    Aggregate facilities on a pixel grid for every zoom level.
+
+    Args:
+        points (pd.DataFrame): Facility points with lat, lon and name.
+        max_zoom (int): Deepest zoom level to cluster.
+        cell_px (int): Cell size in screen pixels.
+
+    Returns:
+        dict: zoom -> pd.DataFrame of markers (lat, lon, count, label), where
+        lat/lon is the centroid of the facilities in the cell.
+    """
+    lat = points["lat"].to_numpy()
+    lon = points["lon"].to_numpy()
+    names = points["name"].to_numpy(dtype=object)
+    x, y = to_mercator(lat, lon)
+
+    pyramid = {}
+    for zoom in range(max_zoom + 1):
+        cells_per_side = (256 * 2 ** zoom) // cell_px
+        cell = np.floor(x * cells_per_side).astype(np.int64) * cells_per_side + np.floor(y * cells_per_side).astype(np.int64)
+        _, first, inverse, counts = np.unique(cell, return_index=True, return_inverse=True, return_counts=True)
+
+        label = np.char.add(counts.astype(str), " facilities").astype(object)
+        single = counts == 1
+        label[single] = names[first[single]]
+
+        # Coordinates rounded to ~1 m keep the serialized figure short
+        pyramid[zoom] = pd.DataFrame({
+            "lat": np.round(np.bincount(inverse, weights=lat) / counts, 5),
+            "lon": np.round(np.bincount(inverse, weights=lon) / counts, 5),
+            "count": counts.astype(np.int32),
+            "label": label,
+        })
+    return pyramid
+
+
+def build_facility_store(points):
+    """
+    Index facility points for spatial queries.
+
+    Args:
+        points (pd.DataFrame): Output of ``read_facility_points``.
+
+    Returns:
+        dict: ``points`` (sorted by longitude), ``lon_sorted`` (their longitudes),
+        ``tree`` (KD-tree over unit vectors, in the same row order) and
+        ``clusters`` (see ``build_cluster_pyramid``).
+    """
+    points = points.sort_values("lon", kind="stable").reset_index(drop=True)
+    lon = points["lon"].to_numpy()
+    return {
+        "points": points,
+        "lon_sorted": lon,
+        "tree": cKDTree(to_unit_vectors(points["lat"].to_numpy(), lon)),
+        "clusters": build_cluster_pyramid(points),
+    }
+
+
+def facility_markers(store, zoom, bbox=None):
+    """
+    Map markers for a zoom level: precomputed clusters up to
+    ``CLUSTER_MAX_ZOOM``, individual facilities beyond it.
+
+    Args:
+        store (dict): Output of ``build_facility_store``.
+        zoom (int or float): Map zoom level.
+        bbox (tuple): Optional (south, west, north, east) to keep only markers in view.
+
+    Returns:
+        pd.DataFrame: lat, lon, count, label.
+    """
+    zoom = int(np.floor(zoom))
+    if zoom > CLUSTER_MAX_ZOOM:
+        points = store["points"] if bbox is None else facilities_in_bbox(store, *bbox)
+        return pd.DataFrame({
+            "lat": np.round(points["lat"].to_numpy(), 5),
+            "lon": np.round(points["lon"].to_numpy(), 5),
+            "count": np.ones(len(points), dtype=np.int32),
+            "label": points["name"].to_numpy(dtype=object),
+        })
+
+    markers = store["clusters"][max(zoom, 0)]
+    if bbox is not None:
+        south, west, north, east = bbox
+        lat = markers["lat"].to_numpy()
+        lon = markers["lon"].to_numpy()
+        markers = markers[(lat >= south) & (lat <= north) & (lon >= west) & (lon <= east)]
+    return markers
+
+
+def facilities_in_bbox(store, south, west, north, east):
+    """Facilities inside a lat/lon bounding box (no antimeridian wrap)."""
+    lo = np.searchsorted(store["lon_sorted"], west, side="left")
+    hi = np.searchsorted(store["lon_sorted"], east, side="right")
+    window = store["points"].iloc[lo:hi]
+    lat = window["lat"].to_numpy()
+    return window[(lat >= south) & (lat <= north)]
+
+
+def facilities_within(store, lat, lon, radius_km):
+    """
+    Facilities within ``radius_km`` of a point, nearest first.
+
+    Returns:
+        pd.DataFrame: Matching facilities with a ``distance_km`` column.
+    """
+    center = to_unit_vectors([lat], [lon])[0]
+    idx = np.asarray(store["tree"].query_ball_point(center, km_to_chord(radius_km)), dtype=np.intp)
+    if idx.size == 0:
+        return store["points"].iloc[[]].assign(distance_km=np.empty(0))
+    dist = chord_to_km(np.linalg.norm(store["tree"].data[idx] - center, axis=1))
+    order = np.argsort(dist)
+    return store["points"].iloc[idx[order]].assign(distance_km=dist[order])
+
+
+def nearest_facilities(store, lat, lon, k=5):
+    """
+    The ``k`` facilities closest to a point.
+
+    Returns:
+        pd.DataFrame: Facilities with a ``distance_km`` column, nearest first.
+    """
+    k = min(k, len(store["points"]))
+    dist, idx = store["tree"].query(to_unit_vectors([lat], [lon])[0], k=k)
+    idx, dist = np.atleast_1d(idx), np.atleast_1d(dist)
+    return store["points"].iloc[idx].assign(distance_km=chord_to_km(dist))
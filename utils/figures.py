@@ -0,0 +1,157 @@
+# utils/figures.py
+"""
+Lean Plotly figures and payload instrumentation.
+
+Streamlit serializes every figure to JSON and ships it to the browser on
+each rerun, so bytes in a figure are bytes on the wire. Pages build their
+figures from ``plot_frame`` (only the plotted columns, short numbers) and
+render them through ``plotly_chart``, which slims the figure and logs its
+serialized size.
+
+Sizes are logged at DEBUG level on the ``utils.figures`` logger, e.g.::
+
+    streamlit run zhai.py --logger.level=debug
+
+``python -m benchmarks.figure_payload`` reports the totals per page.
+"""
+import logging
+
+import numpy as np
+import pandas as pd
+import plotly.io as pio
+import streamlit as st
+from streamlit.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Significant digits kept for plotted numbers (survey values carry 1-2
+# decimals, coordinates ~1 m at 7 digits)
+PLOT_DIGITS = 7
+
+# Trace properties holding data arrays
+_ARRAY_PROPS = ("x", "y", "z", "lat", "lon", "customdata")
+_MARKER_ARRAY_PROPS = ("size", "color")
+
+
+def round_significant(values, digits=PLOT_DIGITS):
+    """
+    Round floats to ``digits`` significant digits as float64.
+
+    Rounded values serialize to their short decimal form (``12.3`` instead
+    of the ``12.300000190734863`` a float32 value prints as).
+    """
+    values = np.array(values, dtype=np.float64)
+    nonzero = np.isfinite(values) & (values != 0)
+    if not nonzero.any():
+        return values
+
+    v = values[nonzero]
+    decimals = digits - 1 - np.floor(np.log10(np.abs(v))).astype(np.int64)
+    # Scale by exact powers of ten in whichever direction keeps them integral
+    up = decimals >= 0
+    out = np.empty_like(v)
+    out[up] = np.round(v[up] * 10.0 ** decimals[up]) / 10.0 ** decimals[up]
+    out[~up] = np.round(v[~up] / 10.0 ** -decimals[~up]) * 10.0 ** -decimals[~up]
+    values[nonzero] = out
+    return values
+
+
+def plot_frame(df, columns, digits=PLOT_DIGITS):
+    """
+    Minimal frame to build a figure from.
+
+    Keeps only ``columns`` (``None`` entries and duplicates are ignored),
+    rounds float columns to ``digits`` significant digits and drops unused
+    categories, so nothing the chart does not show reaches the figure.
+
+    Args:
+        df (pd.DataFrame): Source frame.
+        columns (list): Columns referenced by the figure (x, y, color, hover...).
+        digits (int): Significant digits kept for float columns.
+
+    Returns:
+        pd.DataFrame: A new frame; ``df`` is not modified.
+    """
+    columns = list(dict.fromkeys(col for col in columns if col is not None))
+    out = df[columns]
+    updates = {}
+    for col in columns:
+        dtype = out[col].dtype
+        if pd.api.types.is_float_dtype(dtype):
+            updates[col] = round_significant(out[col].to_numpy(dtype=np.float64, na_value=np.nan), digits)
+        elif isinstance(dtype, pd.CategoricalDtype):
+            updates[col] = out[col].cat.remove_unused_categories()
+    return out.assign(**updates) if updates else out.copy(deep=False)
+
+
+def _slim_array(values, digits):
+    if values is None or isinstance(values, (str, dict)):
+        return None
+    arr = np.asarray(values)
+    if arr.dtype.kind == "f" and arr.size:
+        return round_significant(arr, digits)
+    return None
+
+
+def slim_figure(fig, digits=PLOT_DIGITS):
+    """
+    Trim a figure before it is serialized, in place.
+
+    - float data arrays are rounded to ``digits`` significant digits
+    - ``customdata`` no hover template refers to is dropped
+    - per-trace-type defaults of the layout template are kept only for the
+      trace types present in the figure
+
+    Returns:
+        The same figure, for chaining.
+    """
+    for trace in fig.data:
+        if "customdata" in trace and trace.customdata is not None:
+            template = trace.hovertemplate if "hovertemplate" in trace else None
+            if not template or "customdata" not in str(template):
+                trace.customdata = None
+
+        for prop in _ARRAY_PROPS:
+            if prop in trace:
+                slim = _slim_array(trace[prop], digits)
+                if slim is not None:
+                    trace[prop] = slim
+        if "marker" in trace:
+            for prop in _MARKER_ARRAY_PROPS:
+                if prop not in trace.marker:
+                    continue
+                slim = _slim_array(trace.marker[prop], digits)
+                if slim is not None:
+                    trace.marker[prop] = slim
+
+    template = fig.layout.template
+    if template is not None and template.data is not None:
+        used = {trace.type for trace in fig.data}
+        fig.layout.template.data = {
+            trace_type: getattr(template.data, trace_type)
+            for trace_type in used
+            if getattr(template.data, trace_type, None)
+        }
+    return fig
+
+
+def figure_payload_bytes(fig):
+    """Size of the JSON Streamlit sends for a figure."""
+    return len(pio.to_json(fig, validate=False).encode("utf-8"))
+
+
+def plotly_chart(fig, slim=True, **kwargs):
+    """
+    ``st.plotly_chart`` that slims the figure and logs its payload size.
+
+    Args:
+        fig (plotly.graph_objects.Figure): Figure to render.
+        slim (bool): Apply ``slim_figure`` first.
+        **kwargs: Passed through to ``st.plotly_chart``.
+    """
+    if slim:
+        slim_figure(fig)
+    if logger.isEnabledFor(logging.DEBUG):
+        title = fig.layout.title.text if fig.layout.title else None
+        logger.debug("plotly_chart %r: %d bytes, %d traces", title, figure_payload_bytes(fig), len(fig.data))
+    return st.plotly_chart(fig, **kwargs)
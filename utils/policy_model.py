@@ -0,0 +1,274 @@
+# utils/policy_model.py
+"""
+Weighted policy impact model behind pages/4_Policy_Simulation.py.
+
+Every lever contributes ``weight * (value - reference) / scale`` years of
+life expectancy and deaths per 1,000 of under-5 mortality. All functions
+take NumPy arrays as well as scalars, so whole batches of scenarios are
+evaluated in one broadcast pass:
+
+- ``simulate_policy_impact``: the page's single scenario (or any broadcastable batch)
+- ``policy_sweep``: every combination of per-lever grids, in chunks, reduced
+  to the response surface the page plots
+- ``tornado_swings``: one-at-a-time sensitivity around a scenario
+- ``project_trajectory``: the yearly path to a projected outcome
+"""
+import numpy as np
+
+# Levers of the model, in sweep axis order
+LEVERS = (
+    "budget_million",
+    "staff_increase_pct",
+    "vacc_coverage_pct",
+    "hiv_art_pct",
+    "malaria_coverage_pct",
+    "tb_treatment_pct",
+)
+
+LEVER_LABELS = {
+    "budget_million": "Health budget (M ZMW)",
+    "staff_increase_pct": "Staff increase (%)",
+    "vacc_coverage_pct": "Vaccination coverage (%)",
+    "hiv_art_pct": "HIV ART coverage (%)",
+    "malaria_coverage_pct": "Malaria prevention coverage (%)",
+    "tb_treatment_pct": "TB treatment success (%)",
+}
+
+# Slider ranges on the policy page
+LEVER_RANGES = {
+    "budget_million": (500, 5000),
+    "staff_increase_pct": (0, 50),
+    "vacc_coverage_pct": (50, 100),
+    "hiv_art_pct": (40, 100),
+    "malaria_coverage_pct": (40, 100),
+    "tb_treatment_pct": (50, 100),
+}
+
+# lever -> (reference, scale): a lever contributes weight * (value - reference) / scale
+LEVER_SCALING = {
+    "budget_million": (0, 5000),
+    "staff_increase_pct": (0, 50),
+    "vacc_coverage_pct": (80, 20),
+    "hiv_art_pct": (70, 1),
+    "malaria_coverage_pct": (70, 1),
+    "tb_treatment_pct": (80, 1),
+}
+
+# Years of life expectancy gained per unit of scaled lever
+LIFE_EXP_WEIGHTS = {
+    "budget_million": 2.0,
+    "staff_increase_pct": 1.5,
+    "vacc_coverage_pct": 1.0,
+    "hiv_art_pct": 0.05,
+    "malaria_coverage_pct": 0.05,
+    "tb_treatment_pct": 0.05,
+}
+
+# Under-5 deaths per 1,000 live births averted per unit of scaled lever
+MORTALITY_WEIGHTS = {
+    "budget_million": 1.0,
+    "staff_increase_pct": 1.2,
+    "vacc_coverage_pct": 0.8,
+    "hiv_art_pct": 0.04,
+    "malaria_coverage_pct": 0.04,
+    "tb_treatment_pct": 0.04,
+}
+
+# Years covered by the projection chart
+PROJECTION_YEARS = 10
+
+# Scenarios evaluated per chunk of a sweep (float32, ~8 MB per outcome)
+SWEEP_CHUNK_SIZE = 2_000_000
+
+
+def _scaled(lever, value):
+    reference, scale = LEVER_SCALING[lever]
+    return (np.asarray(value, dtype=np.float64) - reference) / scale
+
+
+def scaled_levers(scenario):
+    """Scaled lever values ``(value - reference) / scale`` of a scenario, in ``LEVERS`` order."""
+    return np.array([float(_scaled(name, scenario[name])) for name in LEVERS])
+
+
+def simulate_policy_impact(
+    budget_million,
+    hospital_pct,
+    staff_increase_pct,
+    vacc_coverage_pct,
+    hiv_art_pct,
+    malaria_coverage_pct,
+    tb_treatment_pct,
+    base_life_exp,
+    base_u5_mortality,
+):
+    """
+    Simple weighted model to simulate policy impact on life expectancy and under-5 mortality.
+
+    Arguments may be scalars or arrays that broadcast against each other;
+    ``hospital_pct`` does not enter the model.
+
+    Returns:
+        tuple: projected life expectancy, projected under-5 mortality,
+        life expectancy gain, mortality drop.
+    """
+    levers = {
+        "budget_million": budget_million,
+        "staff_increase_pct": staff_increase_pct,
+        "vacc_coverage_pct": vacc_coverage_pct,
+        "hiv_art_pct": hiv_art_pct,
+        "malaria_coverage_pct": malaria_coverage_pct,
+        "tb_treatment_pct": tb_treatment_pct,
+    }
+    life_exp_gain = sum(LIFE_EXP_WEIGHTS[name] * _scaled(name, value) for name, value in levers.items())
+    mortality_drop = sum(MORTALITY_WEIGHTS[name] * _scaled(name, value) for name, value in levers.items())
+
+    projected_life_exp = base_life_exp + life_exp_gain
+    projected_u5_mortality = np.maximum(0, base_u5_mortality - mortality_drop)
+
+    return projected_life_exp, projected_u5_mortality, life_exp_gain, mortality_drop
+
+
+def project_trajectory(base, change, horizon=PROJECTION_YEARS):
+    """
+    Yearly path of an outcome moving by ``change`` in equal steps over ``horizon`` years.
+
+    As on the policy page, the first step is already applied in the base
+    year, giving ``horizon + 1`` points. ``base`` and ``change`` may be
+    arrays (e.g. Monte Carlo draws); the years are the last axis.
+    """
+    steps = np.arange(1, horizon + 2)
+    return np.asarray(base)[..., None] + np.asarray(change)[..., None] / horizon * steps
+
+
+def lever_grids(points, ranges=None):
+    """Evenly spaced values over each lever's range (``points`` per lever)."""
+    ranges = ranges or LEVER_RANGES
+    return {name: np.linspace(*ranges[name], points) for name in LEVERS}
+
+
+def policy_sweep(grids, base_life_exp, base_u5_mortality, pair, u5_target=None, chunk_size=SWEEP_CHUNK_SIZE):
+    """
+    Evaluate every combination of the lever grids and reduce the results.
+
+    The full grid is never materialized: it is walked in slabs along the
+    first lever axis (at most ``chunk_size`` scenarios each), every lever
+    term is broadcast over the slab, and only reductions are kept, so grids
+    in the tens of millions of scenarios fit in memory. Slabs are float32
+    (ample for outcomes quoted to one or two decimals); sums accumulate in
+    float64.
+
+    Args:
+        grids (dict): lever -> 1D array of values, for every lever in ``LEVERS``.
+        base_life_exp, base_u5_mortality (float): Baseline outcomes.
+        pair (tuple): Two levers for the sensitivity heatmaps.
+        u5_target (float): Optional under-5 mortality target; the share of
+            scenarios at or below it is reported.
+        chunk_size (int): Scenarios evaluated per slab.
+
+    Returns:
+        dict: ``scenarios`` (count), ``life_exp`` / ``u5_mortality`` with
+        ``min``, ``max``, ``mean``, ``best`` (lever values of the best
+        scenario) and ``heatmap`` (mean outcome over all other levers, shape
+        ``(len(grids[pair[0]]), len(grids[pair[1]]))``), and ``u5_target_share``.
+    """
+    shape = tuple(len(grids[name]) for name in LEVERS)
+    n_scenarios = int(np.prod(shape))
+    a, b = LEVERS.index(pair[0]), LEVERS.index(pair[1])
+    if a == b:
+        raise ValueError("The heatmap pair needs two different levers")
+
+    # Per-lever contributions, each shaped to broadcast along its own axis
+    def terms(weights):
+        out = []
+        for axis, name in enumerate(LEVERS):
+            term = (weights[name] * _scaled(name, grids[name])).astype(np.float32)
+            out.append(term.reshape([-1 if i == axis else 1 for i in range(len(LEVERS))]))
+        return out
+
+    life_terms = terms(LIFE_EXP_WEIGHTS)
+    mort_terms = terms(MORTALITY_WEIGHTS)
+
+    rows_per_slab = max(1, chunk_size // max(1, n_scenarios // shape[0]))
+    other_axes = tuple(i for i in range(len(LEVERS)) if i not in (a, b))
+    stats = {
+        key: {"min": np.inf, "max": -np.inf, "sum": 0.0, "best": None, "heatmap": np.zeros((shape[a], shape[b]))}
+        for key in ("life_exp", "u5_mortality")
+    }
+    below_target = 0
+
+    for start in range(0, shape[0], rows_per_slab):
+        rows = slice(start, min(start + rows_per_slab, shape[0]))
+        life_exp = np.float32(base_life_exp) + sum(t[rows] if t.shape[0] > 1 else t for t in life_terms)
+        mortality = np.maximum(np.float32(0), np.float32(base_u5_mortality) - sum(t[rows] if t.shape[0] > 1 else t for t in mort_terms))
+
+        for key, values, best in (("life_exp", life_exp, np.argmax), ("u5_mortality", mortality, np.argmin)):
+            values = np.broadcast_to(values, (rows.stop - rows.start,) + shape[1:])
+            s = stats[key]
+            pos = best(values)
+            candidate = values.flat[pos]
+            better = candidate > s["max"] if key == "life_exp" else candidate < s["min"]
+            if better:
+                idx = np.unravel_index(pos, values.shape)
+                s["best"] = {
+                    name: float(grids[name][idx[i] + (start if i == 0 else 0)])
+                    for i, name in enumerate(LEVERS)
+                }
+            s["min"] = min(s["min"], float(values.min()))
+            s["max"] = max(s["max"], float(values.max()))
+            s["sum"] += float(values.sum(dtype=np.float64))
+
+            # Sum over the other levers; axis 0 of the slab covers only ``rows``
+            partial = values.sum(axis=other_axes)
+            if a == 0:
+                s["heatmap"][rows] += partial
+            elif b == 0:
+                s["heatmap"][:, rows] += partial.T
+            else:
+                s["heatmap"] += partial if a < b else partial.T
+
+        if u5_target is not None:
+            below_target += int(np.count_nonzero(np.broadcast_to(mortality, (rows.stop - rows.start,) + shape[1:]) <= u5_target))
+
+    per_cell = n_scenarios / (shape[a] * shape[b])
+    result = {"scenarios": n_scenarios, "u5_target_share": below_target / n_scenarios if u5_target is not None else None}
+    for key, s in stats.items():
+        result[key] = {
+            "min": s["min"],
+            "max": s["max"],
+            "mean": s["sum"] / n_scenarios,
+            "best": s["best"],
+            "heatmap": s["heatmap"] / per_cell,
+        }
+    return result
+
+
+def tornado_swings(scenario, base_life_exp, base_u5_mortality, ranges=None):
+    """
+    One-at-a-time sensitivity: each lever moved to the ends of its range
+    while the others stay at ``scenario``.
+
+    Args:
+        scenario (dict): lever -> current value.
+
+    Returns:
+        dict: lever -> ``{"life_exp": (low, high), "u5_mortality": (low, high)}``,
+        the outcomes with the lever at the bottom and top of its range, all
+        evaluated in one batch.
+    """
+    ranges = ranges or LEVER_RANGES
+    n = len(LEVERS)
+    batch = {name: np.full(2 * n, float(scenario[name])) for name in LEVERS}
+    for i, name in enumerate(LEVERS):
+        batch[name][2 * i], batch[name][2 * i + 1] = ranges[name]
+
+    life_exp, u5_mortality, _, _ = simulate_policy_impact(
+        hospital_pct=None, base_life_exp=base_life_exp, base_u5_mortality=base_u5_mortality, **batch
+    )
+    return {
+        name: {
+            "life_exp": (float(life_exp[2 * i]), float(life_exp[2 * i + 1])),
+            "u5_mortality": (float(u5_mortality[2 * i]), float(u5_mortality[2 * i + 1])),
+        }
+        for i, name in enumerate(LEVERS)
+    }
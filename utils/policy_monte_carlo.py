@@ -0,0 +1,126 @@
+# utils/policy_monte_carlo.py
+"""
+Monte Carlo uncertainty for the policy impact model (utils/policy_model.py).
+
+The effect weights and the baseline outcomes are not known exactly. Each
+draw scales every weight by a mean-one log-normal factor and perturbs the
+baseline, then evaluates the scenario; the spread of the resulting 10-year
+trajectories gives percentile bands around the deterministic projection.
+
+Draws are generated in fixed-size chunks, each with its own child of one
+``np.random.SeedSequence``, so results are reproducible for a seed and do
+not depend on how many processes the chunks are spread over.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from utils.policy_model import (
+    LEVERS,
+    LIFE_EXP_WEIGHTS,
+    MORTALITY_WEIGHTS,
+    PROJECTION_YEARS,
+    project_trajectory,
+    scaled_levers,
+)
+
+# Assumed uncertainty: relative spread (log-normal sigma) of every effect
+# weight, and spread of the baseline outcomes
+WEIGHT_SIGMA = 0.3
+BASE_LIFE_EXP_SD = 1.0  # years
+BASE_U5_REL_SD = 0.1  # fraction of the baseline rate
+
+MC_DRAWS = 100_000
+MC_CHUNK_SIZE = 25_000
+MC_SEED = 2022
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def _simulate_chunk(seed, n, scaled, base_life_exp, base_u5_mortality):
+    """Draw ``n`` parameter sets and evaluate the scenario for each (float32 results)."""
+    rng = np.random.default_rng(seed)
+    # Mean-one multiplicative noise keeps every weight's sign and expected value
+    noise = rng.lognormal(-WEIGHT_SIGMA ** 2 / 2, WEIGHT_SIGMA, size=(2, n, len(LEVERS)))
+    life_weights = np.array([LIFE_EXP_WEIGHTS[name] for name in LEVERS]) * noise[0]
+    mort_weights = np.array([MORTALITY_WEIGHTS[name] for name in LEVERS]) * noise[1]
+
+    return (
+        rng.normal(base_life_exp, BASE_LIFE_EXP_SD, n).astype(np.float32),
+        (life_weights @ scaled).astype(np.float32),
+        np.maximum(0, rng.normal(base_u5_mortality, BASE_U5_REL_SD * base_u5_mortality, n)).astype(np.float32),
+        (mort_weights @ scaled).astype(np.float32),
+    )
+
+
+def _simulate_chunk_args(args):
+    return _simulate_chunk(*args)
+
+
+def simulate_draws(
+    scenario,
+    base_life_exp,
+    base_u5_mortality,
+    draws=MC_DRAWS,
+    seed=MC_SEED,
+    chunk_size=MC_CHUNK_SIZE,
+    processes=1,
+):
+    """
+    Monte Carlo draws of the policy model for one scenario.
+
+    Args:
+        scenario (dict): lever -> value, for every lever in ``LEVERS``.
+        base_life_exp, base_u5_mortality (float): Central baseline outcomes.
+        draws (int): Number of parameter draws.
+        seed (int): Root seed; the same seed gives the same draws.
+        chunk_size (int): Draws per chunk (and per pool task).
+        processes (int): Worker processes; 1 runs in the calling process.
+            Pools are for offline runs and benchmarks, not the Streamlit server.
+
+    Returns:
+        dict: float32 arrays of length ``draws``: ``base_life_exp``,
+        ``life_exp_gain``, ``base_u5_mortality``, ``mortality_drop``.
+    """
+    scaled = scaled_levers(scenario)
+    sizes = [min(chunk_size, draws - start) for start in range(0, draws, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(s, n, scaled, float(base_life_exp), float(base_u5_mortality)) for s, n in zip(seeds, sizes)]
+
+    if processes > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            chunks = list(pool.map(_simulate_chunk_args, jobs))
+    else:
+        chunks = [_simulate_chunk(*job) for job in jobs]
+
+    keys = ("base_life_exp", "life_exp_gain", "base_u5_mortality", "mortality_drop")
+    return {key: np.concatenate([chunk[i] for chunk in chunks]) for i, key in enumerate(keys)}
+
+
+def trajectory_bands(draws, base_year, horizon=PROJECTION_YEARS, percentiles=PERCENTILES):
+    """
+    Percentile bands of the yearly trajectories implied by Monte Carlo draws.
+
+    Args:
+        draws (dict): Output of ``simulate_draws``.
+        base_year (int): First year of the projection.
+
+    Returns:
+        pd.DataFrame: One row per (Indicator, Year) with a ``p{q}`` column per
+        percentile.
+    """
+    years = np.arange(base_year, base_year + horizon + 1)
+    paths = {
+        "Life Expectancy": project_trajectory(draws["base_life_exp"], draws["life_exp_gain"], horizon),
+        "Under-5 Mortality Rate": np.maximum(
+            0, project_trajectory(draws["base_u5_mortality"], -draws["mortality_drop"], horizon)
+        ),
+    }
+
+    frames = []
+    for indicator, path in paths.items():
+        bands = np.percentile(path, percentiles, axis=0)
+        frame = pd.DataFrame({f"p{q}": band for q, band in zip(percentiles, bands)})
+        frames.append(frame.assign(Indicator=indicator, Year=years))
+    return pd.concat(frames, ignore_index=True)[["Indicator", "Year", *[f"p{q}" for q in percentiles]]]
@@ -0,0 +1,197 @@
+# utils/policy_optimizer.py
+"""
+Budget allocation optimizer on top of the policy impact model.
+
+An investment envelope (M ZMW) is split across the programme levers of
+utils/policy_model.py. Each lever has a saturating cost curve: spending
+``s`` moves it from its current level toward the top of its range,
+
+    level = current + (top - current) * (1 - exp(-s / cost_scale))
+
+so ``cost_scale`` is the spend that closes ~63% of the remaining gap. The
+total health budget lever is held at its current value.
+
+With positive weights the projected outcomes are separable, concave
+functions of the spend, so the optimum of any weighted mix of the two
+objectives satisfies the KKT conditions in closed form: every funded lever
+gets the same marginal return ``mu``, i.e.
+``s_i = cost_scale_i * log(c_i / mu)``. ``mu`` is found by bisection,
+batched over all mixes at once, which traces the whole Pareto front
+between life expectancy and under-5 mortality in one pass.
+"""
+import numpy as np
+import pandas as pd
+
+from utils.policy_model import (
+    LEVER_RANGES,
+    LEVER_SCALING,
+    LIFE_EXP_WEIGHTS,
+    MORTALITY_WEIGHTS,
+    simulate_policy_impact,
+)
+
+# Levers funded from the envelope
+FUNDED_LEVERS = (
+    "staff_increase_pct",
+    "vacc_coverage_pct",
+    "hiv_art_pct",
+    "malaria_coverage_pct",
+    "tb_treatment_pct",
+)
+
+# Illustrative cost curves: M ZMW closing ~63% of the gap to the top of the range
+COST_SCALES = {
+    "staff_increase_pct": 1500.0,
+    "vacc_coverage_pct": 400.0,
+    "hiv_art_pct": 900.0,
+    "malaria_coverage_pct": 600.0,
+    "tb_treatment_pct": 300.0,
+}
+
+PARETO_POINTS = 41
+
+_BISECTION_STEPS = 80
+
+
+def lever_levels(scenario, spend, cost_scales=None):
+    """
+    Lever levels reached by spending on top of ``scenario``.
+
+    Args:
+        scenario (dict): lever -> current value.
+        spend (np.ndarray): (..., len(FUNDED_LEVERS)) spend in M ZMW.
+        cost_scales (dict): lever -> cost scale; defaults to ``COST_SCALES``.
+
+    Returns:
+        dict: lever -> array of levels (same leading shape as ``spend``).
+    """
+    cost_scales = cost_scales or COST_SCALES
+    spend = np.asarray(spend, dtype=np.float64)
+    levels = {}
+    for i, name in enumerate(FUNDED_LEVERS):
+        current = float(scenario[name])
+        top = LEVER_RANGES[name][1]
+        levels[name] = current + max(top - current, 0) * -np.expm1(-spend[..., i] / cost_scales[name])
+    return levels
+
+
+def marginal_returns(scenario, weights, cost_scales=None):
+    """Outcome gained per M ZMW of the first spend on each funded lever."""
+    cost_scales = cost_scales or COST_SCALES
+    return np.array([
+        weights[name] / LEVER_SCALING[name][1]
+        * max(LEVER_RANGES[name][1] - float(scenario[name]), 0)
+        / cost_scales[name]
+        for name in FUNDED_LEVERS
+    ])
+
+
+def water_fill(returns, cost_scales, envelope):
+    """
+    Optimal spend for separable exponential cost curves.
+
+    Args:
+        returns (np.ndarray): (m, n) initial marginal return of each lever, one
+            row per problem.
+        cost_scales (np.ndarray): (n,) cost scale per lever.
+        envelope (float or np.ndarray): Spend to allocate, for all problems
+            or one per row.
+
+    Returns:
+        np.ndarray: (m, n) spend, each row summing to its envelope (or zeros
+        when no lever can improve).
+    """
+    returns = np.atleast_2d(np.asarray(returns, dtype=np.float64))
+    envelope = np.broadcast_to(np.asarray(envelope, dtype=np.float64), returns.shape[:1])
+    spend = np.zeros_like(returns)
+    active = (returns.max(axis=1) > 0) & (envelope > 0)
+    if not active.any():
+        return spend
+
+    r, budget = returns[active], envelope[active]
+    log_r = np.log(np.where(r > 0, r, np.nan))
+    # Bisection on log(mu): total spend falls as mu rises, reaching 0 at max(r)
+    hi = np.nanmax(log_r, axis=1)
+    lo = hi - budget / cost_scales.min() - 1.0
+    for _ in range(_BISECTION_STEPS):
+        mid = (lo + hi) / 2
+        total = np.nansum(cost_scales * np.maximum(log_r - mid[:, None], 0), axis=1)
+        too_much = total > budget
+        lo = np.where(too_much, mid, lo)
+        hi = np.where(too_much, hi, mid)
+
+    s = np.nan_to_num(cost_scales * np.maximum(log_r - hi[:, None], 0))
+    # Remove the bisection residue so every row spends exactly its envelope
+    spend[active] = s * (budget / s.sum(axis=1))[:, None]
+    return spend
+
+
+def pareto_front(scenario, base_life_exp, base_u5_mortality, envelope, cost_scales=None, points=PARETO_POINTS):
+    """
+    Allocations of ``envelope`` trading life expectancy against under-5 mortality.
+
+    Each point maximizes ``w * gain + (1 - w) * drop`` (both normalized by
+    their best single-lever return) for ``w`` from 0 (minimize under-5
+    mortality) to 1 (maximize life expectancy).
+
+    Args:
+        scenario (dict): Current lever values (every lever in ``LEVERS``).
+        base_life_exp, base_u5_mortality (float): Baseline outcomes.
+        envelope (float): Investment to allocate, M ZMW.
+        cost_scales (dict): lever -> cost scale; defaults to ``COST_SCALES``.
+        points (int): Number of mixes along the front.
+
+    Returns:
+        pd.DataFrame: ``weight_life_exp``, the spend per funded lever,
+        ``life_exp`` and ``u5_mortality``, with duplicate allocations removed.
+    """
+    cost_scales = cost_scales or COST_SCALES
+    w = np.linspace(0, 1, points)
+    spend = water_fill(_mixed_returns(scenario, w, cost_scales), _scales(cost_scales), float(envelope))
+    front = _allocation_frame(scenario, base_life_exp, base_u5_mortality, spend, cost_scales)
+    front.insert(0, "weight_life_exp", w)
+    return front.drop_duplicates(subset=list(FUNDED_LEVERS)).reset_index(drop=True)
+
+
+def efficiency_curve(
+    scenario, base_life_exp, base_u5_mortality, max_envelope, weight_life_exp=1.0, cost_scales=None, points=21
+):
+    """
+    Optimal allocation and outcomes as the envelope grows from 0 to ``max_envelope``.
+
+    Returns:
+        pd.DataFrame: ``envelope``, the spend per funded lever, ``life_exp``
+        and ``u5_mortality``.
+    """
+    cost_scales = cost_scales or COST_SCALES
+    envelopes = np.linspace(0, max_envelope, points)
+    returns = np.repeat(_mixed_returns(scenario, [weight_life_exp], cost_scales), points, axis=0)
+    spend = water_fill(returns, _scales(cost_scales), envelopes)
+    curve = _allocation_frame(scenario, base_life_exp, base_u5_mortality, spend, cost_scales)
+    curve.insert(0, "envelope", envelopes)
+    return curve
+
+
+def _scales(cost_scales):
+    return np.array([cost_scales[name] for name in FUNDED_LEVERS])
+
+
+def _mixed_returns(scenario, weights_life_exp, cost_scales):
+    """(len(weights), n) returns of ``w * gain + (1 - w) * drop``, each objective normalized."""
+    life_returns = marginal_returns(scenario, LIFE_EXP_WEIGHTS, cost_scales)
+    mort_returns = marginal_returns(scenario, MORTALITY_WEIGHTS, cost_scales)
+    life_returns = life_returns / max(life_returns.max(), 1e-12)
+    mort_returns = mort_returns / max(mort_returns.max(), 1e-12)
+    w = np.asarray(weights_life_exp, dtype=np.float64)[:, None]
+    return w * life_returns + (1 - w) * mort_returns
+
+
+def _allocation_frame(scenario, base_life_exp, base_u5_mortality, spend, cost_scales):
+    levels = {**{name: float(value) for name, value in scenario.items()}, **lever_levels(scenario, spend, cost_scales)}
+    life_exp, u5_mortality, _, _ = simulate_policy_impact(
+        hospital_pct=None, base_life_exp=base_life_exp, base_u5_mortality=base_u5_mortality, **levels
+    )
+    frame = pd.DataFrame(np.round(spend, 1), columns=list(FUNDED_LEVERS))
+    frame["life_exp"] = np.broadcast_to(life_exp, len(frame))
+    frame["u5_mortality"] = np.broadcast_to(u5_mortality, len(frame))
+    return frame
@@ -0,0 +1,225 @@
+# utils/query_engine.py
+"""
+In-process SQL engine (DuckDB) over the files in ``data/``.
+
+``build_query_engine`` opens an in-memory DuckDB database with one view per
+catalog dataset, named like the catalog entry (``"dhs-mobile"``,
+``"malaria"``...):
+
+- DHS datasets read the partitioned Parquet store (utils/dhs_store.py), so
+  filters on ``Level``, ``Province`` and ``SurveyYear`` prune partitions,
+  filters on other columns use row-group statistics, and only the
+  referenced columns are decoded
+- CSV datasets (World Bank, GHO) are scanned in place
+
+``run_query`` is the typed entry point: a view, the columns to return,
+``{column: value or list}`` filters, optional ranges, grouping and
+aggregates. Identifiers are checked against the view schema and every
+value is bound as a parameter, so the generated SQL text depends only on
+the shape of the query; that text is built once per shape
+(``compile_query`` is memoized) and DuckDB re-binds the parameters on each
+call.
+
+DuckDB connections are not safe to share between threads; each thread
+(Streamlit session) queries through its own cursor on the shared database.
+"""
+import threading
+from functools import lru_cache
+
+import duckdb
+import numpy as np
+
+from utils.catalog import CATALOG
+from utils.dhs_store import STORE_DIR, refresh_dhs_store, stale_datasets
+from utils.streaming import source_encoding
+
+# Aggregate name -> SQL function
+AGGREGATES = {
+    "count": "count",
+    "mean": "avg",
+    "median": "median",
+    "min": "min",
+    "max": "max",
+    "sum": "sum",
+    "std": "stddev_samp",
+}
+
+# Detected encodings as spelled by DuckDB's CSV reader (cp1252 differs from
+# latin-1 only in the 0x80-0x9F control range)
+_CSV_ENCODINGS = {"utf-8-sig": "utf-8", "cp1252": "latin-1"}
+
+
+def _identifier(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _literal(text):
+    return "'" + str(text).replace("'", "''") + "'"
+
+
+def build_query_engine(catalog=CATALOG, store_dir=STORE_DIR):
+    """
+    Open the query engine over every catalog dataset.
+
+    Stale datasets of the DHS store are refreshed first.
+
+    Returns:
+        dict: ``connection`` (DuckDB connection), ``views`` (view name ->
+        ``{column: SQL type}``) and the per-thread cursor registry.
+    """
+    dhs_names = [name for name, spec in catalog.items() if spec["format"] == "dhs-store"]
+    stale = stale_datasets(dhs_names, store_dir=store_dir)
+    if stale:
+        refresh_dhs_store(stale, store_dir=store_dir)
+
+    con = duckdb.connect(database=":memory:")
+    if dhs_names:
+        con.execute(
+            "CREATE VIEW dhs AS SELECT * FROM read_parquet("
+            f"{_literal(f'{store_dir}/**/*.parquet')}, hive_partitioning = true)"
+        )
+    for name, spec in catalog.items():
+        if spec["format"] == "dhs-store":
+            source = f"SELECT * EXCLUDE (dataset) FROM dhs WHERE dataset = {_literal(name)}"
+        elif spec["format"] == "csv":
+            encoding = source_encoding(spec)
+            encoding = _CSV_ENCODINGS.get(encoding, encoding)
+            source = (
+                f"SELECT * FROM read_csv({_literal(spec['path'])}, header = true, "
+                f"encoding = {_literal(encoding)})"
+            )
+        else:
+            continue
+        con.execute(f"CREATE VIEW {_identifier(name)} AS {source}")
+
+    views = {}
+    for view, column, column_type in con.execute(
+        "SELECT table_name, column_name, data_type FROM information_schema.columns ORDER BY table_name, ordinal_position"
+    ).fetchall():
+        views.setdefault(view, {})[column] = column_type
+    return {"connection": con, "views": views, "cursors": threading.local()}
+
+
+def _cursor(engine):
+    local = engine["cursors"]
+    if getattr(local, "cursor", None) is None:
+        local.cursor = engine["connection"].cursor()
+    return local.cursor
+
+
+def _param(value):
+    # DuckDB binds Python scalars, not NumPy ones (e.g. years from a frame)
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _values(wanted):
+    values = wanted if isinstance(wanted, (list, tuple, set, np.ndarray)) else [wanted]
+    return [_param(value) for value in values]
+
+
+@lru_cache(maxsize=256)
+def compile_query(view, columns, where, ranges, group_by, aggregates, order_by, limit):
+    """
+    SQL text of one query shape, with ``?`` placeholders for every value.
+
+    Arguments are the hashable normal form built by ``run_query``:
+    ``where`` is ``((column, n_values), ...)`` and ``ranges`` is
+    ``((column, has_low, has_high), ...)``.
+    """
+    select = [_identifier(col) for col in columns]
+    select += [
+        f"{AGGREGATES[func]}({'*' if col == '*' else _identifier(col)}) AS {_identifier(alias)}"
+        for alias, func, col in aggregates
+    ]
+    sql = f"SELECT {', '.join(select)} FROM {_identifier(view)}"
+
+    terms = []
+    for col, n in where:
+        if n == 0:
+            terms.append("FALSE")
+        elif n == 1:
+            terms.append(f"{_identifier(col)} = ?")
+        else:
+            terms.append(f"{_identifier(col)} IN ({', '.join('?' * n)})")
+    for col, has_low, has_high in ranges:
+        if has_low:
+            terms.append(f"{_identifier(col)} >= ?")
+        if has_high:
+            terms.append(f"{_identifier(col)} <= ?")
+    if terms:
+        sql += " WHERE " + " AND ".join(terms)
+    if group_by:
+        sql += " GROUP BY " + ", ".join(_identifier(col) for col in group_by)
+    if order_by:
+        sql += " ORDER BY " + ", ".join(_identifier(col) for col in order_by)
+    if limit is not None:
+        sql += f" LIMIT {int(limit)}"
+    return sql
+
+
+def run_query(
+    engine,
+    view,
+    columns=None,
+    where=None,
+    ranges=None,
+    group_by=None,
+    aggregates=None,
+    order_by=None,
+    limit=None,
+):
+    """
+    Run a filtered (aggregated) query against one view.
+
+    Args:
+        engine (dict): Output of ``build_query_engine``.
+        view (str): Catalog dataset name.
+        columns (list): Columns to return. Defaults to ``group_by`` when
+            aggregating and to every column otherwise.
+        where (dict): ``{column: value or list of values}`` equality filters.
+        ranges (dict): ``{column: (low, high)}`` inclusive bounds; either end may be None.
+        group_by (list): Grouping columns.
+        aggregates (dict): ``{alias: (function, column)}`` with a function from
+            ``AGGREGATES``; ``("count", "*")`` counts rows.
+        order_by (list): Sort columns (ascending). Defaults to ``group_by``.
+        limit (int): Maximum number of rows.
+
+    Returns:
+        pd.DataFrame: Query result.
+
+    Raises:
+        KeyError: Unknown view, column or aggregate function.
+    """
+    if view not in engine["views"]:
+        raise KeyError(f"Unknown view: {view!r}")
+    schema = engine["views"][view]
+    where = where or {}
+    ranges = ranges or {}
+    group_by = tuple(group_by or ())
+    aggregates = tuple((alias, func, col) for alias, (func, col) in (aggregates or {}).items())
+    if columns is None:
+        columns = group_by if aggregates else tuple(schema)
+    columns = tuple(columns)
+    order_by = tuple(group_by if order_by is None else order_by)
+
+    referenced = {*columns, *where, *ranges, *group_by, *order_by, *(col for _, _, col in aggregates if col != "*")}
+    unknown = sorted(referenced - set(schema) - {alias for alias, _, _ in aggregates})
+    if unknown:
+        raise KeyError(f"Unknown columns for view {view!r}: {unknown}")
+    bad = sorted({func for _, func, _ in aggregates} - set(AGGREGATES))
+    if bad:
+        raise KeyError(f"Unknown aggregate functions: {bad}")
+
+    params = []
+    where_shape = []
+    for col, wanted in where.items():
+        values = _values(wanted)
+        where_shape.append((col, len(values)))
+        params += values
+    range_shape = []
+    for col, (low, high) in ranges.items():
+        range_shape.append((col, low is not None, high is not None))
+        params += [_param(bound) for bound in (low, high) if bound is not None]
+
+    sql = compile_query(view, columns, tuple(where_shape), tuple(range_shape), group_by, aggregates, order_by, limit)
+    return _cursor(engine).execute(sql, params).df()
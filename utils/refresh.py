@@ -0,0 +1,281 @@
+# utils/refresh.py
+"""
+Incremental refresh of the stores and their derived artifacts.
+
+When a source export is replaced, ``diff_rows`` compares the new rows with
+the stored version on the dataset's row key (``ROW_KEYS`` in
+utils/catalog.py: ``SurveyId`` + ``DataId`` for DHS, GHO code + year +
+dimension for WHO, ``Year`` for the wide World Bank file). The stores then
+apply only that delta (utils/dhs_store.py rewrites just the files holding
+changed keys), and every refresh is appended to the change log
+(``CHANGE_LOG``, one JSON object per line).
+
+Derived artifacts (trend projections, KPI snapshot rows, cube cells) are
+updated from the same delta instead of being rebuilt: ``record_delta``
+keeps the latest delta of each dataset in process, ``incremental`` hands
+the previous version of an artifact (the latest ``MAX_ARTIFACTS`` of each
+kind are kept) and the deltas since it to an update function, and
+``delta_series`` / ``splice_series`` recompute only the series whose rows
+changed. Anything that cannot be updated in place (no previous version, a
+delta that was never recorded) is rebuilt in full.
+"""
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from utils.trends import TREND_HORIZON, TREND_LEVEL, project_series, snapshot_table
+from utils.warehouse import SERIES_KEY, ingest
+
+CHANGE_LOG = "data/store/changes.jsonl"
+
+# Series identity used to splice per-series tables, the same key
+# ``snapshot_table`` indexes on
+SPLICE_KEY = ["dataset", "indicator_id"]
+
+# Derived artifacts kept per kind for ``incremental``, least recently used
+# dropped first (as many as the largest st.cache_resource they back)
+MAX_ARTIFACTS = 32
+
+# (dataset, new fingerprint) -> (old fingerprint, delta): the latest delta of each dataset
+_DELTAS = {}
+
+# (kind, key) -> (fingerprints, artifact): the latest version of each derived artifact
+_ARTIFACTS = OrderedDict()
+
+# Guards both registries; sessions refresh from several threads
+_LOCK = threading.Lock()
+
+
+def _same(a, b):
+    """Element-wise equality of two aligned columns, NaN equal to NaN."""
+    if isinstance(a.dtype, pd.CategoricalDtype) or isinstance(b.dtype, pd.CategoricalDtype):
+        a, b = a.astype(str), b.astype(str)
+    return ((a.to_numpy() == b.to_numpy()) | (a.isna().to_numpy() & b.isna().to_numpy()))
+
+
+def diff_rows(old, new, key):
+    """
+    Rows added, removed and changed between two versions of a dataset.
+
+    Args:
+        old (pd.DataFrame): Stored version.
+        new (pd.DataFrame): New export, same layout.
+        key (list): Columns identifying a row in both versions.
+
+    Returns:
+        dict: ``added`` (new rows), ``removed`` (old rows), ``changed_old``
+        and ``changed_new`` (both versions of rows whose key is kept but any
+        other shared column differs, in the same order) and ``unchanged``
+        (row count).
+
+    Raises:
+        ValueError: ``key`` does not identify rows uniquely in one version.
+    """
+    old_keys = pd.MultiIndex.from_frame(old[key].astype(str))
+    new_keys = pd.MultiIndex.from_frame(new[key].astype(str))
+    for keys, version in ((old_keys, "stored"), (new_keys, "new")):
+        if not keys.is_unique:
+            raise ValueError(f"Row key {key} is not unique in the {version} version")
+    kept_old = old_keys.isin(new_keys)
+    kept_new = new_keys.isin(old_keys)
+
+    common_old = old[kept_old]
+    position = old_keys[kept_old].get_indexer(new_keys[kept_new])
+    common_new = new[kept_new].iloc[position.argsort()]
+
+    columns = [col for col in old.columns if col in new.columns and col not in key]
+    changed = np.zeros(len(common_old), dtype=bool)
+    for col in columns:
+        changed |= ~_same(common_old[col], common_new[col])
+
+    return {
+        "added": new[~kept_new],
+        "removed": old[~kept_old],
+        "changed_old": common_old[changed],
+        "changed_new": common_new[changed],
+        "unchanged": int((~changed).sum()),
+    }
+
+
+def delta_size(delta):
+    """Rows touched by a delta (added + removed + changed)."""
+    return len(delta["added"]) + len(delta["removed"]) + len(delta["changed_new"])
+
+
+def delta_rows(delta):
+    """Every row a delta touches, old and new versions stacked (for locating affected cells or series)."""
+    parts = [delta[part] for part in ("added", "removed", "changed_old", "changed_new") if len(delta[part])]
+    return pd.concat(parts, ignore_index=True) if parts else delta["added"].iloc[:0]
+
+
+def delta_counts(delta):
+    """Row counts of a delta, as logged."""
+    return {
+        "added": len(delta["added"]),
+        "removed": len(delta["removed"]),
+        "changed": len(delta["changed_new"]),
+        "unchanged": delta["unchanged"],
+    }
+
+
+def log_change(dataset, old_fingerprint, new_fingerprint, mode, seconds, counts, path=CHANGE_LOG):
+    """
+    Append one refresh to the change log.
+
+    Args:
+        mode (str): ``"incremental"`` (a delta was applied) or ``"full"``
+            (the dataset was rebuilt: first build, or no usable row key).
+        counts (dict): ``delta_counts`` of the refresh, or ``{"added": rows}``
+            for a full build.
+    """
+    entry = {
+        "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "dataset": dataset,
+        "from": old_fingerprint,
+        "to": new_fingerprint,
+        "mode": mode,
+        "added": 0,
+        "removed": 0,
+        "changed": 0,
+        "unchanged": 0,
+        **counts,
+        "seconds": round(seconds, 4),
+    }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps(entry) + "\n")
+    return entry
+
+
+def record_delta(dataset, old_fingerprint, new_fingerprint, delta):
+    """Keep the delta of a refresh so derived artifacts can follow it."""
+    with _LOCK:
+        # Older deltas of the dataset are no longer reachable from a current artifact
+        for stale in [k for k in _DELTAS if k[0] == dataset]:
+            del _DELTAS[stale]
+        _DELTAS[(dataset, new_fingerprint)] = (old_fingerprint, delta)
+
+
+def delta_between(dataset, old_fingerprint, new_fingerprint):
+    """The recorded delta from one version of a dataset to the next, or None."""
+    with _LOCK:
+        found = _DELTAS.get((dataset, new_fingerprint))
+    if found is None or found[0] != old_fingerprint:
+        return None
+    return found[1]
+
+
+def incremental(kind, key, fingerprints, build, update):
+    """
+    Latest version of a derived artifact, updated from deltas when possible.
+
+    Args:
+        kind (str): Artifact family, e.g. ``"projections"``.
+        key (hashable): Artifact identity within the family (its arguments).
+        fingerprints (dict): Current fingerprint of every source dataset.
+        build (callable): ``build()`` computes the artifact from scratch.
+        update (callable): ``update(previous, deltas)`` with ``deltas`` a
+            ``{dataset: delta}`` dict of the datasets that changed; returns
+            the updated artifact, or None to fall back to ``build``.
+
+    Returns:
+        The artifact.
+    """
+    result = None
+    with _LOCK:
+        previous = _ARTIFACTS.get((kind, key))
+        if previous is not None:
+            _ARTIFACTS.move_to_end((kind, key))
+    if previous is not None:
+        old_fingerprints, artifact = previous
+        if old_fingerprints == fingerprints:
+            return artifact
+        deltas = {}
+        for dataset, fingerprint in fingerprints.items():
+            if old_fingerprints.get(dataset) == fingerprint:
+                continue
+            delta = delta_between(dataset, old_fingerprints.get(dataset), fingerprint)
+            if delta is None:
+                deltas = None
+                break
+            deltas[dataset] = delta
+        if deltas is not None:
+            result = update(artifact, deltas)
+    if result is None:
+        result = build()
+    with _LOCK:
+        _ARTIFACTS[(kind, key)] = (dict(fingerprints), result)
+        _ARTIFACTS.move_to_end((kind, key))
+        same_kind = [k for k in _ARTIFACTS if k[0] == kind]
+        for stale in same_kind[:max(len(same_kind) - MAX_ARTIFACTS, 0)]:
+            del _ARTIFACTS[stale]
+    return result
+
+
+def delta_series(deltas, schemas):
+    """
+    Series (``SPLICE_KEY``) whose observations a set of deltas touches.
+
+    Args:
+        deltas (dict): ``{dataset: delta}``.
+        schemas (dict): ``{dataset: catalog schema}``.
+
+    Returns:
+        pd.MultiIndex: (dataset, indicator_id) pairs.
+    """
+    frames = []
+    for dataset, delta in deltas.items():
+        rows = delta_rows(delta)
+        if len(rows):
+            frames.append(ingest(rows, dataset, schemas[dataset])[SPLICE_KEY].astype(str).drop_duplicates())
+    if not frames:
+        return pd.MultiIndex.from_arrays([[], []], names=SPLICE_KEY)
+    return pd.MultiIndex.from_frame(pd.concat(frames, ignore_index=True).drop_duplicates())
+
+
+def _series_mask(frame, series):
+    return pd.MultiIndex.from_frame(frame[SPLICE_KEY].astype(str)).isin(series)
+
+
+def series_rows(long, series):
+    """Warehouse rows of the given series."""
+    return long[_series_mask(long, series)]
+
+
+def splice_series(previous, fresh, series):
+    """
+    Replace the rows of ``series`` in a per-series table with ``fresh`` ones.
+
+    ``previous`` and ``fresh`` carry ``SPLICE_KEY`` as columns or as index
+    levels; the result is grouped by series, sorted on their ``SERIES_KEY``
+    labels.
+    """
+    indexed = list(previous.index.names) if set(SPLICE_KEY) <= set(previous.index.names) else None
+    if indexed:
+        previous, fresh = previous.reset_index(), fresh.reset_index()
+    kept = previous[~_series_mask(previous, series)]
+    out = pd.concat([kept, fresh], ignore_index=True)
+    order = out[[col for col in SERIES_KEY if col in out.columns]].astype(str)
+    out = out.loc[order.sort_values(list(order.columns), kind="stable").index].reset_index(drop=True)
+    return out.set_index(indexed) if indexed else out
+
+
+def update_projections(previous, long, deltas, schemas, horizon=TREND_HORIZON, level=TREND_LEVEL):
+    """
+    ``project_series(long)`` from its previous version: only the series the
+    deltas touch are refitted.
+    """
+    series = delta_series(deltas, schemas)
+    return splice_series(previous, project_series(series_rows(long, series), horizon=horizon, level=level), series)
+
+
+def update_snapshot(previous, long, deltas, schemas):
+    """``snapshot_table(long)`` from its previous version: only the rows of the series the deltas touch are recomputed."""
+    series = delta_series(deltas, schemas)
+    return splice_series(previous, snapshot_table(series_rows(long, series)), series)
+
@@ -0,0 +1,110 @@
+# utils/regions.py
+"""
+Administrative level of DHS rows, and rollups for the region drill-down.
+
+STATcompiler exports mix national and subnational rows. A subnational row
+carries ``RegionId`` and ``LevelRank`` (1 for provinces, 2 for districts)
+and names its area in ``CharacteristicLabel`` under the ``Region``
+category, district labels indented with leading dots and listed after
+their province. ``assign_regions`` derives two columns from them:
+
+- ``Level``: 0 national, 1 province, 2 district (``LEVELS``)
+- ``Province``: the province of a province or district row, ``""`` for
+  national rows
+
+The DHS store partitions on both (utils/dhs_store.py), so one step of the
+national -> province -> district drill-down reads only the partitions of
+one level and province. ``region_rollup`` summarizes the areas one level
+below each parent area.
+"""
+import numpy as np
+import pandas as pd
+
+from utils.cube import DESCRIBE_STATS
+from utils.warehouse import text_values
+
+LEVELS = {0: "national", 1: "province", 2: "district"}
+REGION_COLUMNS = ["Level", "Province"]
+
+# Rows of one series, in which a province is listed before its districts
+_SERIES = ["SurveyId", "IndicatorId", "ByVariableId"]
+
+# Columns identifying a parent area in ``region_rollup``
+ROLLUP_KEY = ["Level", "Province", "Indicator", "SurveyYear"]
+
+
+def area_names(labels):
+    """Area names of ``Region`` characteristic labels, without the indentation dots."""
+    return labels.astype(str).str.lstrip(". ")
+
+
+def assign_regions(df, provinces=None):
+    """
+    Administrative level and province of DHS rows.
+
+    Args:
+        df (pd.DataFrame): DHS rows, in export order within each series
+            (``SurveyId``, ``IndicatorId``, ``ByVariableId``).
+        provinces (dict): Last province listed in each series, carried over
+            when an export is processed in chunks; updated in place.
+
+    Returns:
+        tuple: ``(level, province)`` Series aligned with ``df``: int8 levels
+        and province names. A district whose province row was not seen gets
+        ``""``.
+    """
+    provinces = {} if provinces is None else provinces
+    rank = df["LevelRank"].to_numpy(dtype=np.float64, na_value=np.nan)
+    region = (df["CharacteristicCategory"].astype(str) == "Region").to_numpy()
+    # An unranked Region row is a first-level area
+    level = pd.Series(np.where(np.isnan(rank), np.where(region, 1, 0), rank).astype(np.int8), index=df.index)
+
+    names = area_names(df["CharacteristicLabel"])
+    series = [text_values(df[col]) for col in _SERIES]
+    listed = names.where(level == 1)
+    province = listed.groupby(series, sort=False).ffill()
+
+    # Districts at the top of a chunk belong to the last province of the previous one
+    orphan = (level >= 2) & province.isna()
+    if orphan.any() and provinces:
+        keys = pd.Series(list(zip(*(col[orphan] for col in series))), index=orphan[orphan].index)
+        province[orphan] = keys.map(provinces)
+
+    last = listed[level == 1].groupby([col[level == 1] for col in series], sort=False).last()
+    provinces.update(last.to_dict())
+
+    province = province.where(level > 0, "").fillna("")
+    return level, province.astype(str)
+
+
+def level_name(level):
+    """Display name of an administrative level."""
+    return LEVELS.get(int(level), f"level {int(level)}")
+
+
+def region_rollup(df, measure="Value"):
+    """
+    Statistics of ``measure`` over the areas one level below each parent
+    area: provinces under the national level (``Level`` 0), districts under
+    their province (``Level`` 1).
+
+    Args:
+        df (pd.DataFrame): Subnational rows with ``REGION_COLUMNS``,
+            ``Indicator``, ``SurveyYear`` and ``measure``.
+
+    Returns:
+        pd.DataFrame: ``ROLLUP_KEY`` of the parent area and ``DESCRIBE_STATS``.
+    """
+    children = df[df["Level"] > 0]
+    parent = pd.DataFrame({
+        "Level": (children["Level"] - 1).astype(np.int8),
+        # Provinces roll up to the national level, which has no province
+        "Province": children["Province"].astype(str).where(children["Level"] > 1, ""),
+        "Indicator": children["Indicator"].astype(str),
+        "SurveyYear": children["SurveyYear"],
+        measure: children[measure],
+    })
+    if parent.empty:
+        return pd.DataFrame(columns=[*ROLLUP_KEY, *DESCRIBE_STATS])
+    stats = parent.groupby(ROLLUP_KEY, sort=True)[measure].describe()
+    return stats[DESCRIBE_STATS].reset_index()
@@ -0,0 +1,263 @@
+# utils/streaming.py
+"""
+Chunked, schema-validated ingest of the CSV exports.
+
+Source files are read ``CHUNK_ROWS`` rows at a time, so memory is bounded by
+the chunk size rather than the export size (multi-country and subnational
+DHS/GHO exports run to hundreds of MB). Each chunk goes through the same
+steps:
+
+1. decode with the file's encoding, detected once per file version
+   (``source_encoding``); catalog entries no longer hard-code it
+2. drop HXL hashtag rows (``#country+code, #meta+id, ...``)
+3. coerce every column to its type in an Arrow schema; a row whose text
+   does not parse (text in a numeric column, a fraction in an integer
+   column, a year outside int16) or that misses a required column is
+   quarantined with the reason instead of becoming NaN
+4. hand the valid rows on as an Arrow record batch
+
+``stream_ingest`` drives a writer (the partitioned DHS store, or the
+Parquet frame cache for the other CSVs) with those batches and returns a
+report with the row counts and the throughput in rows/s. Quarantined rows
+are kept verbatim in ``QUARANTINE_DIR/<name>.csv`` with their source line
+and reason.
+"""
+import codecs
+import os
+import time
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from utils.cache import file_fingerprint
+from utils.catalog import FLOAT_DTYPE, WAREHOUSE_LAYOUTS
+
+CHUNK_ROWS = 50_000
+QUARANTINE_DIR = "data/store/quarantine"
+
+# Bytes decoded to detect a file's encoding
+SAMPLE_BYTES = 1 << 20
+
+# Tried in order on the sample; latin-1 decodes any byte sequence
+ENCODING_CANDIDATES = ("utf-8", "cp1252", "latin-1")
+
+_TEXT = pa.dictionary(pa.int32(), pa.string())
+
+
+def detect_encoding(path, sample_bytes=SAMPLE_BYTES):
+    """
+    Encoding of a text file, from its byte-order mark or the first of
+    ``ENCODING_CANDIDATES`` that decodes a sample of it.
+    """
+    with open(path, "rb") as f:
+        sample = f.read(sample_bytes)
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    for encoding in ENCODING_CANDIDATES:
+        try:
+            # Incremental, so a character cut at the end of the sample is not an error
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return "latin-1"
+
+
+@lru_cache(maxsize=64)
+def _detected_encoding(path, fingerprint):
+    return detect_encoding(path)
+
+
+def source_encoding(spec):
+    """Encoding of a catalog source: the catalog's, or detected once per file version."""
+    return spec["encoding"] or _detected_encoding(spec["path"], file_fingerprint(spec["path"]))
+
+
+def catalog_schema(spec, columns):
+    """
+    Arrow schema of a CSV catalog source with header ``columns``.
+
+    Catalog dtypes map to Arrow types (``"category"`` to dictionary-encoded
+    strings); columns the catalog does not list are ``FLOAT_DTYPE``.
+    """
+    dtypes = spec["dtypes"] or {}
+    fields = []
+    for col in columns:
+        dtype = dtypes.get(col, FLOAT_DTYPE)
+        if dtype == "category":
+            fields.append((col, _TEXT))
+        elif dtype == "str":
+            fields.append((col, pa.string()))
+        else:
+            fields.append((col, pa.from_numpy_dtype(np.dtype(dtype))))
+    return pa.schema(fields)
+
+
+def required_columns(spec):
+    """Columns a row of a catalog source cannot miss: its year and indicator key."""
+    layout = WAREHOUSE_LAYOUTS.get(spec["schema"], {})
+    return [spec["year_col"], *layout.get("indicator_id", [])[:1]]
+
+
+def hxl_rows(chunk):
+    """Rows whose non-empty cells are all HXL hashtags (``#country+code``...)."""
+    text = chunk.fillna("")
+    filled = text != ""
+    tagged = text.apply(lambda col: col.str.startswith("#"))
+    return filled.any(axis=1) & (tagged | ~filled).all(axis=1)
+
+
+def _parse_numbers(text):
+    """Numbers of a text column as float64, NaN where missing or not a number."""
+    try:
+        # Arrow's parser is an order of magnitude faster but rejects the
+        # whole column on one bad cell; pandas then finds which
+        return pd.Series(pc.cast(pa.array(text), pa.float64()).to_numpy(zero_copy_only=False), index=text.index)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pd.to_numeric(text, errors="coerce")
+
+
+def coerce_chunk(chunk, schema, required=()):
+    """
+    Coerce a chunk of text columns to ``schema``.
+
+    Args:
+        chunk (pd.DataFrame): Columns read as strings (missing cells NaN).
+        schema (pa.Schema): Target types.
+        required (list): Columns that must be present in every row.
+
+    Returns:
+        tuple: ``(frame, reason)``. ``frame`` holds every row with pandas
+        dtypes matching ``schema`` (categoricals for dictionary columns,
+        nullable integers and booleans); ``reason`` is a Series naming the
+        first column a row failed on, None for valid rows.
+    """
+    reason = pd.Series(None, index=chunk.index, dtype=object)
+
+    def flag(col, bad, expected):
+        bad = bad & reason.isna()
+        reason[bad] = f"{col}: expected {expected}"
+
+    out = {}
+    for field in schema:
+        col = field.name
+        if col not in chunk.columns:
+            out[col] = pd.Series(pd.NA, index=chunk.index)
+            if col in required:
+                flag(col, pd.Series(True, index=chunk.index), "a value")
+            continue
+        text = chunk[col]
+        present = text.notna() & (text.str.strip() != "")
+        if col in required:
+            flag(col, ~present, "a value")
+
+        if pa.types.is_dictionary(field.type):
+            out[col] = text.astype("category")
+        elif pa.types.is_string(field.type):
+            out[col] = text
+        else:
+            number = _parse_numbers(text)
+            bad = present & number.isna()
+            if pa.types.is_boolean(field.type):
+                bad |= present & ~number.isin([0, 1])
+                out[col] = number.where(~bad).astype("boolean")
+            elif pa.types.is_integer(field.type):
+                info = np.iinfo(field.type.to_pandas_dtype())
+                bad |= present & ((number % 1 != 0) | (number < info.min) | (number > info.max))
+                # Nullable, so a missing id does not fail the cast to the narrow type
+                out[col] = number.where(~bad).astype(f"Int{field.type.bit_width}")
+            else:
+                out[col] = number.astype(field.type.to_pandas_dtype())
+            flag(col, bad, str(field.type))
+    return pd.DataFrame(out, index=chunk.index), reason
+
+
+def _quarantine_path(name, quarantine_dir):
+    return os.path.join(quarantine_dir, f"{name}.csv")
+
+
+def stream_ingest(
+    name,
+    path,
+    schema,
+    write,
+    required=(),
+    encoding=None,
+    sort_by=None,
+    chunk_rows=CHUNK_ROWS,
+    quarantine_dir=QUARANTINE_DIR,
+):
+    """
+    Stream a CSV through validation into ``write``.
+
+    Args:
+        name (str): Source name, used for the quarantine file.
+        path (str): CSV file.
+        schema (pa.Schema): Types of the stored rows; columns of the file
+            outside the schema are ignored.
+        write (callable): Consumes an iterable of ``pa.RecordBatch`` with
+            ``schema`` (e.g. a Parquet or dataset writer).
+        required (list): Columns every stored row must have.
+        encoding (str): Text encoding. Detected from the file by default.
+        sort_by (list): Columns each chunk is sorted by before writing,
+            so row groups keep related rows together.
+        chunk_rows (int): Rows per chunk.
+        quarantine_dir (str): Directory of the quarantine files.
+
+    Returns:
+        dict: ``rows`` (data rows read), ``written``, ``hxl`` (tag rows
+        dropped), ``quarantined``, ``encoding``, ``seconds``, ``rows_per_s``
+        and ``quarantine`` (path of the quarantine file, None when every
+        row was valid).
+    """
+    encoding = encoding or detect_encoding(path)
+    quarantine = _quarantine_path(name, quarantine_dir)
+    if os.path.exists(quarantine):
+        os.remove(quarantine)
+    report = {"rows": 0, "written": 0, "hxl": 0, "quarantined": 0, "encoding": encoding, "quarantine": None}
+    usecols = set(schema.names)
+
+    def batches():
+        reader = pd.read_csv(
+            path,
+            dtype=str,
+            encoding=encoding,
+            # A stray byte past the detection sample is replaced, not fatal
+            encoding_errors="replace",
+            usecols=lambda col: col in usecols,
+            chunksize=chunk_rows,
+        )
+        for chunk in reader:
+            # Source line of each row: header is line 1
+            line = chunk.index.to_numpy() + 2
+            report["rows"] += len(chunk)
+
+            tags = hxl_rows(chunk).to_numpy()
+            report["hxl"] += int(tags.sum())
+            chunk, line = chunk[~tags], line[~tags]
+
+            frame, reason = coerce_chunk(chunk, schema, required)
+            bad = reason.notna().to_numpy()
+            if bad.any():
+                os.makedirs(quarantine_dir, exist_ok=True)
+                rejected = chunk[bad].assign(_line=line[bad], _reason=reason[bad])
+                rejected = rejected[["_line", "_reason", *chunk.columns]]
+                rejected.to_csv(quarantine, mode="a", header=report["quarantine"] is None, index=False)
+                report["quarantine"] = quarantine
+                report["quarantined"] += int(bad.sum())
+
+            frame = frame[~bad]
+            if sort_by:
+                frame = frame.sort_values(sort_by, kind="stable")
+            report["written"] += len(frame)
+            table = pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+            yield from table.to_batches()
+
+    start = time.perf_counter()
+    write(batches())
+    report["seconds"] = time.perf_counter() - start
+    report["rows_per_s"] = report["rows"] / report["seconds"] if report["seconds"] else float("nan")
+    return report
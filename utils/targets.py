@@ -0,0 +1,295 @@
+# utils/targets.py
+"""
+National Health Strategic Plan 2022-2026 targets and progress toward them.
+
+Each target in ``NHSP_TARGETS`` points at one series of the indicator
+warehouse (``dataset`` and ``indicator_id``, see utils/warehouse.py),
+chosen to match the definition of the NHSP baseline where the data has one.
+When the series reads far from the NHSP baseline in the baseline year (a
+modelled estimate against a routine-data baseline), the target is moved to
+the series' scale (``series_targets``) so that a level difference is not
+read as progress.
+
+``target_progress`` solves all of them in one pass:
+
+- the annual reduction still required, from the latest observation to the
+  target (``required_reduction_rate`` in utils/annual_reduction.py)
+- the annual reduction observed recently, from a closed-form log-linear
+  fit of each series (``fit_linear_trends`` on log values)
+- the gap between the two, the value the observed rate leads to by the
+  target year, and an on/off-track status
+
+``indicator_tracker`` reads baseline, latest and target values of the same
+indicators from the data for the progress charts.
+"""
+import numpy as np
+import pandas as pd
+
+from utils.annual_reduction import required_reduction_rate
+from utils.trends import fit_linear_trends, latest_values, pad_series
+
+TARGET_YEAR = 2026
+
+# Years before each series' latest observation used for the observed rate
+TREND_WINDOW = 12
+
+# First year of the history drawn by the progress tracker
+TRACKER_SINCE = 2000
+
+# Relative difference between a series in the baseline year and the NHSP
+# baseline beyond which the two are taken to measure different things
+BASELINE_TOLERANCE = 0.25
+
+# NHSP baselines and 2026 targets; ``direction`` is the way the indicator must move
+NHSP_TARGETS = [
+    {
+        "area": "RMNCAH-N",
+        "label": "Under-5 mortality rate",
+        "unit": "per 1,000 live births",
+        "dataset": "dhs-mobile",
+        "indicator_id": "CM_ECMR_C_U5M|1000|14001|63206050",
+        "baseline_year": 2018,
+        "baseline": 61,
+        "target": 25,
+        "direction": "decrease",
+    },
+    {
+        "area": "RMNCAH-N",
+        "label": "Infant mortality rate",
+        "unit": "per 1,000 live births",
+        "dataset": "dhs-mobile",
+        "indicator_id": "CM_ECMR_C_IMR|1000|14001|63206030",
+        "baseline_year": 2018,
+        "baseline": 42,
+        "target": 15,
+        "direction": "decrease",
+    },
+    {
+        "area": "RMNCAH-N",
+        "label": "Neonatal mortality rate",
+        "unit": "per 1,000 live births",
+        "dataset": "dhs-mobile",
+        "indicator_id": "CM_ECMR_C_NNR|1000|14001|63206010",
+        "baseline_year": 2018,
+        "baseline": 27,
+        "target": 12,
+        "direction": "decrease",
+    },
+    {
+        "area": "RMNCAH-N",
+        "label": "Maternal mortality ratio",
+        "unit": "per 100,000 live births",
+        # The survey estimate the NHSP baseline comes from, not the WB model
+        "dataset": "dhs-mobile",
+        "indicator_id": "MM_MMRO_W_MMR|1000|0|77033060",
+        "baseline_year": 2018,
+        "baseline": 278,
+        "target": 100,
+        "direction": "decrease",
+    },
+    {
+        "area": "RMNCAH-N",
+        "label": "Contraceptive prevalence rate",
+        "unit": "% of married women",
+        "dataset": "dhs-mobile",
+        "indicator_id": "FP_CUSM_W_ANY|1000|0|32633010",
+        "baseline_year": 2018,
+        "baseline": 50,
+        "target": 60,
+        "direction": "increase",
+    },
+    {
+        "area": "Communicable Diseases",
+        "label": "Malaria incidence",
+        "unit": "per 1,000 population",
+        # The NHSP baseline counts routine (HMIS) cases; only the WHO
+        # estimate is in the data, so the target is rescaled to it
+        "dataset": "malaria",
+        "indicator_id": "MALARIA_EST_INCIDENCE",
+        "baseline_year": 2021,
+        "baseline": 340,
+        "target": 201,
+        "direction": "decrease",
+    },
+    {
+        "area": "Communicable Diseases",
+        "label": "New HIV infections (ages 15-49)",
+        "unit": "per year",
+        "dataset": "worldbank",
+        "indicator_id": "Adults (ages 15-49) newly infected with HIV",
+        "baseline_year": 2021,
+        "baseline": 28000,
+        "target": 15000,
+        "direction": "decrease",
+    },
+    {
+        "area": "Communicable Diseases",
+        "label": "TB incidence",
+        "unit": "per 100,000 population",
+        "dataset": "tuberculosis",
+        "indicator_id": "MDG_0000000020",
+        "baseline_year": 2021,
+        "baseline": 319,
+        "target": 169,
+        "direction": "decrease",
+    },
+]
+
+
+def target_datasets(targets=NHSP_TARGETS):
+    """Catalog names the targets draw on, in first-use order."""
+    return list(dict.fromkeys(spec["dataset"] for spec in targets))
+
+
+def _observed_baselines(keys, years, values, mask, spec):
+    """Value of each target's series in its baseline year (NaN without an observation then)."""
+    row = pd.Index(pd.MultiIndex.from_frame(keys[["dataset", "indicator_id"]])).get_indexer(
+        pd.MultiIndex.from_frame(spec[["dataset", "indicator_id"]])
+    )
+    baseline_year = spec["baseline_year"].to_numpy(dtype=np.float64)
+    found = row >= 0
+    observed = np.full(len(spec), np.nan)
+    observed[found] = latest_values(years[row[found]], values[row[found]], mask[row[found]], baseline_year[found])
+    return observed
+
+
+def series_targets(spec, observed_baseline, tolerance=BASELINE_TOLERANCE):
+    """
+    Targets on the scale of the series they are tracked on.
+
+    Args:
+        spec (pd.DataFrame): Target specs with ``baseline`` and ``target``.
+        observed_baseline (np.ndarray): The series in each baseline year.
+        tolerance (float): Relative difference from the NHSP baseline
+            beyond which the target is rescaled.
+
+    Returns:
+        tuple: ``(target, rescaled)``: the NHSP target, times
+        ``observed_baseline / baseline`` where ``rescaled``; the same
+        relative change from the baseline either way.
+    """
+    baseline = spec["baseline"].to_numpy(dtype=np.float64)
+    target = spec["target"].to_numpy(dtype=np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        scale = observed_baseline / baseline
+        rescaled = np.isfinite(scale) & (scale > 0) & (np.abs(scale - 1) > tolerance)
+    return np.where(rescaled, target * scale, target), rescaled
+
+
+def indicator_tracker(long, targets=NHSP_TARGETS, since=TRACKER_SINCE):
+    """
+    Baseline, latest and target values of every target indicator, from the data.
+
+    Args:
+        long (pd.DataFrame): Warehouse rows covering the targets' datasets.
+        targets (list): Target specs, as in ``NHSP_TARGETS``.
+        since (int): First year kept in the history.
+
+    Returns:
+        tuple: ``(summary, history)``. ``summary`` has one row per target
+        with the spec columns, ``observed_baseline`` (the series in the
+        baseline year, NaN without a survey that year), ``series_target``
+        and ``rescaled`` (see ``series_targets``), ``latest_year``,
+        ``latest`` and ``progress_pct`` (share of the way from the observed
+        baseline to ``series_target`` covered by the latest value, from the
+        NHSP baseline when the series has no value that year). ``history``
+        holds ``label``, ``year`` and ``value`` (yearly mean) of each
+        target series from ``since`` on.
+    """
+    spec = pd.DataFrame(targets)
+    wanted = long.merge(spec[["dataset", "indicator_id", "label"]], on=["dataset", "indicator_id"])
+    keys, years, values, mask = pad_series(wanted)
+
+    latest_year = np.where(mask, years, -np.inf).max(axis=1, initial=-np.inf)
+    observed = keys[["dataset", "indicator_id"]].assign(latest_year=latest_year.astype(np.int64))
+    observed["latest"] = latest_values(years, values, mask, latest_year)
+    summary = spec.merge(observed, on=["dataset", "indicator_id"], how="left")
+
+    # Value in each target's baseline year, looked up in the same padded arrays
+    observed_baseline = _observed_baselines(keys, years, values, mask, summary)
+    target, rescaled = series_targets(summary, observed_baseline)
+
+    # Progress is measured on the series itself, so a level difference from the NHSP figure does not count
+    baseline = np.where(np.isnan(observed_baseline), summary["baseline"].to_numpy(dtype=np.float64), observed_baseline)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        progress = (baseline - summary["latest"].to_numpy(dtype=np.float64)) / (baseline - target) * 100
+    summary = summary.assign(
+        observed_baseline=observed_baseline, series_target=target, rescaled=rescaled, progress_pct=progress,
+    )
+
+    history = (
+        wanted[wanted["year"] >= since]
+        .groupby(["label", "year"], sort=False, as_index=False)["value"].mean()
+        .sort_values(["label", "year"], ignore_index=True)
+    )
+    return summary, history
+
+
+def target_progress(long, targets=NHSP_TARGETS, target_year=TARGET_YEAR, window=TREND_WINDOW):
+    """
+    Required versus observed annual reduction for every target.
+
+    Rates are annual reductions in percent, as on the simulation sliders;
+    negative values are increases. ``gap_pct`` is how much faster than the
+    observed rate the indicator has to move in the target's direction
+    (positive: behind).
+
+    Args:
+        long (pd.DataFrame): Warehouse rows covering the targets' datasets.
+        targets (list): Target specs, as in ``NHSP_TARGETS``.
+        target_year (int): Year the targets are due.
+        window (int): Years before the latest observation fitted for the
+            observed rate.
+
+    Returns:
+        pd.DataFrame: One row per target with the spec columns,
+        ``observed_baseline``, ``series_target`` and ``rescaled`` (see
+        ``series_targets``; rates and status are against ``series_target``),
+        ``last_year``, ``last_value``, ``target_year``, ``required_rate_pct``,
+        ``observed_rate_pct``, ``gap_pct``, ``projected`` (value in the
+        target year at the observed rate) and ``status`` ("Achieved",
+        "On track", "Off track" or "No trend"), largest gap first.
+    """
+    spec = pd.DataFrame(targets)
+    wanted = long.merge(spec[["dataset", "indicator_id"]], on=["dataset", "indicator_id"])
+    keys, years, values, mask = pad_series(wanted)
+
+    last_year = np.where(mask, years, -np.inf).max(axis=1, initial=-np.inf)
+    last_value = latest_values(years, values, mask, last_year)
+    # Log-linear fit over the recent window: slope is the log of the annual ratio
+    recent = mask & (years >= last_year[:, None] - window) & (values > 0)
+    fit = fit_linear_trends(years, np.log(np.where(recent, values, 1.0)), recent)
+
+    progress = keys[["dataset", "indicator_id"]].assign(
+        last_year=last_year.astype(np.int64),
+        last_value=last_value,
+        observed_rate_pct=-np.expm1(fit["slope"]) * 100,
+    )
+    out = spec.merge(progress, on=["dataset", "indicator_id"], how="left")
+    observed_baseline = _observed_baselines(keys, years, values, mask, out)
+    target, rescaled = series_targets(out, observed_baseline)
+
+    sign = np.where(out["direction"] == "increase", -1.0, 1.0)
+    years_left = target_year - out["last_year"].to_numpy(dtype=np.float64)
+    required = required_reduction_rate(out["last_value"], target, years_left)
+    observed = out["observed_rate_pct"].to_numpy(dtype=np.float64)
+    with np.errstate(invalid="ignore"):
+        projected = out["last_value"].to_numpy(dtype=np.float64) * (1 - observed / 100) ** np.maximum(years_left, 0)
+    gap = sign * (required - observed)
+    achieved = sign * (out["last_value"].to_numpy(dtype=np.float64) - target) <= 0
+
+    out = out.assign(
+        observed_baseline=observed_baseline,
+        series_target=target,
+        rescaled=rescaled,
+        target_year=target_year,
+        required_rate_pct=required,
+        gap_pct=np.where(achieved, np.nan, gap),
+        projected=projected,
+        status=np.select(
+            [achieved, np.isnan(gap), gap <= 0],
+            ["Achieved", "No trend", "On track"],
+            "Off track",
+        ),
+    )
+    return out.sort_values("gap_pct", ascending=False, na_position="last").reset_index(drop=True)
@@ -0,0 +1,210 @@
+# utils/trends.py
+"""
+Batch linear trend engine for indicator time series.
+
+Every series of the indicator warehouse (utils/warehouse.py) - a GHO code
+and dimension, a DHS indicator by characteristic, a World Bank column - is
+fitted at once:
+
+- the long observations are packed into padded ``(series, slot)`` arrays
+  with a mask marking the real observations
+- ordinary least squares has a closed form for one regressor, so slopes,
+  intercepts and residual spreads of all series come out of a handful of
+  masked sums instead of one model fit per series
+- projections carry Student-t prediction intervals
+
+``snapshot_table`` reduces the same arrays to the latest observation of
+every series and its change since the previous one, for KPI cards.
+"""
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from utils.warehouse import SERIES_KEY
+
+# Years projected past each series' last observation, and interval coverage
+TREND_HORIZON = 5
+TREND_LEVEL = 0.95
+
+
+def pad_series(long):
+    """
+    Pack warehouse rows into padded arrays, one row per series.
+
+    Returns:
+        tuple: ``(keys, years, values, mask)``; ``keys`` holds one row of
+        ``SERIES_KEY`` columns per series, the arrays are (n_series,
+        max_observations) and ``mask`` marks the filled slots.
+    """
+    codes, keys = pd.factorize(pd.MultiIndex.from_frame(long[SERIES_KEY]))
+    slot = pd.Series(codes).groupby(codes).cumcount().to_numpy()
+    shape = (len(keys), int(slot.max()) + 1 if len(slot) else 0)
+
+    years = np.zeros(shape)
+    values = np.zeros(shape)
+    mask = np.zeros(shape, dtype=bool)
+    years[codes, slot] = long["year"].to_numpy(dtype=np.float64)
+    values[codes, slot] = long["value"].to_numpy(dtype=np.float64)
+    mask[codes, slot] = True
+    return keys.to_frame(index=False, name=SERIES_KEY), years, values, mask
+
+
+def fit_linear_trends(years, values, mask):
+    """
+    Closed-form least-squares line through every row of padded series.
+
+    Args:
+        years, values (np.ndarray): (n_series, slots) observations.
+        mask (np.ndarray): (n_series, slots) bool, True for real observations.
+
+    Returns:
+        dict: (n_series,) arrays ``n``, ``x_mean``, ``y_mean``, ``sxx``,
+        ``slope``, ``intercept``, ``resid_sd`` and ``last_year``. ``slope``
+        is NaN with fewer than two distinct years, ``resid_sd`` with fewer
+        than three observations.
+    """
+    w = mask.astype(np.float64)
+    n = w.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x_mean = (w * years).sum(axis=1) / n
+        y_mean = (w * values).sum(axis=1) / n
+        dx = np.where(mask, years - x_mean[:, None], 0.0)
+        dy = np.where(mask, values - y_mean[:, None], 0.0)
+        sxx = (dx * dx).sum(axis=1)
+        slope = np.where(sxx > 0, (dx * dy).sum(axis=1) / sxx, np.nan)
+        resid = np.where(mask, dy - slope[:, None] * dx, 0.0)
+        resid_sd = np.where(n > 2, np.sqrt((resid * resid).sum(axis=1) / (n - 2)), np.nan)
+
+    return {
+        "n": n.astype(np.int64),
+        "x_mean": x_mean,
+        "y_mean": y_mean,
+        "sxx": sxx,
+        "slope": slope,
+        "intercept": y_mean - slope * x_mean,
+        "resid_sd": resid_sd,
+        "last_year": np.where(mask, years, -np.inf).max(axis=1, initial=-np.inf),
+    }
+
+
+def predict_trends(fit, x, level=TREND_LEVEL):
+    """
+    Fitted values and prediction intervals at ``x``.
+
+    Args:
+        fit (dict): Output of ``fit_linear_trends``.
+        x (np.ndarray): Years, (n_series, k) or (k,) shared by all series.
+        level (float): Coverage of the prediction interval.
+
+    Returns:
+        tuple: ``(prediction, lower, upper)``, each shaped like ``x``
+        broadcast to (n_series, k). Bounds are NaN where the residual spread
+        is undefined.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    dx = x - fit["x_mean"][:, None]
+    prediction = fit["y_mean"][:, None] + fit["slope"][:, None] * dx
+
+    n = fit["n"].astype(np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t = stats.t.ppf(0.5 + level / 2, np.where(n > 2, n - 2, np.nan))
+        half = (t * fit["resid_sd"])[:, None] * np.sqrt(1 + 1 / n[:, None] + dx ** 2 / fit["sxx"][:, None])
+    return prediction, prediction - half, prediction + half
+
+
+def latest_values(years, values, mask, last_year):
+    """Value of each padded series in its ``last_year``, averaged over duplicate observations."""
+    latest = mask & (years == np.asarray(last_year)[:, None])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(latest, values, 0.0).sum(axis=1) / latest.sum(axis=1)
+
+
+def trend_table(long):
+    """
+    Per-series trend summary.
+
+    Returns:
+        pd.DataFrame: One row per series with the key columns, ``n``,
+        ``first_year``, ``last_year``, ``last_value`` (latest observation,
+        averaged over duplicates in that year), ``slope`` (units per year),
+        ``intercept`` and ``resid_sd``.
+    """
+    keys, years, values, mask = pad_series(long)
+    fit = fit_linear_trends(years, values, mask)
+    last_value = latest_values(years, values, mask, fit["last_year"])
+
+    return keys.assign(
+        n=fit["n"],
+        first_year=np.where(mask, years, np.inf).min(axis=1, initial=np.inf).astype(np.int64),
+        last_year=fit["last_year"].astype(np.int64),
+        last_value=last_value,
+        slope=fit["slope"],
+        intercept=fit["intercept"],
+        resid_sd=fit["resid_sd"],
+    )
+
+
+def snapshot_table(long):
+    """
+    Latest observation of every series and its change since the previous one.
+
+    Returns:
+        pd.DataFrame: Indexed by (``dataset``, ``indicator_id``) for
+        constant-time lookups, with ``indicator``, ``breakdown``, ``year``, ``value``,
+        ``previous_year``, ``previous_value``, ``delta`` and ``delta_pct``
+        (relative change in percent). Values observed twice in a year are
+        averaged; the previous columns are NaN for single-year series.
+    """
+    keys, years, values, mask = pad_series(long)
+    last_year = np.where(mask, years, -np.inf).max(axis=1, initial=-np.inf)
+    earlier = mask & (years < last_year[:, None])
+    previous_year = np.where(earlier, years, -np.inf).max(axis=1, initial=-np.inf)
+
+    value = latest_values(years, values, mask, last_year)
+    previous_value = latest_values(years, values, earlier, previous_year)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        delta_pct = (value - previous_value) / np.abs(previous_value) * 100
+
+    snapshot = keys.assign(
+        year=last_year.astype(np.int64),
+        value=value,
+        previous_year=np.where(np.isfinite(previous_year), previous_year, np.nan),
+        previous_value=previous_value,
+        delta=value - previous_value,
+        delta_pct=np.where(np.isfinite(delta_pct), delta_pct, np.nan),
+    )
+    # ``ingest`` makes each (dataset, indicator_id) name exactly one series
+    return snapshot.set_index(["dataset", "indicator_id"], verify_integrity=True)
+
+
+def project_series(long, horizon=TREND_HORIZON, level=TREND_LEVEL):
+    """
+    Linear projection of every series ``horizon`` years past its last observation.
+
+    Args:
+        long (pd.DataFrame): Warehouse rows (see utils/warehouse.py), from
+            any number of datasets.
+        horizon (int): Years projected per series.
+        level (float): Coverage of the prediction interval.
+
+    Returns:
+        pd.DataFrame: Tidy projections, one row per (series, year), with the
+        key columns, ``Year``, ``Projection``, ``Lower`` and ``Upper``.
+        Series with fewer than two distinct years are left out.
+    """
+    keys, years, values, mask = pad_series(long)
+    fit = fit_linear_trends(years, values, mask)
+    fitted = np.isfinite(fit["slope"])
+
+    steps = np.arange(1, horizon + 1)
+    future = fit["last_year"][fitted, None] + steps
+    fit = {name: array[fitted] for name, array in fit.items()}
+    prediction, lower, upper = predict_trends(fit, future, level)
+
+    rows = np.repeat(np.flatnonzero(fitted), horizon)
+    return keys.iloc[rows].reset_index(drop=True).assign(
+        Year=future.ravel().astype(np.int64),
+        Projection=prediction.ravel(),
+        Lower=lower.ravel(),
+        Upper=upper.ravel(),
+    )
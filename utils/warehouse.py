@@ -0,0 +1,187 @@
+# utils/warehouse.py
+"""
+Long-format indicator warehouse across the World Bank, WHO GHO and DHS exports.
+
+The three sources come in incompatible shapes: the World Bank file is wide
+(one column per indicator next to ``Year``), GHO exports carry
+``GHO (CODE)`` / ``YEAR (DISPLAY)`` / ``Numeric`` and DHS exports
+``IndicatorId`` / ``SurveyYear`` / ``Value``. ``ingest`` maps any catalog
+dataset onto one tidy table, ``WAREHOUSE_COLUMNS``:
+
+- ``source``: column layout family (``"worldbank"``, ``"gho"``, ``"dhs"``)
+- ``dataset``: catalog name
+- ``indicator_id``: series key, unique within the dataset: each
+  ``(dataset, indicator_id)`` names exactly one labelled series (GHO code
+  and dimension, DHS indicator, characteristic and by-variable ids and
+  indicator order, or the World Bank column name)
+- ``indicator``, ``breakdown``: labels (``"Total"`` without a breakdown)
+- ``year``: int16
+- ``value``, ``ci_low``, ``ci_high``: float32, NaN where the source has no interval
+
+Text columns are dictionary-encoded (pandas categoricals), so ``query``
+filters compare small integer codes rather than strings. The layout of each
+source lives in ``WAREHOUSE_LAYOUTS`` (utils/catalog.py).
+"""
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from utils.catalog import FLOAT_DTYPE, WAREHOUSE_LAYOUTS
+
+WAREHOUSE_COLUMNS = [
+    "source", "dataset", "indicator_id", "indicator", "breakdown", "year", "value", "ci_low", "ci_high",
+]
+
+# Columns identifying one time series, and the dictionary-encoded columns
+SERIES_KEY = ["dataset", "indicator_id", "indicator", "breakdown"]
+_CATEGORICAL = ["source", "dataset", "indicator_id", "indicator", "breakdown"]
+
+NO_BREAKDOWN = "Total"
+
+
+def text_values(values):
+    """
+    String values with missing entries as empty strings (mapped before the
+    conversion: before pandas 3, ``astype(str)`` turns them into "nan").
+    """
+    return values.astype(object).where(values.notna(), "").astype(str)
+
+
+def ingest(df, dataset, schema):
+    """
+    Normalize one dataset into the warehouse layout.
+
+    Args:
+        df (pd.DataFrame): Dataset as loaded by ``get_dataset``.
+        dataset (str): Catalog name.
+        schema (str): Catalog schema, a key of ``WAREHOUSE_LAYOUTS``.
+
+    Returns:
+        pd.DataFrame: ``WAREHOUSE_COLUMNS``, one row per observation; rows
+        without a year or value are dropped.
+    """
+    layout = WAREHOUSE_LAYOUTS[schema]
+    if layout.get("wide"):
+        long = df.melt(id_vars=[layout["year"]], var_name="indicator", value_name="value")
+        long = pd.DataFrame({
+            "indicator_id": long["indicator"],
+            "indicator": long["indicator"],
+            "breakdown": NO_BREAKDOWN,
+            "year": long[layout["year"]],
+            "value": long["value"],
+            "ci_low": np.nan,
+            "ci_high": np.nan,
+        })
+    else:
+        # Key parts joined with "|"; missing parts (a GHO series without a
+        # dimension) are left out
+        key = text_values(df[layout["indicator_id"][0]])
+        for col in layout["indicator_id"][1:]:
+            part = text_values(df[col])
+            key = key.where(part == "", key + "|" + part)
+        breakdown = text_values(df[layout["breakdown"]])
+        long = pd.DataFrame({
+            "indicator_id": key,
+            "indicator": text_values(df[layout["indicator"]]),
+            "breakdown": breakdown.where(breakdown != "", NO_BREAKDOWN),
+            "year": df[layout["year"]],
+            "value": df[layout["value"]],
+            "ci_low": df[layout["ci_low"]] if layout.get("ci_low") else np.nan,
+            "ci_high": df[layout["ci_high"]] if layout.get("ci_high") else np.nan,
+        })
+
+    long["source"] = schema
+    long["dataset"] = dataset
+    long["year"] = pd.to_numeric(long["year"], errors="coerce")
+    for col in ("value", "ci_low", "ci_high"):
+        long[col] = pd.to_numeric(long[col], errors="coerce").astype(FLOAT_DTYPE)
+    long = long.dropna(subset=["year", "value"])
+
+    long = long.assign(
+        year=long["year"].astype(np.int16),
+        **{col: long[col].astype("category") for col in _CATEGORICAL},
+    )
+    return long[WAREHOUSE_COLUMNS].reset_index(drop=True)
+
+
+def build_warehouse(frames):
+    """
+    Concatenate ingested datasets into one table.
+
+    Categoricals are unioned so the result stays dictionary-encoded; rows
+    are sorted by series and year.
+    """
+    frames = [frame for frame in frames if len(frame)]
+    if not frames:
+        return _empty()
+
+    columns = {}
+    for col in WAREHOUSE_COLUMNS:
+        if col in _CATEGORICAL:
+            columns[col] = union_categoricals([frame[col] for frame in frames])
+        else:
+            columns[col] = np.concatenate([frame[col].to_numpy() for frame in frames])
+    warehouse = pd.DataFrame(columns)
+    return warehouse.sort_values([*SERIES_KEY, "year"], ignore_index=True)
+
+
+def _empty():
+    return pd.DataFrame({
+        col: pd.Series(dtype="category" if col in _CATEGORICAL else np.int16 if col == "year" else FLOAT_DTYPE)
+        for col in WAREHOUSE_COLUMNS
+    })
+
+
+def query(
+    warehouse,
+    source=None,
+    dataset=None,
+    indicator_id=None,
+    indicator=None,
+    breakdown=None,
+    years=None,
+    year_range=None,
+    columns=None,
+):
+    """
+    Filter the warehouse.
+
+    Every filter takes one value or a list of values; text filters are
+    matched on the dictionary codes.
+
+    Args:
+        warehouse (pd.DataFrame): Output of ``build_warehouse``.
+        source, dataset, indicator_id, indicator, breakdown: Values to keep.
+        years (int or list): Years to keep.
+        year_range (tuple): Inclusive ``(first, last)`` years; either end may be None.
+        columns (list): Columns to return. Defaults to all.
+
+    Returns:
+        pd.DataFrame: Matching rows, in warehouse order.
+    """
+    keep = np.ones(len(warehouse), dtype=bool)
+    for col, wanted in (
+        ("source", source),
+        ("dataset", dataset),
+        ("indicator_id", indicator_id),
+        ("indicator", indicator),
+        ("breakdown", breakdown),
+    ):
+        if wanted is None:
+            continue
+        values = list(wanted) if isinstance(wanted, (list, tuple, set, np.ndarray, pd.Index)) else [wanted]
+        codes = warehouse[col].cat.categories.get_indexer(values)
+        keep &= np.isin(warehouse[col].cat.codes.to_numpy(), codes[codes >= 0])
+
+    year = warehouse["year"].to_numpy()
+    if years is not None:
+        keep &= np.isin(year, np.atleast_1d(years))
+    if year_range is not None:
+        first, last = year_range
+        if first is not None:
+            keep &= year >= first
+        if last is not None:
+            keep &= year <= last
+
+    out = warehouse[keep]
+    return out[list(columns)] if columns is not None else out